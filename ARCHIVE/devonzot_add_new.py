@@ -10,14 +10,26 @@ import json
 import logging
 import os
 import re
+import sqlite3
 import subprocess
-from typing import List, Dict, Optional, Any
-from dataclasses import dataclass
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Tuple
+from dataclasses import dataclass, asdict
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 from zotero_api_client import ZoteroAPIClient
 
+# Try to import orjson for faster attachment-pair (de)serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 load_dotenv(Path(__file__).resolve().parent.parent / '.env')
 
@@ -26,6 +38,13 @@ ZOTERO_USER_ID = os.environ["ZOTERO_USER_ID"]
 ZOTERO_API_BASE = os.environ.get("ZOTERO_API_BASE", "https://api.zotero.org")
 API_VERSION = os.environ.get("API_VERSION", "3")
 RATE_LIMIT_DELAY = float(os.environ.get("RATE_LIMIT_DELAY", 1.0))
+ZOTERO_MAX_REQUESTS_PER_MINUTE = int(os.environ.get("ZOTERO_MAX_REQUESTS_PER_MINUTE", 60))
+DEVONTHINK_SEARCH_CONCURRENCY = int(os.environ.get("DEVONTHINK_SEARCH_CONCURRENCY", 4))
+DEVONTHINK_SEARCH_BATCH_SIZE = int(os.environ.get("DEVONTHINK_SEARCH_BATCH_SIZE", 25))  # Titles per osascript run
+ZOTERO_DELETE_CONCURRENCY = int(os.environ.get("ZOTERO_DELETE_CONCURRENCY", 4))
+PAIRS_JOURNAL_COMPACT_LINES = int(os.environ.get("ATTACHMENT_PAIRS_COMPACT_LINES", 500))  # Journal size before compaction
+UUID_CACHE_PATH = Path(os.environ.get("DEVONTHINK_UUID_CACHE_PATH", "devonthink_uuid_cache.db"))
+UUID_CACHE_MISS_TTL = int(os.environ.get("DEVONTHINK_UUID_CACHE_MISS_TTL", 3600))  # Retry "no match" after 1 hour
 
 # Setup logging
 logging.basicConfig(
@@ -38,7 +57,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Search-term extraction patterns
+_EXT_RE = re.compile(r'\.(pdf|docx?|txt|html?)$', re.IGNORECASE)
+_AUTHOR_RE = re.compile(r'^([A-Z][a-z]+(?:\s+et\s+al)?)')
+_WORD_RE = re.compile(r'\b[A-Z][a-z]{3,}\b')
+_STOP_WORDS = frozenset({'Journal', 'Article', 'Document', 'Report', 'History', 'Review', 'Magazine', 'Book'})
+
+# slots=True drops the per-instance __dict__ (Python 3.10+)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class AttachmentPair:
     """Track paired old/new attachments"""
     old_key: str
@@ -52,148 +80,325 @@ class AttachmentPair:
     timestamp: str
     confirmed: bool = False
     old_deleted: bool = False
+    old_version: int = 0  # Version of the old attachment when the pair was created
+
+
+@lru_cache(maxsize=4096)
+def _extract_search_terms(title: str) -> Tuple[str, ...]:
+    """Extract meaningful search terms from filename (memoized; titles repeat across runs)"""
+    clean_title = _EXT_RE.sub('', title)
+    terms = []
+    
+    # Author patterns
+    author_match = _AUTHOR_RE.match(clean_title)
+    if author_match:
+        terms.append(author_match.group(1))
+    
+    # Key words
+    words = _WORD_RE.findall(clean_title)
+    meaningful_words = [w for w in words if w not in _STOP_WORDS and len(w) > 4]
+    terms.extend(meaningful_words[:3])
+    
+    # Fallback
+    if not terms:
+        first_words = clean_title.split()[:2]
+        terms.extend([w for w in first_words if len(w) > 3])
+    
+    return tuple(terms[:4])
+
+
+class UUIDCache:
+    """Persistent title → DEVONthink UUID cache
+    
+    Hot entries live in an in-memory LRU backed by a small SQLite table so
+    repeat runs (and loop15 cycles) skip the osascript search entirely.
+    Misses are cached too, but expire after miss_ttl seconds.
+    """
+    
+    def __init__(self, path: Path, max_entries: int = 4096, miss_ttl: int = UUID_CACHE_MISS_TTL):
+        self.max_entries = max_entries
+        self.miss_ttl = miss_ttl
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS uuid_cache ("
+            "normalized_title TEXT PRIMARY KEY, uuid TEXT, ts REAL NOT NULL)"
+        )
+        self.conn.commit()
+    
+    @staticmethod
+    def normalize(title: str) -> str:
+        return " ".join(title.lower().split())
+    
+    def get(self, title: str):
+        """Return (hit, uuid); uuid is None for a cached miss"""
+        key = self.normalize(title)
+        entry = self._memory.get(key)
+        if entry is None:
+            entry = self.conn.execute(
+                "SELECT uuid, ts FROM uuid_cache WHERE normalized_title = ?", (key,)
+            ).fetchone()
+            if entry is None:
+                return False, None
+        uuid, ts = entry
+        if uuid is None and time.time() - ts > self.miss_ttl:
+            return False, None
+        self._remember(key, entry)
+        return True, uuid
+    
+    def put(self, title: str, uuid: Optional[str]):
+        key = self.normalize(title)
+        entry = (uuid, time.time())
+        self.conn.execute(
+            "INSERT OR REPLACE INTO uuid_cache (normalized_title, uuid, ts) VALUES (?, ?, ?)",
+            (key, *entry),
+        )
+        self.conn.commit()
+        self._remember(key, entry)
+    
+    def clear(self):
+        self._memory.clear()
+        self.conn.execute("DELETE FROM uuid_cache")
+        self.conn.commit()
+    
+    def _remember(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
 
 
 class DEVONthinkAPIInterface:
     """DEVONthink interface with smart search"""
     
-    def __init__(self, wait_time: int = 2):
+    def __init__(self, wait_time: int = 2, cache: Optional[UUIDCache] = None):
         self.wait_time = wait_time
+        self.cache = cache
     
     async def search_for_item_async(self, title: str) -> Optional[str]:
-        """Search DEVONthink with smart keyword extraction"""
-        try:
-            search_terms = self._extract_search_terms(title)
-            
-            for search_term in search_terms:
-                search_clean = search_term.replace('"', '\\"')
-                
-                script = f'''
-                tell application "DEVONthink"
-                    set searchResults to search "{search_clean}"
+        """Search DEVONthink for a single title"""
+        return (await self.batch_search([title])).get(title)
+    
+    async def batch_search(self, titles: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve many titles to DEVONthink UUIDs
+        
+        Cached titles are answered directly; the rest are searched with one
+        osascript run per chunk of DEVONTHINK_SEARCH_BATCH_SIZE titles, at most
+        DEVONTHINK_SEARCH_CONCURRENCY chunks at a time.
+        """
+        results: Dict[str, Optional[str]] = {}
+        pending = []
+        for title in dict.fromkeys(titles):
+            if self.cache is not None:
+                hit, uuid = self.cache.get(title)
+                if hit:
+                    results[title] = uuid
+                    continue
+            pending.append(title)
+        
+        chunks = [
+            pending[i:i + DEVONTHINK_SEARCH_BATCH_SIZE]
+            for i in range(0, len(pending), DEVONTHINK_SEARCH_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(DEVONTHINK_SEARCH_CONCURRENCY)
+        
+        async def search_chunk(chunk):
+            async with semaphore:
+                return chunk, await self._search_devonthink_batch(chunk)
+        
+        for chunk, uuids in await asyncio.gather(*(search_chunk(c) for c in chunks)):
+            if uuids is None:
+                # Search failed; leave uncached so the next run retries
+                results.update(dict.fromkeys(chunk))
+                continue
+            for title, uuid in zip(chunk, uuids):
+                results[title] = uuid
+                if self.cache is not None:
+                    self.cache.put(title, uuid)
+        return results
+    
+    async def _search_devonthink_batch(self, titles: List[str]) -> Optional[List[Optional[str]]]:
+        """Search DEVONthink for each title's keywords in a single osascript call
+        
+        Returns one UUID (or None) per title, or None if the script failed.
+        """
+        term_lists = []
+        for title in titles:
+            terms = ", ".join(
+                '"' + term.replace('\\', '\\\\').replace('"', '\\"') + '"'
+                for term in self._extract_search_terms(title)
+            )
+            term_lists.append("{" + terms + "}")
+        
+        script = f'''
+        tell application "DEVONthink"
+            set output to {{}}
+            repeat with termList in {{{", ".join(term_lists)}}}
+                set foundUUID to ""
+                repeat with searchTerm in termList
+                    set searchResults to search (searchTerm as string)
                     if (count of searchResults) > 0 then
-                        set firstResult to item 1 of searchResults
-                        return uuid of firstResult
-                    else
-                        return ""
+                        set foundUUID to uuid of (item 1 of searchResults)
+                        exit repeat
                     end if
-                end tell
-                '''
-                
-                process = await asyncio.create_subprocess_exec(
-                    'osascript', '-e', script,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await process.communicate()
-                
-                if process.returncode == 0:
-                    uuid = stdout.decode().strip()
-                    if uuid:
-                        logger.info(f"🎯 Found match with '{search_term}': {uuid}")
-                        return uuid
-                
-                await asyncio.sleep(0.5)
-            
-            return None
-                
+                end repeat
+                set end of output to foundUUID
+            end repeat
+            set AppleScript's text item delimiters to linefeed
+            return output as string
+        end tell
+        '''
+        
+        try:
+            # Feed the script on stdin so large batches don't hit argv limits
+            process = await asyncio.create_subprocess_exec(
+                'osascript', '-',
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate(script.encode('utf-8'))
         except Exception as e:
-            logger.error(f"Error searching DEVONthink: {e}")
+            logger.error("Error searching DEVONthink: %s", e)
+            return None
+        
+        if process.returncode != 0:
+            logger.error("Error searching DEVONthink: %s", stderr.decode().strip())
             return None
+        
+        lines = stdout.decode().rstrip('\n').split('\n')
+        uuids = [line.strip() or None for line in lines]
+        uuids += [None] * (len(titles) - len(uuids))
+        for title, uuid in zip(titles, uuids):
+            if uuid:
+                logger.info("🎯 Found match for '%s': %s", title, uuid)
+        return uuids[:len(titles)]
     
     def _extract_search_terms(self, title: str) -> List[str]:
         """Extract meaningful search terms from filename"""
-        clean_title = re.sub(r'\.(pdf|docx?|txt|html?)$', '', title, flags=re.IGNORECASE)
-        terms = []
-        
-        # Author patterns
-        author_match = re.match(r'^([A-Z][a-z]+(?:\s+et\s+al)?)', clean_title)
-        if author_match:
-            terms.append(author_match.group(1))
-        
-        # Key words
-        words = re.findall(r'\b[A-Z][a-z]{3,}\b', clean_title)
-        stop_words = {'Journal', 'Article', 'Document', 'Report', 'History', 'Review', 'Magazine', 'Book'}
-        meaningful_words = [w for w in words if w not in stop_words and len(w) > 4]
-        terms.extend(meaningful_words[:3])
-        
-        # Fallback
-        if not terms:
-            first_words = clean_title.split()[:2]
-            terms.extend([w for w in first_words if len(w) > 3])
-        
-        return terms[:4]
+        return list(_extract_search_terms(title))
 
 class DEVONzotAddNewService:
     """Service that adds new UUID attachments instead of modifying existing ones"""
     
-    def __init__(self):
+    def __init__(self, refresh_cache: bool = False):
         self.zotero = ZoteroAPIClient(
             api_key=ZOTERO_API_KEY,
             user_id=ZOTERO_USER_ID,
             api_base=ZOTERO_API_BASE,
             api_version=API_VERSION,
             rate_limit_delay=RATE_LIMIT_DELAY,
+            max_requests_per_minute=ZOTERO_MAX_REQUESTS_PER_MINUTE,
         )
-        self.devonthink = DEVONthinkAPIInterface()
+        uuid_cache = UUIDCache(UUID_CACHE_PATH)
+        if refresh_cache:
+            uuid_cache.clear()
+        self.devonthink = DEVONthinkAPIInterface(cache=uuid_cache)
         self.callback_file = Path(os.environ.get("ATTACHMENT_PAIRS_PATH", "attachment_pairs.json"))
+        # New pairs are appended here between full rewrites of callback_file
+        self.callback_file_jsonl = self.callback_file.with_suffix('.jsonl')
+        self.journal_lines = 0
+        self.pairs_by_old_key: Dict[str, AttachmentPair] = {}
+        # Set while the last listing left candidates unresolved or unscanned;
+        # the next conditional listing must then fetch the pages again
+        self.candidates_pending = False
         self.load_attachment_pairs()
     
     def load_attachment_pairs(self):
-        """Load previously created attachment pairs"""
+        """Load previously created attachment pairs (snapshot, then journal)"""
         if self.callback_file.exists():
             try:
-                with open(self.callback_file, 'r') as f:
-                    data = json.load(f)
-                    self.zotero.attachment_pairs = [
-                        AttachmentPair(**item) for item in data
-                    ]
-                logger.info(f"Loaded {len(self.zotero.attachment_pairs)} attachment pairs")
+                with open(self.callback_file, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                self.zotero.attachment_pairs = [
+                    AttachmentPair(**item) for item in data
+                ]
+                self._reindex_pairs()
             except Exception as e:
-                logger.error(f"Error loading attachment pairs: {e}")
+                logger.error("Error loading attachment pairs: %s", e)
+        if self.callback_file_jsonl.exists():
+            try:
+                with open(self.callback_file_jsonl, 'rb') as f:
+                    for line in f:
+                        if line.strip():
+                            item = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+                            # Re-assigning a key keeps its original position in the dict
+                            pair = AttachmentPair(**item)
+                            self.pairs_by_old_key[pair.old_key] = pair
+                            self.journal_lines += 1
+            except Exception as e:
+                logger.error("Error loading attachment pair journal: %s", e)
+            self.zotero.attachment_pairs = list(self.pairs_by_old_key.values())
+        if self.zotero.attachment_pairs:
+            logger.info("Loaded %s attachment pairs", len(self.zotero.attachment_pairs))
+    
+    def _reindex_pairs(self):
+        """Rebuild the old_key → pair index after replacing the pair list"""
+        self.pairs_by_old_key = {p.old_key: p for p in self.zotero.attachment_pairs}
+    
+    def append_attachment_pairs(self, pairs: List[AttachmentPair]):
+        """Append new pairs to the JSONL journal, compacting once it grows large"""
+        if not pairs:
+            return
+        try:
+            if ORJSON_AVAILABLE:
+                lines = [orjson.dumps(asdict(p)) for p in pairs]
+            else:
+                lines = [json.dumps(asdict(p)).encode('utf-8') for p in pairs]
+            with open(self.callback_file_jsonl, 'ab') as f:
+                f.write(b'\n'.join(lines) + b'\n')
+            self.journal_lines += len(lines)
+        except Exception as e:
+            logger.error("Error appending attachment pairs: %s", e)
+            return
+        if self.journal_lines >= PAIRS_JOURNAL_COMPACT_LINES:
+            self.save_attachment_pairs()
     
     def save_attachment_pairs(self):
-        """Save attachment pairs for callback processing"""
+        """Rewrite all attachment pairs to callback_file atomically and empty the journal"""
         try:
-            data = [
-                {
-                    'old_key': pair.old_key,
-                    'old_title': pair.old_title,
-                    'old_path': pair.old_path,
-                    'new_key': pair.new_key,
-                    'new_url': pair.new_url,
-                    'parent_key': pair.parent_key,
-                    'parent_title': pair.parent_title,
-                    'uuid': pair.uuid,
-                    'timestamp': pair.timestamp,
-                    'confirmed': pair.confirmed,
-                    'old_deleted': pair.old_deleted
-                }
-                for pair in self.zotero.attachment_pairs
-            ]
+            data = [asdict(pair) for pair in self.zotero.attachment_pairs]
             
-            with open(self.callback_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, indent=2).encode('utf-8')
+            # Write next to the snapshot and rename, so a crash mid-write
+            # never leaves a truncated snapshot behind
+            tmp_path = self.callback_file.with_suffix(self.callback_file.suffix + '.tmp')
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.callback_file)
+            # Journal entries are now in the snapshot; replaying them is harmless,
+            # so a failure past this point loses nothing
+            with open(self.callback_file_jsonl, 'wb'):
+                pass
+            self.journal_lines = 0
                 
-            logger.info(f"Saved {len(data)} attachment pairs to {self.callback_file}")
+            logger.info("Saved %s attachment pairs to %s", len(data), self.callback_file)
             
         except Exception as e:
-            logger.error(f"Error saving attachment pairs: {e}")
+            logger.error("Error saving attachment pairs: %s", e)
     
-    async def add_uuid_attachments(self, max_items: int = 10) -> Dict[str, int]:
-        """Add new UUID attachments for file attachments using batching"""
-        logger.info(f"🔗 Adding UUID attachments for up to {max_items} file attachments...")
+    async def add_uuid_attachments(self, max_items: int = 10, conditional: bool = False) -> Dict[str, int]:
+        """Add new UUID attachments for file attachments using batching
+
+        With conditional=True the attachment listing is skipped entirely when
+        the library has not changed since the previous call (HTTP 304), unless
+        that call stopped short of or failed on some candidates.
+        """
+        logger.info("🔗 Adding UUID attachments for up to %s file attachments...", max_items)
         results = {'added': 0, 'error': 0, 'skipped': 0}
+        conditional = conditional and not self.candidates_pending
+        self.candidates_pending = True  # Cleared below once every candidate is handled
         try:
             # Get file attachments that don't already have UUID counterparts
-            items = self.zotero.get_attachment_batch(start=0, limit=100)
             candidates = []
-            for item_data in items:
+            truncated = False
+            async for item_data in self.zotero.iter_attachments(page_size=100, conditional=conditional):
                 data = item_data.get('data', {})
                 if (data.get('linkMode') == 'linked_file' and data.get('path') and data.get('parentItem')):
-                    existing_pair = next((p for p in self.zotero.attachment_pairs if p.old_key == data.get('key')), None)
-                    if not existing_pair:
+                    if data.get('key') not in self.pairs_by_old_key:
                         candidates.append({
                             'key': data.get('key', ''),
                             'version': data.get('version', 0),
@@ -201,35 +406,47 @@ class DEVONzotAddNewService:
                             'path': data.get('path', ''),
                             'parent_key': data.get('parentItem')
                         })
-            logger.info(f"Found {len(candidates)} new candidates for UUID attachment creation")
-            # Search DEVONthink for UUIDs
+                        if len(candidates) >= max_items:
+                            truncated = True
+                            break  # Enough work for this run; leave later pages unfetched
+            logger.info("Found %s new candidates for UUID attachment creation", len(candidates))
+            # Search DEVONthink for UUIDs in batched osascript calls
+            selected = candidates[:max_items]
+            uuids_by_title = await self.devonthink.batch_search([c['title'] for c in selected])
             batch_to_create = []
             candidate_map = {}
-            for candidate in candidates[:max_items]:
-                try:
-                    uuid = await self.devonthink.search_for_item_async(candidate['title'])
-                    if uuid:
-                        batch_to_create.append({
-                            "parent_key": candidate['parent_key'],
-                            "title": candidate['title'],
-                            "url": f"x-devonthink-item://{uuid}"
-                        })
-                        candidate_map[candidate['title']] = (candidate, uuid)
-                    else:
-                        logger.warning(f"❌ No DEVONthink match: {candidate['title']}")
-                        results['skipped'] += 1
-                    await asyncio.sleep(0.1)
-                except Exception as e:
-                    logger.error(f"Error processing {candidate['key']}: {e}")
-                    results['error'] += 1
+            for candidate in selected:
+                uuid = uuids_by_title.get(candidate['title'])
+                if uuid:
+                    batch_to_create.append({
+                        "parent_key": candidate['parent_key'],
+                        "title": candidate['title'],
+                        "url": f"x-devonthink-item://{uuid}"
+                    })
+                    candidate_map[candidate['title']] = (candidate, uuid)
+                else:
+                    logger.warning("❌ No DEVONthink match: %s", candidate['title'])
+                    results['skipped'] += 1
             # Batch create UUID attachments
             if batch_to_create:
-                batch_results = self.zotero.create_url_attachments(batch_to_create)
+                batch_results = await self.zotero.acreate_url_attachments(batch_to_create)
+                # Fetch parents for all created pairs in bulk
+                parent_keys = list(dict.fromkeys(
+                    candidate_map[res['input']['title']][0]['parent_key']
+                    for res in batch_results
+                    if res['new_key'] and res['input']['title'] in candidate_map
+                ))
+                parents_by_key = {
+                    item['key']: item
+                    for item in await self.zotero.aget_items_by_keys(parent_keys)
+                }
                 changed_files = []
+                new_pairs = []
+                to_delete = []
                 for res in batch_results:
                     candidate, uuid = candidate_map.get(res['input']['title'], (None, None))
                     if res['new_key'] and candidate:
-                        parent_item = self.zotero.get_item_raw(candidate['parent_key'])
+                        parent_item = parents_by_key.get(candidate['parent_key'])
                         parent_title = parent_item.get('data', {}).get('title', 'Unknown') if parent_item else 'Unknown'
                         pair = AttachmentPair(
                             old_key=candidate['key'],
@@ -240,11 +457,14 @@ class DEVONzotAddNewService:
                             parent_key=candidate['parent_key'],
                             parent_title=parent_title,
                             uuid=uuid,
-                            timestamp=datetime.now().isoformat()
+                            timestamp=datetime.now().isoformat(),
+                            old_version=candidate['version']
                         )
                         self.zotero.attachment_pairs.append(pair)
+                        self.pairs_by_old_key[pair.old_key] = pair
+                        new_pairs.append(pair)
                         results['added'] += 1
-                        logger.info(f"📎 Added UUID attachment for: {candidate['title']}")
+                        logger.info("📎 Added UUID attachment for: %s", candidate['title'])
                         changed_files.append({
                             'title': candidate['title'],
                             'old_key': candidate['key'],
@@ -252,24 +472,38 @@ class DEVONzotAddNewService:
                             'parent_key': candidate['parent_key'],
                             'timestamp': pair.timestamp
                         })
-                        # Delete previous linked file attachment immediately
-                        old_item = self.zotero.get_item_raw(candidate['key'])
-                        if old_item:
-                            version = old_item.get('data', {}).get('version', 0)
-                            if self.zotero.delete_attachment(candidate['key'], version):
-                                logger.info(f"🗑️ Deleted old file attachment: {candidate['key']}")
-                                pair.old_deleted = True
+                        # Queue previous linked file attachment for deletion at the
+                        # version seen in the listing
+                        to_delete.append(pair)
                     else:
                         results['error'] += 1
+                # Delete old file attachments concurrently
+                semaphore = asyncio.Semaphore(ZOTERO_DELETE_CONCURRENCY)
+
+                async def _delete(pair: AttachmentPair) -> bool:
+                    async with semaphore:
+                        return await self.zotero.adelete_attachment(
+                            pair.old_key, pair.old_version, refresh_on_conflict=True
+                        )
+
+                deleted = await asyncio.gather(*(_delete(p) for p in to_delete))
+                for pair, ok in zip(to_delete, deleted):
+                    if ok:
+                        logger.info("🗑️ Deleted old file attachment: %s", pair.old_key)
+                        pair.old_deleted = True
                 # Write changed files to a log for inspection
                 if changed_files:
-                    with open('changed_files_log.json', 'a') as f:
-                        for entry in changed_files:
-                            f.write(json.dumps(entry) + '\n')
-            # Save results
-            self.save_attachment_pairs()
+                    if ORJSON_AVAILABLE:
+                        lines = [orjson.dumps(entry) for entry in changed_files]
+                    else:
+                        lines = [json.dumps(entry).encode('utf-8') for entry in changed_files]
+                    with open('changed_files_log.json', 'ab') as f:
+                        f.write(b'\n'.join(lines) + b'\n')
+                # Record only this batch's pairs
+                self.append_attachment_pairs(new_pairs)
+            self.candidates_pending = truncated or results['added'] < len(candidates)
         except Exception as e:
-            logger.error(f"Error in add process: {e}")
+            logger.error("Error in add process: %s", e)
             results['error'] += 1
         return results
     
@@ -316,27 +550,31 @@ class DEVONzotAddNewService:
         
         for pair in unconfirmed:
             try:
-                # Get current version of old attachment for deletion
-                old_item = self.zotero.get_item_raw(pair.old_key)
-                if old_item and not pair.old_deleted:
-                    version = old_item.get('data', {}).get('version', 0)
+                if not pair.old_deleted:
+                    version = pair.old_version
+                    if not version:
+                        # Pairs saved before old_version was recorded
+                        old_item = await self.zotero.aget_item_raw(pair.old_key)
+                        version = old_item.get('data', {}).get('version', 0) if old_item else None
                     
                     # Delete old file attachment
-                    if self.zotero.delete_attachment(pair.old_key, version):
-                        pair.old_deleted = True
-                        results['deleted'] += 1
-                    else:
-                        results['error'] += 1
-                        continue
+                    if version is not None:
+                        if await self.zotero.adelete_attachment(pair.old_key, version,
+                                                                refresh_on_conflict=True):
+                            pair.old_deleted = True
+                            results['deleted'] += 1
+                        else:
+                            results['error'] += 1
+                            continue
                 
                 # Mark as confirmed
                 pair.confirmed = True
                 results['confirmed'] += 1
                 
-                logger.info(f"✅ Confirmed and cleaned up: {pair.old_title}")
+                logger.info("✅ Confirmed and cleaned up: %s", pair.old_title)
                 
             except Exception as e:
-                logger.error(f"Error confirming pair {pair.old_key}: {e}")
+                logger.error("Error confirming pair %s: %s", pair.old_key, e)
                 results['error'] += 1
         
         self.save_attachment_pairs()
@@ -350,23 +588,24 @@ class DEVONzotAddNewService:
             if pair.new_key and not pair.confirmed:
                 try:
                     # Get current version of new UUID attachment
-                    new_item = self.zotero.get_item_raw(pair.new_key)
+                    new_item = await self.zotero.aget_item_raw(pair.new_key)
                     if new_item:
                         version = new_item.get('data', {}).get('version', 0)
                         
                         # Delete UUID attachment
-                        if self.zotero.delete_attachment(pair.new_key, version):
+                        if await self.zotero.adelete_attachment(pair.new_key, version):
                             results['rolled_back'] += 1
-                            logger.info(f"🔄 Rolled back UUID attachment: {pair.old_title}")
+                            logger.info("🔄 Rolled back UUID attachment: %s", pair.old_title)
                         else:
                             results['error'] += 1
                     
                 except Exception as e:
-                    logger.error(f"Error rolling back {pair.new_key}: {e}")
+                    logger.error("Error rolling back %s: %s", pair.new_key, e)
                     results['error'] += 1
         
         # Clear unconfirmed pairs
         self.zotero.attachment_pairs = [p for p in self.zotero.attachment_pairs if p.confirmed]
+        self._reindex_pairs()
         self.save_attachment_pairs()
         
         return results
@@ -381,62 +620,69 @@ async def main():
     parser.add_argument('--confirm', action='store_true', help='Confirm UUID attachments and delete old files')
     parser.add_argument('--rollback', action='store_true', help='Rollback - delete UUID attachments')
     parser.add_argument('--loop15', action='store_true', help='Run batch every 2 minutes for 15 minutes')
+    parser.add_argument('--refresh-cache', action='store_true', help='Discard cached DEVONthink title→UUID lookups')
 
     args = parser.parse_args()
 
-    service = DEVONzotAddNewService()
+    service = DEVONzotAddNewService(refresh_cache=args.refresh_cache)
 
-    if args.loop15:
-        import time
-        start = time.time()
-        end = start + 15*60
-        cycle = 1
-        while time.time() < end:
-            logger.info(f"⏳ Loop cycle {cycle} (15-min watch mode)")
-            results = await service.add_uuid_attachments(max_items=3)
-            print(f"Cycle {cycle}: Added={results['added']} Skipped={results['skipped']} Errors={results['error']}")
-            cycle += 1
-            if time.time() < end:
-                time.sleep(120)
-        print("15-minute loop complete.")
-    elif args.add > 0:
-        logger.info(f"🔗 Adding UUID attachments for {args.add} items...")
-        results = await service.add_uuid_attachments(max_items=args.add)
-        print(f"\n{'='*40}")
-        print("📊 ADD RESULTS")
-        print(f"{'='*40}")
-        print(f"Added: {results['added']}")
-        print(f"Skipped: {results['skipped']}")
-        print(f"Errors: {results['error']}")
-        print(f"{'='*40}")
-    elif args.review:
-        service.show_confirmation_report()
-    elif args.confirm:
-        logger.info("✅ Confirming UUID attachments and cleaning up...")
-        results = await service.confirm_and_cleanup()
-        print(f"\n{'='*40}")
-        print("📊 CONFIRMATION RESULTS")
-        print(f"{'='*40}")
-        print(f"Confirmed: {results['confirmed']}")
-        print(f"Deleted: {results['deleted']}")
-        print(f"Errors: {results['error']}")
-        print(f"{'='*40}")
-    elif args.rollback:
-        logger.info("🔄 Rolling back UUID attachments...")
-        results = await service.rollback_uuid_attachments()
-        print(f"\n{'='*40}")
-        print("📊 ROLLBACK RESULTS")
-        print(f"{'='*40}")
-        print(f"Rolled back: {results['rolled_back']}")
-        print(f"Errors: {results['error']}")
-        print(f"{'='*40}")
-    else:
-        print("Usage:")
-        print("  --add N      Add UUID attachments for N file attachments")
-        print("  --review     Review attachment pairs and get confirmation links")
-        print("  --confirm    Confirm UUID attachments work and delete old files")
-        print("  --rollback   Delete UUID attachments and keep original files")
-        print("  --loop15     Run batch every 2 minutes for 15 minutes (watch mode)")
+    try:
+        if args.loop15:
+            # Cycles are scheduled against fixed monotonic deadlines so drift doesn't accumulate
+            start = time.monotonic()
+            end = start + 15*60
+            cycle = 1
+            while time.monotonic() < end:
+                logger.info("⏳ Loop cycle %s (15-min watch mode)", cycle)
+                results = await service.add_uuid_attachments(max_items=3, conditional=True)
+                print(f"Cycle {cycle}: Added={results['added']} Skipped={results['skipped']} Errors={results['error']}")
+                next_deadline = start + cycle * 120
+                cycle += 1
+                if next_deadline < end:
+                    await asyncio.sleep(max(0, next_deadline - time.monotonic()))
+                else:
+                    break
+            print("15-minute loop complete.")
+        elif args.add > 0:
+            logger.info("🔗 Adding UUID attachments for %s items...", args.add)
+            results = await service.add_uuid_attachments(max_items=args.add)
+            print(f"\n{'='*40}")
+            print("📊 ADD RESULTS")
+            print(f"{'='*40}")
+            print(f"Added: {results['added']}")
+            print(f"Skipped: {results['skipped']}")
+            print(f"Errors: {results['error']}")
+            print(f"{'='*40}")
+        elif args.review:
+            service.show_confirmation_report()
+        elif args.confirm:
+            logger.info("✅ Confirming UUID attachments and cleaning up...")
+            results = await service.confirm_and_cleanup()
+            print(f"\n{'='*40}")
+            print("📊 CONFIRMATION RESULTS")
+            print(f"{'='*40}")
+            print(f"Confirmed: {results['confirmed']}")
+            print(f"Deleted: {results['deleted']}")
+            print(f"Errors: {results['error']}")
+            print(f"{'='*40}")
+        elif args.rollback:
+            logger.info("🔄 Rolling back UUID attachments...")
+            results = await service.rollback_uuid_attachments()
+            print(f"\n{'='*40}")
+            print("📊 ROLLBACK RESULTS")
+            print(f"{'='*40}")
+            print(f"Rolled back: {results['rolled_back']}")
+            print(f"Errors: {results['error']}")
+            print(f"{'='*40}")
+        else:
+            print("Usage:")
+            print("  --add N      Add UUID attachments for N file attachments")
+            print("  --review     Review attachment pairs and get confirmation links")
+            print("  --confirm    Confirm UUID attachments work and delete old files")
+            print("  --rollback   Delete UUID attachments and keep original files")
+            print("  --loop15     Run batch every 2 minutes for 15 minutes (watch mode)")
+    finally:
+        await service.zotero.aclose()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
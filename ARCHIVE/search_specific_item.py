@@ -5,17 +5,22 @@ Search for specific item in Zotero database
 
 import sqlite3
 import os
+import sys
 from pathlib import Path
 from contextlib import contextmanager
 
 ZOTERO_DB_PATH = "/Users/travisross/Zotero/zotero.sqlite"
+ZOTERO_STORAGE_PATH = Path("/Users/travisross/Zotero/storage")
+LINK_MODES = {0: "Stored", 1: "Linked", 2: "Web Link", 3: "Linked (relative)"}
 
 @contextmanager
 def safe_zotero_connection(db_path: str, timeout: int = 30):
     """Safely connect to Zotero database"""
     conn = None
     try:
-        conn = sqlite3.connect(db_path, timeout=timeout)
+        # Zotero stores dates as TEXT; keep type detection off so rows are
+        # never run through the datetime converters
+        conn = sqlite3.connect(db_path, timeout=timeout, detect_types=0)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA query_only = ON")
         yield conn
@@ -27,36 +32,64 @@ def safe_zotero_connection(db_path: str, timeout: int = 30):
         if conn:
             conn.close()
 
+def has_parent_item_index(conn) -> bool:
+    """Check whether itemAttachments.parentItemID is covered by an index"""
+    for index in conn.execute("PRAGMA index_list('itemAttachments')").fetchall():
+        columns = conn.execute(f"PRAGMA index_info('{index['name']}')").fetchall()
+        if columns and columns[0]['name'] == 'parentItemID':
+            return True
+    return False
+
+def get_attachments_by_parent(conn, item_ids) -> dict:
+    """Fetch attachments for all parent items in one query, grouped by parent"""
+    attachments_by_parent = {item_id: [] for item_id in item_ids}
+    if not item_ids:
+        return attachments_by_parent
+    
+    placeholders = ",".join("?" * len(item_ids))
+    cursor = conn.execute(f"""
+        SELECT 
+            ia.parentItemID,
+            ia.itemID as attachmentID,
+            ia.linkMode,
+            ia.contentType,
+            ia.path,
+            ia.storageHash,
+            i.dateAdded as att_dateAdded,
+            idv.value as att_title
+        FROM itemAttachments ia
+        JOIN items i ON ia.itemID = i.itemID
+        LEFT JOIN itemData id ON ia.itemID = id.itemID
+            AND id.fieldID = (SELECT fieldID FROM fields WHERE fieldName = 'title')
+        LEFT JOIN itemDataValues idv ON id.valueID = idv.valueID
+        WHERE ia.parentItemID IN ({placeholders})
+        ORDER BY i.dateAdded DESC
+    """, tuple(item_ids))
+    
+    for att in cursor:
+        attachments_by_parent[att['parentItemID']].append(att)
+    return attachments_by_parent
+
 def search_specific_item(search_title="How Black is our Market", search_author="Henderson"):
     """Search for specific item by title and author"""
     print(f"🔍 Searching for: '{search_title}' by {search_author}")
     
     with safe_zotero_connection(ZOTERO_DB_PATH) as conn:
-        # Search for items with matching title
+        # Search for items with matching title. Filtering the title rows
+        # directly avoids pivoting and grouping every item in the library.
         cursor = conn.execute("""
-            SELECT DISTINCT
+            SELECT
                 i.itemID,
                 i.dateAdded,
                 i.dateModified,
                 i.key,
-                GROUP_CONCAT(
-                    CASE WHEN f.fieldName = 'title' THEN idv.value END
-                ) as title,
-                GROUP_CONCAT(
-                    CASE WHEN f.fieldName = 'publicationTitle' THEN idv.value END
-                ) as publication,
-                GROUP_CONCAT(
-                    CASE WHEN f.fieldName = 'date' THEN idv.value END
-                ) as date,
-                GROUP_CONCAT(
-                    CASE WHEN f.fieldName = 'url' THEN idv.value END
-                ) as url
+                idv.value as title
             FROM items i
-            LEFT JOIN itemData id ON i.itemID = id.itemID
-            LEFT JOIN fields f ON id.fieldID = f.fieldID
-            LEFT JOIN itemDataValues idv ON id.valueID = idv.valueID
-            GROUP BY i.itemID
-            HAVING title LIKE ?
+            JOIN itemData id ON i.itemID = id.itemID
+            JOIN fields f ON id.fieldID = f.fieldID
+            JOIN itemDataValues idv ON id.valueID = idv.valueID
+            WHERE f.fieldName = 'title'
+            AND idv.value LIKE ?
             ORDER BY i.dateModified DESC
         """, (f"%{search_title}%",))
         
@@ -68,28 +101,54 @@ def search_specific_item(search_title="How Black is our Market", search_author="
         
         print(f"\n📊 Found {len(matching_items)} matching items")
         
+        # The connection is query_only, so a missing index can only be reported
+        if not has_parent_item_index(conn):
+            print("⚠️  itemAttachments.parentItemID is not indexed - attachment lookups will scan the table")
+        
+        attachments_by_parent = get_attachments_by_parent(
+            conn, [item['itemID'] for item in matching_items]
+        )
+        
         for item in matching_items:
+            # Collect the report for this item and write it in one call
+            out = []
             item_id = item['itemID']
+            
+            # Get all field data for this item; the header fields come from it too
+            fields = conn.execute("""
+                SELECT 
+                    f.fieldName,
+                    idv.value
+                FROM itemData id
+                JOIN fields f ON id.fieldID = f.fieldID
+                JOIN itemDataValues idv ON id.valueID = idv.valueID
+                WHERE id.itemID = ?
+                ORDER BY f.fieldName
+            """, (item_id,)).fetchall()
+            field_values = {field['fieldName']: field['value'] for field in fields}
+            
             title = item['title'] or "No Title"
-            publication = item['publication'] or ""
-            date = item['date'] or ""
-            url = item['url'] or ""
+            publication = field_values.get('publicationTitle') or ""
+            date = field_values.get('date') or ""
+            url = field_values.get('url') or ""
             key = item['key']
-            date_added = item['dateAdded'][:19] if item['dateAdded'] else "No Date"
-            date_modified = item['dateModified'][:19] if item['dateModified'] else "No Date"
+            date_added = item['dateAdded']
+            date_added = date_added[:19] if date_added else "No Date"
+            date_modified = item['dateModified']
+            date_modified = date_modified[:19] if date_modified else "No Date"
             
-            print(f"\n" + "="*80)
-            print(f"📄 ITEM {item_id} (Key: {key})")
-            print("="*80)
-            print(f"Title: {title}")
+            out.append("\n" + "="*80)
+            out.append(f"📄 ITEM {item_id} (Key: {key})")
+            out.append("="*80)
+            out.append(f"Title: {title}")
             if publication:
-                print(f"Publication: {publication}")
+                out.append(f"Publication: {publication}")
             if date:
-                print(f"Date: {date}")
+                out.append(f"Date: {date}")
             if url:
-                print(f"URL: {url}")
-            print(f"Added: {date_added}")
-            print(f"Modified: {date_modified}")
+                out.append(f"URL: {url}")
+            out.append(f"Added: {date_added}")
+            out.append(f"Modified: {date_modified}")
             
             # Get all creators (authors)
             creators_cursor = conn.execute("""
@@ -106,95 +165,61 @@ def search_specific_item(search_title="How Black is our Market", search_author="
             
             creators = creators_cursor.fetchall()
             if creators:
-                print(f"\nAuthors:")
+                out.append(f"\nAuthors:")
                 for creator in creators:
                     first_name = creator['firstName'] or ""
                     last_name = creator['lastName'] or ""
                     creator_type = creator['creatorType']
                     full_name = f"{first_name} {last_name}".strip()
-                    print(f"  • {full_name} ({creator_type})")
+                    out.append(f"  • {full_name} ({creator_type})")
             
-            # Get all field data for this item
-            fields_cursor = conn.execute("""
-                SELECT 
-                    f.fieldName,
-                    idv.value
-                FROM itemData id
-                JOIN fields f ON id.fieldID = f.fieldID
-                JOIN itemDataValues idv ON id.valueID = idv.valueID
-                WHERE id.itemID = ?
-                ORDER BY f.fieldName
-            """, (item_id,))
-            
-            fields = fields_cursor.fetchall()
             if fields:
-                print(f"\nAll Fields:")
+                out.append(f"\nAll Fields:")
                 for field in fields:
                     field_name = field['fieldName']
                     value = field['value']
                     # Truncate very long values
                     if len(value) > 100:
                         value = value[:97] + "..."
-                    print(f"  {field_name}: {value}")
+                    out.append(f"  {field_name}: {value}")
             
-            # Get all attachments for this item
-            attachments_cursor = conn.execute("""
-                SELECT 
-                    ia.itemID as attachmentID,
-                    ia.linkMode,
-                    ia.contentType,
-                    ia.path,
-                    ia.storageHash,
-                    i.dateAdded as att_dateAdded,
-                    GROUP_CONCAT(
-                        CASE WHEN f.fieldName = 'title' THEN idv.value END
-                    ) as att_title
-                FROM itemAttachments ia
-                JOIN items i ON ia.itemID = i.itemID
-                LEFT JOIN itemData id ON ia.itemID = id.itemID
-                LEFT JOIN fields f ON id.fieldID = f.fieldID
-                LEFT JOIN itemDataValues idv ON id.valueID = idv.valueID
-                WHERE ia.parentItemID = ?
-                GROUP BY ia.itemID
-                ORDER BY i.dateAdded DESC
-            """, (item_id,))
-            
-            attachments = attachments_cursor.fetchall()
+            attachments = attachments_by_parent[item_id]
             
             if attachments:
-                print(f"\n📎 ATTACHMENTS ({len(attachments)}):")
-                link_modes = {0: "Stored", 1: "Linked", 2: "Web Link", 3: "Linked (relative)"}
-                
+                out.append(f"\n📎 ATTACHMENTS ({len(attachments)}):")
+
                 for att in attachments:
                     att_id = att['attachmentID']
-                    link_mode = link_modes.get(att['linkMode'], f"Unknown({att['linkMode']})")
+                    link_mode = LINK_MODES.get(att['linkMode'], f"Unknown({att['linkMode']})")
                     content_type = att['contentType'] or "Unknown"
                     path = att['path'] or "No path"
                     att_title = att['att_title'] or "No title"
-                    att_date = att['att_dateAdded'][:19] if att['att_dateAdded'] else "No Date"
+                    att_date = att['att_dateAdded']
+                    att_date = att_date[:19] if att_date else "No Date"
                     storage_hash = att['storageHash'] or "No hash"
                     
-                    print(f"\n  📎 Attachment {att_id}:")
-                    print(f"     Title: {att_title}")
-                    print(f"     Type: {link_mode}")
-                    print(f"     Content: {content_type}")
-                    print(f"     Added: {att_date}")
-                    print(f"     Storage Hash: {storage_hash}")
-                    print(f"     Path: {path}")
+                    out.append(f"\n  📎 Attachment {att_id}:")
+                    out.append(f"     Title: {att_title}")
+                    out.append(f"     Type: {link_mode}")
+                    out.append(f"     Content: {content_type}")
+                    out.append(f"     Added: {att_date}")
+                    out.append(f"     Storage Hash: {storage_hash}")
+                    out.append(f"     Path: {path}")
                     
                     # Check if file exists for linked files
                     if att['linkMode'] == 1 and path and not path.startswith('x-devonthink'):
                         exists = "✅" if os.path.exists(path) else "❌"
-                        print(f"     File Exists: {exists}")
+                        out.append(f"     File Exists: {exists}")
                     elif att['linkMode'] == 0 and path and path.startswith("storage:"):
                         # Check stored file
-                        parts = path.split(":")
-                        if len(parts) >= 3:
-                            key = parts[1]
-                            filename = ":".join(parts[2:])
-                            storage_path = Path("/Users/travisross/Zotero/storage") / key / filename
+                        _, _, rest = path.partition(":")
+                        key, sep, filename = rest.partition(":")
+                        if sep:
+                            storage_path = ZOTERO_STORAGE_PATH / key / filename
                             exists = "✅" if storage_path.exists() else "❌"
-                            print(f"     Storage Exists: {exists} - {storage_path}")
+                            out.append(f"     Storage Exists: {exists} - {storage_path}")
+
+            sys.stdout.write("\n".join(out) + "\n")
 
 def main():
     """Main function"""
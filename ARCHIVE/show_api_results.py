@@ -33,8 +33,12 @@ def show_api_results():
         'format': 'json'
     }
     
+    # One keep-alive session for every request below
+    session = requests.Session()
+    session.headers.update(headers)
+    
     url = f"{ZOTERO_API_BASE}/users/{ZOTERO_USER_ID}/items"
-    response = requests.get(url, params=params, headers=headers)
+    response = session.get(url, params=params)
     
     if response.status_code == 200:
         attachments = response.json()
@@ -71,16 +75,19 @@ def show_api_results():
         # Show a few parent items too
         print(f"\n📚 Getting parent items...")
         
-        for item in attachments[:3]:  # Just first 3
-            data = item.get('data', {})
-            parent_key = data.get('parentItem')
+        parent_keys = [
+            item.get('data', {}).get('parentItem')
+            for item in attachments[:3]  # Just first 3
+        ]
+        parent_keys = [k for k in parent_keys if k]
+        
+        if parent_keys:
+            # Fetch all parents in one multi-key request
+            parent_response = session.get(url, params={'itemKey': ','.join(parent_keys)})
             
-            if parent_key:
-                parent_url = f"{ZOTERO_API_BASE}/users/{ZOTERO_USER_ID}/items/{parent_key}"
-                parent_response = requests.get(parent_url, headers=headers)
-                
-                if parent_response.status_code == 200:
-                    parent_data = parent_response.json().get('data', {})
+            if parent_response.status_code == 200:
+                for parent in parent_response.json():
+                    parent_data = parent.get('data', {})
                     print(f"\nParent: {parent_data.get('title', 'No title')}")
                     print(f"  Authors: {', '.join([c.get('firstName', '') + ' ' + c.get('lastName', '') for c in parent_data.get('creators', [])])}")
                     print(f"  Date: {parent_data.get('date', 'No date')}")
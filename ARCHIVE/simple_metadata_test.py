@@ -11,55 +11,47 @@ def execute_applescript(script: str) -> str:
         result = subprocess.run(
             ['osascript', '-e', script],
             capture_output=True,
-            text=True,
             check=True
         )
-        return result.stdout.strip()
+        return result.stdout.decode('utf-8').strip()
     except subprocess.CalledProcessError as e:
-        return f"ERROR: {e.stderr}"
+        return f"ERROR: {e.stderr.decode('utf-8', errors='replace')}"
 
-def test_simple_metadata_update(uuid: str):
-    """Test simple metadata addition"""
+def update_and_verify_metadata(uuids: list) -> str:
+    """Read, update and re-read metadata for each UUID in one AppleScript call
     
-    script = f'''
-    tell application "DEVONthink 3"
-        try
-            set theRecord to get record with uuid "{uuid}"
-            
-            -- Get current name for reference
-            set currentName to name of theRecord
-            
-            -- Add a simple custom metadata field
-            set custom meta data of theRecord to {{zotero_test:"sync_test_2026-01-27", zotero_id:"20061"}}
-            
-            -- Add a tag
-            set tags of theRecord to {{"zotero_sync_test"}}
-            
-            return "SUCCESS: Updated " & currentName
-        on error errMsg
-            return "ERROR: " & errMsg
-        end try
-    end tell
-    '''
-    
-    return execute_applescript(script)
-
-def get_item_metadata(uuid: str):
-    """Get current metadata to verify changes"""
+    Each record is looked up once and all three steps share the same
+    Apple Event session, instead of three separate osascript runs per UUID.
+    """
+    uuid_list = ", ".join(f'"{uuid}"' for uuid in uuids)
     
     script = f'''
     tell application "DEVONthink 3"
-        try
-            set theRecord to get record with uuid "{uuid}"
-            
-            set itemName to name of theRecord
-            set itemTags to tags of theRecord
-            set itemMeta to custom meta data of theRecord
-            
-            return itemName & "|TAGS|" & (itemTags as string) & "|META|" & (itemMeta as string)
-        on error errMsg
-            return "ERROR: " & errMsg
-        end try
+        set report to {{}}
+        repeat with theUUID in {{{uuid_list}}}
+            try
+                set theRecord to get record with uuid theUUID
+                
+                -- Before
+                set itemName to name of theRecord
+                set beforeState to itemName & "|TAGS|" & ((tags of theRecord) as string) & "|META|" & ((custom meta data of theRecord) as string)
+                
+                -- Update
+                set custom meta data of theRecord to {{zotero_test:"sync_test_2026-01-27", zotero_id:"20061"}}
+                set tags of theRecord to {{"zotero_sync_test"}}
+                
+                -- After
+                set afterState to itemName & "|TAGS|" & ((tags of theRecord) as string) & "|META|" & ((custom meta data of theRecord) as string)
+                
+                set end of report to (theUUID as string) & linefeed & "BEFORE: " & beforeState & linefeed & "RESULT: SUCCESS: Updated " & itemName & linefeed & "AFTER: " & afterState
+            on error errMsg
+                set end of report to (theUUID as string) & linefeed & "ERROR: " & errMsg
+            end try
+        end repeat
+        set AppleScript's text item delimiters to linefeed & linefeed
+        set reportText to report as string
+        set AppleScript's text item delimiters to ""
+        return reportText
     end tell
     '''
     
@@ -73,19 +65,10 @@ def main():
     print("🧪 Testing Simple Metadata Update")
     print("=" * 50)
     
-    print("📋 Before update:")
-    before = get_item_metadata(test_uuid)
-    print(before)
-    
     print(f"\n🔄 Adding test metadata to DEVONthink item {test_uuid}...")
-    result = test_simple_metadata_update(test_uuid)
-    print(f"Result: {result}")
-    
-    print(f"\n📋 After update:")
-    after = get_item_metadata(test_uuid)
-    print(after)
+    print(update_and_verify_metadata([test_uuid]))
     
     print(f"\n🔗 Open in DEVONthink: x-devonthink-item://{test_uuid}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -15,17 +15,51 @@ import json
 import subprocess
 from pathlib import Path
 from contextlib import contextmanager
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, asdict, field
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 import hashlib
 import shutil
+import threading
+from collections import defaultdict
 
 # Configuration
 ZOTERO_DB_PATH = "/Users/travisross/Zotero/zotero.sqlite"
+ZOTERO_MIRROR_PATH = "/Users/travisross/DEVONzot/zotero_mirror.sqlite"  # Indexed read-only copy
 ZOTERO_STORAGE_PATH = "/Users/travisross/Zotero/storage"
 ZOTFILE_IMPORT_PATH = "/Users/travisross/ZotFile Import"
 DEVONTHINK_DATABASE = "Research"  # Target DEVONthink database
+SYNC_FIELDS = ('title', 'publicationTitle', 'date', 'DOI', 'url')
+SQLITE_IN_CHUNK = 500  # Item IDs per IN (...) list, well under SQLite's variable limit
+
+# Fixed statement text with bound parameters, so every sync cycle hits the
+# connection's prepared-statement cache
+ITEMS_NEEDING_SYNC_SQL = """
+    SELECT i.itemID, i.key, i.dateAdded, i.dateModified
+    FROM items i
+    WHERE i.itemID NOT IN (SELECT itemID FROM itemAttachments)
+    ORDER BY i.dateModified DESC
+"""
+ITEMS_MODIFIED_SINCE_SQL = """
+    SELECT i.itemID, i.key, i.dateAdded, i.dateModified
+    FROM items i
+    WHERE i.itemID NOT IN (SELECT itemID FROM itemAttachments)
+    AND i.dateModified > ?
+    ORDER BY i.dateModified DESC
+"""
+STORED_ATTACHMENTS_SQL = """
+    SELECT ia.itemID, ia.parentItemID, ia.linkMode, ia.contentType, ia.path, ia.storageHash
+    FROM itemAttachments ia
+    WHERE ia.linkMode = 0
+    AND ia.path IS NOT NULL
+    AND ia.path LIKE 'storage:%'
+"""
+ZOTFILE_SYMLINKS_SQL = """
+    SELECT ia.itemID, ia.parentItemID, ia.linkMode, ia.contentType, ia.path, ia.storageHash
+    FROM itemAttachments ia
+    WHERE ia.linkMode = 1
+    AND ia.path LIKE '/Users/travisross/ZotFile Import/%'
+"""
 
 @dataclass
 class ZoteroItem:
@@ -53,6 +87,42 @@ class ZoteroAttachment:
     path: Optional[str]
     storage_hash: Optional[str]
 
+@dataclass
+class AttachmentColumns:
+    """Attachment rows stored column-wise
+    
+    Scans over thousands of attachments keep one list per field instead of
+    one object per row; rows() builds ZoteroAttachment objects on demand.
+    """
+    item_ids: List[int] = field(default_factory=list)
+    parent_item_ids: List[Optional[int]] = field(default_factory=list)
+    link_modes: List[int] = field(default_factory=list)
+    content_types: List[str] = field(default_factory=list)
+    paths: List[Optional[str]] = field(default_factory=list)
+    storage_hashes: List[Optional[str]] = field(default_factory=list)
+    
+    @classmethod
+    def from_cursor(cls, cursor) -> "AttachmentColumns":
+        """Fill the columns from rows of (itemID, parentItemID, linkMode, contentType, path, storageHash)"""
+        columns = cls()
+        for item_id, parent_item_id, link_mode, content_type, path, storage_hash in cursor:
+            columns.item_ids.append(item_id)
+            columns.parent_item_ids.append(parent_item_id)
+            columns.link_modes.append(link_mode)
+            columns.content_types.append(content_type)
+            columns.paths.append(path)
+            columns.storage_hashes.append(storage_hash)
+        return columns
+    
+    def __len__(self) -> int:
+        return len(self.item_ids)
+    
+    def rows(self):
+        """Yield each attachment as a ZoteroAttachment"""
+        for values in zip(self.item_ids, self.parent_item_ids, self.link_modes,
+                          self.content_types, self.paths, self.storage_hashes):
+            yield ZoteroAttachment(*values)
+
 @dataclass
 class DEVONthinkItem:
     """DEVONthink item representation"""
@@ -66,190 +136,346 @@ class DEVONthinkItem:
     custom_metadata: Dict[str, Any]
     url: str  # x-devonthink-item://uuid
 
+# Covering indexes for the per-item lookups, created on the mirror only
+MIRROR_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_itemdata_item_field ON itemData(itemID, fieldID, valueID)",
+    "CREATE INDEX IF NOT EXISTS idx_itemcreators_item_order ON itemCreators(itemID, orderIndex, creatorID, creatorTypeID)",
+    "CREATE INDEX IF NOT EXISTS idx_itemtags_item ON itemTags(itemID, tagID)",
+    "CREATE INDEX IF NOT EXISTS idx_collectionitems_item ON collectionItems(itemID, collectionID)",
+]
+
 class ZoteroDatabase:
-    """Safe Zotero database interface"""
+    """Safe Zotero database interface
     
-    def __init__(self, db_path: str):
+    With a mirror_path, reads go to a copy of the Zotero database that has
+    extra covering indexes and planner statistics. refresh_mirror() rebuilds
+    the copy with VACUUM INTO if the live database has changed; call it once
+    per sync cycle. The live file is only ever read. Writes always go to
+    db_path.
+    """
+    
+    def __init__(self, db_path: str, mirror_path: Optional[str] = None):
         self.db_path = db_path
+        self.mirror_path = Path(mirror_path) if mirror_path else None
+        self._mirror_source_mtime = None
+        self._mirror_generation = 0  # Bumped on rebuild so cached mirror connections reopen
+        self._tls = threading.local()
+        self._all_connections = []
+        self._connections_lock = threading.Lock()
+        # Connections to an older mirror, closed at the next refresh
+        self._retired_connections = []
+        self._mirror_lock = threading.Lock()  # One rebuild of the mirror at a time
+        self.refresh_mirror()
+    
+    def _source_mtime(self) -> float:
+        """Latest modification time of the live database, including its WAL"""
+        mtimes = [os.path.getmtime(self.db_path)]
+        wal_path = f"{self.db_path}-wal"
+        if os.path.exists(wal_path):
+            mtimes.append(os.path.getmtime(wal_path))
+        return max(mtimes)
+    
+    def refresh_mirror(self) -> bool:
+        """Rebuild the indexed mirror if the live database has changed
+        
+        Connections left on the previous mirror are closed here, so call this
+        between sync cycles, when no cursor from the last cycle is still open.
+        """
+        if not self.mirror_path:
+            return False
+        with self._connections_lock:
+            retired, self._retired_connections = self._retired_connections, []
+        for conn in retired:
+            conn.close()
+        with self._mirror_lock:
+            return self._refresh_mirror_locked()
+    
+    def _refresh_mirror_locked(self) -> bool:
+        try:
+            source_mtime = self._source_mtime()
+        except OSError:
+            return False
+        if self._mirror_source_mtime == source_mtime and self.mirror_path.exists():
+            return True
+        
+        tmp_path = self.mirror_path.with_suffix(".tmp")
+        try:
+            self.mirror_path.parent.mkdir(parents=True, exist_ok=True)
+            if tmp_path.exists():
+                tmp_path.unlink()
+            source = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30)
+            try:
+                source.execute("VACUUM INTO ?", (str(tmp_path),))
+            finally:
+                source.close()
+            
+            mirror = sqlite3.connect(str(tmp_path))
+            try:
+                for statement in MIRROR_INDEXES:
+                    mirror.execute(statement)
+                mirror.execute("ANALYZE")
+                mirror.commit()
+            finally:
+                mirror.close()
+            os.replace(tmp_path, self.mirror_path)
+            self._mirror_source_mtime = source_mtime
+            self._mirror_generation += 1
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  Could not refresh Zotero mirror, reading live database: {e}")
+            self._mirror_source_mtime = None
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return False
     
     @contextmanager
     def connection(self, read_only=True):
-        """Safe database connection"""
-        conn = None
-        try:
-            conn = sqlite3.connect(self.db_path, timeout=30)
-            conn.row_factory = sqlite3.Row
-            if read_only:
-                conn.execute("PRAGMA query_only = ON")
-            yield conn
-        finally:
-            if conn:
+        """Safe database connection
+        
+        Connections are opened once per thread and kept, so SQLite's prepared
+        statement cache stays warm across calls. Call close() on shutdown.
+        """
+        if read_only and self._mirror_source_mtime is not None:
+            db_path = str(self.mirror_path)
+        else:
+            db_path = self.db_path
+        yield self._thread_connection(db_path, read_only)
+    
+    def _thread_connection(self, db_path: str, read_only: bool) -> sqlite3.Connection:
+        """Return this thread's connection for db_path, opening it on first use"""
+        cache = getattr(self._tls, "connections", None)
+        if cache is None:
+            cache = self._tls.connections = {}
+        generation = self._mirror_generation if db_path != self.db_path else 0
+        key = (db_path, read_only)
+        cached = cache.get(key)
+        if cached and cached[0] == generation:
+            return cached[1]
+        if cached:
+            # A generator may still be reading from it; close it at the next refresh
+            with self._connections_lock:
+                self._all_connections.remove(cached[1])
+                self._retired_connections.append(cached[1])
+        
+        conn = sqlite3.connect(db_path, timeout=30, cached_statements=256,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # Larger page cache and memory-mapped reads keep repeated lookups off disk
+        conn.execute("PRAGMA mmap_size = 268435456")
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+            if db_path != self.db_path:
+                conn.execute("PRAGMA read_uncommitted = 1")
+        else:
+            # Connection-scoped; Zotero's own journal_mode is left alone
+            conn.execute("PRAGMA synchronous = NORMAL")
+        
+        cache[key] = (generation, conn)
+        with self._connections_lock:
+            self._all_connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every connection opened by this instance"""
+        with self._connections_lock:
+            connections = self._all_connections + self._retired_connections
+            self._all_connections, self._retired_connections = [], []
+        for conn in connections:
+            try:
                 conn.close()
+            except sqlite3.Error:
+                pass
+        self._tls = threading.local()
     
     def get_items_needing_sync(self, since_timestamp: str = None) -> List[ZoteroItem]:
-        """Get Zotero items that need syncing to DEVONthink"""
+        """Get Zotero items that need syncing to DEVONthink
+        
+        With since_timestamp, only items modified after it are considered.
+        """
+        return list(self.iter_items_needing_sync(since_timestamp))
+    
+    def iter_items_needing_sync(self, since_timestamp: str = None,
+                                chunk: int = 1000) -> Iterator[ZoteroItem]:
+        """Yield items needing sync, building chunk rows at a time with fetchmany
+        
+        Only one chunk of items is in memory at once. Like
+        iter_stored_attachments, the cursor holds a read transaction until
+        the generator is exhausted.
+        """
         with self.connection() as conn:
-            query = """
-                SELECT DISTINCT
-                    i.itemID,
-                    i.key,
-                    i.dateAdded,
-                    i.dateModified,
-                    GROUP_CONCAT(
-                        CASE WHEN f.fieldName = 'title' THEN idv.value END
-                    ) as title,
-                    GROUP_CONCAT(
-                        CASE WHEN f.fieldName = 'publicationTitle' THEN idv.value END
-                    ) as publication,
-                    GROUP_CONCAT(
-                        CASE WHEN f.fieldName = 'date' THEN idv.value END
-                    ) as date,
-                    GROUP_CONCAT(
-                        CASE WHEN f.fieldName = 'DOI' THEN idv.value END
-                    ) as doi,
-                    GROUP_CONCAT(
-                        CASE WHEN f.fieldName = 'url' THEN idv.value END
-                    ) as url
-                FROM items i
-                LEFT JOIN itemData id ON i.itemID = id.itemID
-                LEFT JOIN fields f ON id.fieldID = f.fieldID
-                LEFT JOIN itemDataValues idv ON id.valueID = idv.valueID
-                WHERE i.itemID NOT IN (SELECT itemID FROM itemAttachments)
-                GROUP BY i.itemID
-                HAVING url NOT LIKE 'x-devonthink-item://%' OR url IS NULL
-                ORDER BY i.dateModified DESC
-            """
-            
-            cursor = conn.execute(query)
-            items = []
-            
-            for row in cursor.fetchall():
-                # Get authors
-                authors = self._get_item_authors(conn, row['itemID'])
-                
-                # Get tags  
-                tags = self._get_item_tags(conn, row['itemID'])
+            if since_timestamp:
+                cursor = conn.execute(ITEMS_MODIFIED_SINCE_SQL, (since_timestamp,))
+            else:
+                cursor = conn.execute(ITEMS_NEEDING_SYNC_SQL)
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                fields = self._get_fields_by_item(conn, [row['itemID'] for row in rows])
                 
-                # Get collections
-                collections = self._get_item_collections(conn, row['itemID'])
-                
-                items.append(ZoteroItem(
-                    item_id=row['itemID'],
-                    key=row['key'],
-                    title=row['title'] or "Untitled",
-                    authors=authors,
-                    publication=row['publication'],
-                    date=row['date'],
-                    doi=row['doi'],
-                    url=row['url'],
-                    tags=tags,
-                    collections=collections,
-                    date_added=row['dateAdded'],
-                    date_modified=row['dateModified']
-                ))
+                # Items already linked to DEVONthink are done
+                rows = [
+                    row for row in rows
+                    if not (fields[row['itemID']].get('url') or '').lower().startswith('x-devonthink-item://')
+                ]
+                yield from self._build_items(conn, rows, fields)
+    
+    def get_items_by_ids(self, item_ids: List[int]) -> List[ZoteroItem]:
+        """Get items by itemID using bulk IN (...) queries"""
+        with self.connection() as conn:
+            rows = []
+            for chunk in self._chunks(item_ids):
+                placeholders = ",".join("?" * len(chunk))
+                cursor = conn.execute(f"""
+                    SELECT i.itemID, i.key, i.dateAdded, i.dateModified
+                    FROM items i
+                    WHERE i.itemID IN ({placeholders})
+                """, chunk)
+                rows.extend(cursor.fetchall())
+            fields = self._get_fields_by_item(conn, [row['itemID'] for row in rows])
+            return self._build_items(conn, rows, fields)
+    
+    def _build_items(self, conn, rows, fields: Dict[int, Dict[str, str]]) -> List[ZoteroItem]:
+        """Build ZoteroItems from item rows, fetching related data in bulk"""
+        item_ids = [row['itemID'] for row in rows]
+        # One plain query per side table beats a single query that folds them
+        # into json_group_array columns: the correlated subqueries plus JSON
+        # encode/decode cost more than the two extra in-process round trips.
+        authors = self._get_authors_by_item(conn, item_ids)
+        tags = self._get_tags_by_item(conn, item_ids)
+        collections = self._get_collections_by_item(conn, item_ids)
+        
+        items = []
+        for row in rows:
+            item_fields = fields[row['itemID']]
+            items.append(ZoteroItem(
+                item_id=row['itemID'],
+                key=row['key'],
+                title=item_fields.get('title') or "Untitled",
+                authors=authors[row['itemID']],
+                publication=item_fields.get('publicationTitle'),
+                date=item_fields.get('date'),
+                doi=item_fields.get('DOI'),
+                url=item_fields.get('url'),
+                tags=tags[row['itemID']],
+                collections=collections[row['itemID']],
+                date_added=row['dateAdded'],
+                date_modified=row['dateModified']
+            ))
+        return items
+    
+    def _get_fields_by_item(self, conn, item_ids: List[int]) -> Dict[int, Dict[str, str]]:
+        """Get the synced metadata fields for many items as {itemID: {fieldName: value}}
+        
+        Selecting plain (fieldName, value) rows restricted by an IN list lets
+        SQLite skip unwanted fields instead of evaluating a CASE per field row.
+        """
+        fields = defaultdict(dict)
+        field_placeholders = ",".join("?" * len(SYNC_FIELDS))
+        for chunk in self._chunks(item_ids):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"""
+                SELECT id.itemID, f.fieldName, idv.value
+                FROM itemData id
+                JOIN fields f ON id.fieldID = f.fieldID
+                JOIN itemDataValues idv ON id.valueID = idv.valueID
+                WHERE id.itemID IN ({placeholders})
+                AND f.fieldName IN ({field_placeholders})
+            """, chunk + SYNC_FIELDS)
             
-            return items
+            for item_id, field_name, value in cursor:
+                fields[item_id][field_name] = value
+        
+        return fields
+    
+    @staticmethod
+    def _chunks(item_ids: List[int]):
+        for i in range(0, len(item_ids), SQLITE_IN_CHUNK):
+            yield tuple(item_ids[i:i + SQLITE_IN_CHUNK])
     
-    def get_stored_attachments(self) -> List[ZoteroAttachment]:
+    def get_stored_attachments(self) -> AttachmentColumns:
         """Get attachments stored in Zotero storage that need migration"""
         with self.connection() as conn:
-            cursor = conn.execute("""
-                SELECT 
-                    ia.itemID,
-                    ia.parentItemID,
-                    ia.linkMode,
-                    ia.contentType,
-                    ia.path,
-                    ia.storageHash
-                FROM itemAttachments ia
-                WHERE ia.linkMode = 0 
-                AND ia.path IS NOT NULL
-                AND ia.path LIKE 'storage:%'
-            """)
-            
-            attachments = []
-            for row in cursor.fetchall():
-                attachments.append(ZoteroAttachment(
-                    item_id=row['itemID'],
-                    parent_item_id=row['parentItemID'],
-                    link_mode=row['linkMode'],
-                    content_type=row['contentType'],
-                    path=row['path'],
-                    storage_hash=row['storageHash']
-                ))
-            
-            return attachments
+            return AttachmentColumns.from_cursor(conn.execute(STORED_ATTACHMENTS_SQL))
     
-    def get_zotfile_symlinks(self) -> List[ZoteroAttachment]:
+    def get_zotfile_symlinks(self) -> AttachmentColumns:
         """Get ZotFile symlink attachments that need DEVONthink UUID conversion"""
         with self.connection() as conn:
-            cursor = conn.execute("""
-                SELECT 
-                    ia.itemID,
-                    ia.parentItemID,
-                    ia.linkMode,
-                    ia.contentType,
-                    ia.path,
-                    ia.storageHash
-                FROM itemAttachments ia
-                WHERE ia.linkMode = 1
-                AND ia.path LIKE '/Users/travisross/ZotFile Import/%'
-            """)
-            
-            attachments = []
-            for row in cursor.fetchall():
-                attachments.append(ZoteroAttachment(
-                    item_id=row['itemID'],
-                    parent_item_id=row['parentItemID'],
-                    link_mode=row['linkMode'],
-                    content_type=row['contentType'],
-                    path=row['path'],
-                    storage_hash=row['storageHash']
-                ))
+            return AttachmentColumns.from_cursor(conn.execute(ZOTFILE_SYMLINKS_SQL))
+    
+    def iter_stored_attachments(self) -> Iterator[ZoteroAttachment]:
+        """Yield stored attachments one at a time as the query produces them
+        
+        The cursor keeps a read transaction open until it is exhausted, so
+        don't hold it across slow per-row work when reading the live database.
+        """
+        with self.connection() as conn:
+            for row in conn.execute(STORED_ATTACHMENTS_SQL):
+                yield ZoteroAttachment(*row)
+    
+    def iter_zotfile_symlinks(self) -> Iterator[ZoteroAttachment]:
+        """Yield ZotFile symlink attachments one at a time; see iter_stored_attachments"""
+        with self.connection() as conn:
+            for row in conn.execute(ZOTFILE_SYMLINKS_SQL):
+                yield ZoteroAttachment(*row)
+    
+    def _get_authors_by_item(self, conn, item_ids: List[int]) -> Dict[int, List[str]]:
+        """Get authors for many items, keyed by itemID"""
+        authors = defaultdict(list)
+        for chunk in self._chunks(item_ids):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"""
+                SELECT ic.itemID, c.firstName, c.lastName
+                FROM itemCreators ic
+                JOIN creators c ON ic.creatorID = c.creatorID
+                WHERE ic.itemID IN ({placeholders})
+                ORDER BY ic.itemID, ic.orderIndex
+            """, chunk)
             
-            return attachments
-    
-    def _get_item_authors(self, conn, item_id: int) -> List[str]:
-        """Get authors for an item"""
-        cursor = conn.execute("""
-            SELECT c.firstName, c.lastName
-            FROM itemCreators ic
-            JOIN creators c ON ic.creatorID = c.creatorID
-            WHERE ic.itemID = ?
-            ORDER BY ic.orderIndex
-        """, (item_id,))
-        
-        authors = []
-        for row in cursor.fetchall():
-            first = row['firstName'] or ""
-            last = row['lastName'] or ""
-            name = f"{first} {last}".strip()
-            if name:
-                authors.append(name)
+            for item_id, first, last in cursor:
+                name = f"{first or ''} {last or ''}".strip()
+                if name:
+                    authors[item_id].append(name)
         
         return authors
     
-    def _get_item_tags(self, conn, item_id: int) -> List[str]:
-        """Get tags for an item"""
-        cursor = conn.execute("""
-            SELECT t.name
-            FROM itemTags it
-            JOIN tags t ON it.tagID = t.tagID
-            WHERE it.itemID = ?
-        """, (item_id,))
+    def _get_tags_by_item(self, conn, item_ids: List[int]) -> Dict[int, List[str]]:
+        """Get tags for many items, keyed by itemID"""
+        tags = defaultdict(list)
+        for chunk in self._chunks(item_ids):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"""
+                SELECT it.itemID, t.name
+                FROM itemTags it
+                JOIN tags t ON it.tagID = t.tagID
+                WHERE it.itemID IN ({placeholders})
+            """, chunk)
+            
+            for item_id, name in cursor:
+                tags[item_id].append(name)
         
-        return [row['name'] for row in cursor.fetchall()]
+        return tags
     
-    def _get_item_collections(self, conn, item_id: int) -> List[str]:
-        """Get collections for an item"""
-        cursor = conn.execute("""
-            SELECT c.collectionName
-            FROM collectionItems ci
-            JOIN collections c ON ci.collectionID = c.collectionID
-            WHERE ci.itemID = ?
-        """, (item_id,))
+    def _get_collections_by_item(self, conn, item_ids: List[int]) -> Dict[int, List[str]]:
+        """Get collections for many items, keyed by itemID"""
+        collections = defaultdict(list)
+        for chunk in self._chunks(item_ids):
+            placeholders = ",".join("?" * len(chunk))
+            cursor = conn.execute(f"""
+                SELECT ci.itemID, c.collectionName
+                FROM collectionItems ci
+                JOIN collections c ON ci.collectionID = c.collectionID
+                WHERE ci.itemID IN ({placeholders})
+            """, chunk)
+            
+            for item_id, collection_name in cursor:
+                collections[item_id].append(collection_name)
         
-        return [row['collectionName'] for row in cursor.fetchall()]
+        return collections
     
     def update_item_url(self, item_id: int, devonthink_uuid: str, read_only=False):
         """Update item URL to DEVONthink UUID link"""
@@ -431,7 +657,7 @@ class ZoteroDevonthinkSync:
     """Main synchronization engine"""
     
     def __init__(self):
-        self.zotero = ZoteroDatabase(ZOTERO_DB_PATH)
+        self.zotero = ZoteroDatabase(ZOTERO_DB_PATH, mirror_path=ZOTERO_MIRROR_PATH)
         self.devonthink = DEVONthinkInterface(DEVONTHINK_DATABASE)
         self.sync_log = []
     
@@ -453,7 +679,10 @@ class ZoteroDevonthinkSync:
         attachments = self.zotero.get_stored_attachments()
         print(f"Found {len(attachments)} stored attachments to migrate")
         
-        for attachment in attachments:
+        # Items needing sync, fetched once rather than per attachment
+        items_by_id = {item.item_id: item for item in self.zotero.get_items_needing_sync()}
+        
+        for attachment in attachments.rows():
             try:
                 # Resolve file path
                 file_path = self._resolve_storage_path(attachment)
@@ -462,12 +691,7 @@ class ZoteroDevonthinkSync:
                     continue
                 
                 # Get parent item metadata
-                if attachment.parent_item_id:
-                    parent_items = self.zotero.get_items_needing_sync()
-                    parent_metadata = next((item for item in parent_items 
-                                          if item.item_id == attachment.parent_item_id), None)
-                else:
-                    parent_metadata = None
+                parent_metadata = items_by_id.get(attachment.parent_item_id)
                 
                 if not parent_metadata:
                     self.log_action("SKIP", attachment.item_id, "No parent metadata found")
@@ -496,7 +720,7 @@ class ZoteroDevonthinkSync:
         symlinks = self.zotero.get_zotfile_symlinks()
         print(f"Found {len(symlinks)} ZotFile symlinks to convert")
         
-        for symlink in symlinks:
+        for symlink in symlinks.rows():
             try:
                 # Extract filename from path
                 filename = Path(symlink.path).name if symlink.path else ""
@@ -556,6 +780,8 @@ def main():
     sync_engine = ZoteroDevonthinkSync()
     
     print("🚀 DEVONzot Integration Starting...")
+    # Bring the read mirror up to date once for the whole run
+    sync_engine.zotero.refresh_mirror()
     print("="*60)
     
     # Phase 1: Migrate stored attachments
@@ -573,6 +799,7 @@ def main():
     
     # Save log
     sync_engine.save_sync_log()
+    sync_engine.zotero.close()
     
     print("\n🎉 Integration analysis complete!")
     print("Run with dry_run=False to execute actual changes")
@@ -16,11 +16,16 @@ Version: 1.0
 """
 
 import os
+import sys
 import json
+import base64
+import sqlite3
+import select
 import subprocess
 import signal
 import time
 import hashlib
+import random
 import shutil
 import re
 import logging
@@ -28,14 +33,32 @@ from logging.handlers import RotatingFileHandler
 import asyncio
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable
 from datetime import datetime, timedelta
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, Counter, defaultdict
+from functools import cached_property, lru_cache
+from itertools import combinations
+from string import Template
 from dotenv import load_dotenv
 from zotero_api_client import ZoteroAPIClient
 from devonthink_mcp import DevonthinkMCP, DevonthinkMCPError
 
+# Try to import watchdog for Inbox arrival events, but don't fail if not installed
+try:
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# Try to import orjson for faster state-file serialization
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv(Path(__file__).resolve().parent.parent / '.env')
 
@@ -52,21 +75,35 @@ ZOTFILE_IMPORT_PATH = "/Users/travisross/ZotFile Import"
 DEVONTHINK_INBOX_PATH = "/Users/travisross/Library/Application Support/DEVONthink/Inbox"
 DEVONTHINK_DATABASE = "Professional"
 DEVONTHINK_GLOBAL_INBOX = "Global Inbox"
+# Folder holding the <database>.dtBase2 packages, for direct name lookups in their Metadata.db
+DEVONTHINK_INDEX_PATH = os.environ.get(
+    "DEVONTHINK_INDEX_PATH",
+    str(Path.home() / "Library/Application Support/DEVONthink 3"),
+)
 # DEVONthink control backend: MCP (token auth, no AppleScript/TCC) vs legacy AppleScript.
 # Default OFF so deploying the code does not change behavior until DEVONZOT_USE_MCP is set in .env.
 USE_MCP = os.environ.get("DEVONZOT_USE_MCP", "false").strip().lower() in ("1", "true", "yes", "on")
 DEVONZOT_PATH = Path("/Users/travisross/DEVONzot")
 STATE_FILE = DEVONZOT_PATH / "service_state.json"
+PROCESSED_ITEMS_DB = DEVONZOT_PATH / "processed_items.db"
 LOG_FILE = DEVONZOT_PATH / "service.log"
 PID_FILE = DEVONZOT_PATH / "service.pid"
 
 # Service configuration
 SYNC_INTERVAL = 300  # 5 minutes (polling fallback)
 DEVONTHINK_WAIT_TIME = 3  # Reduced wait time for faster processing
+DEVONTHINK_RUNNING_TTL = 2.0  # Seconds a DEVONthink running check is reused
 MAX_RESTART_ATTEMPTS = 3
 RESTART_DELAY = 30  # seconds
 BATCH_SIZE = 50  # Items to process concurrently
 MAX_DOWNLOAD_RETRIES = 20  # Drop from pending_downloads after this many failures
+STATE_SAVE_EVERY = 50  # Processed items between state saves in migration loops
+STATE_SAVE_INTERVAL = 5.0  # ...or seconds, whichever comes first
+WORKLOAD_PROBE_WORKERS = 32  # Threads stat-ing storage files in the dry-run analysis
+MIGRATION_CONCURRENCY = 4  # ZotFile attachments migrated at once by the async migration
+SYMLINK_CONVERT_CONCURRENCY = 8  # Found symlinks linked/updated at once during symlink conversion
+SYMLINK_BATCH_PACE = 0.05  # Minimum seconds per symlink in a conversion batch; faster batches wait out the rest
+DEVONTHINK_UUID_CACHE_SIZE = 5000  # Filename -> DEVONthink UUID hits kept in the state file, least recently used evicted
 
 # Streaming configuration
 WEBSOCKET_ENABLED = os.environ.get("WEBSOCKET_ENABLED", "true").lower() == "true"
@@ -102,6 +139,11 @@ class ZoteroItem:
     date_modified: str
     version: int = 0
 
+    @cached_property
+    def title_words(self) -> frozenset:
+        """Lower-cased word set of the title, computed on first use"""
+        return frozenset(self.title.lower().split()) if self.title else frozenset()
+
 @dataclass
 class ZoteroAttachment:
     """Zotero attachment record"""
@@ -122,11 +164,16 @@ class ServiceState:
     last_zotero_check: Optional[str] = None
     last_library_version: Optional[int] = None
     last_phase0_library_version: Optional[int] = None
+    # Legacy: processed keys now live in PROCESSED_ITEMS_DB; read once to migrate old state files
     processed_items: List[str] = None
     restart_count: int = 0
     dry_run_results: Dict[str, Any] = None
     pending_deletes: List[Dict[str, Any]] = None
     pending_downloads: List[Dict[str, Any]] = None
+    # "key:version" of parentless stored attachments, skipped until an edit changes the version
+    skipped_attachments: List[str] = None
+    # Symlink filename (no extension) -> DEVONthink UUID found by an earlier search
+    devonthink_uuids: "OrderedDict[str, str]" = None
 
     def __post_init__(self):
         if self.processed_items is None:
@@ -141,20 +188,104 @@ class ServiceState:
             self.pending_deletes = []
         if self.pending_downloads is None:
             self.pending_downloads = []
+        if self.skipped_attachments is None:
+            self.skipped_attachments = []
+        self.devonthink_uuids = OrderedDict(self.devonthink_uuids or {})
+
+class ProcessedItems:
+    """Set of processed Zotero item keys kept in a SQLite sidecar to the state file
+
+    Lookups use the primary-key index instead of a list held in memory and
+    rewritten with every state save. Inserts are committed by commit(), which
+    _save_state calls, so they are batched the same way as other state changes.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        # Migrations mark items processed from worker threads (callers serialize via _state_lock)
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS processed (item_key TEXT PRIMARY KEY) WITHOUT ROWID")
+        self.conn.commit()
+
+    def __contains__(self, key: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM processed WHERE item_key = ?", (key,)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+
+    def add(self, key: str) -> bool:
+        """Insert key; returns False if it was already there"""
+        cursor = self.conn.execute("INSERT OR IGNORE INTO processed (item_key) VALUES (?)", (key,))
+        return cursor.rowcount == 1
+
+    def update(self, keys: Iterable[str]):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO processed (item_key) VALUES (?)", ((k,) for k in keys)
+        )
+
+    def discard(self, key: str):
+        self.conn.execute("DELETE FROM processed WHERE item_key = ?", (key,))
+
+    def commit(self):
+        self.conn.commit()
+
+# Filename sanitizing: problematic and control characters, then whitespace runs
+_RE_BAD_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f\x7f-\x9f]')
+_RE_WS = re.compile(r'\s+')
+# Same character class as _RE_BAD_CHARS, for str.translate
+_BAD_CHARS_TABLE = dict.fromkeys(
+    [ord(c) for c in '<>:"/\\|?*'] + list(range(0x00, 0x20)) + list(range(0x7f, 0xa0))
+)
+# Storage paths under a key directory: storage:KEY:file, KEY:file or KEY/file, where
+# KEY is 8 uppercase alphanumerics (\Z, unlike $, rejects a trailing newline)
+_RE_STORAGE_KEY_PATH = re.compile(r'(?:storage:([A-Z0-9]{8}):|([A-Z0-9]{8})[:/])(.+)\Z', re.DOTALL)
+
+
+def _is_dir_empty(path: Path, ignore: Tuple[str, ...] = ()) -> bool:
+    """True if path has no entries besides those named in ignore; stops at the first other entry"""
+    with os.scandir(path) as entries:
+        return all(entry.name in ignore for entry in entries)
+
+# Readable item type names used in generated filenames
+ITEM_TYPE_LABELS = {
+    'journalArticle': 'Journal Article',
+    'bookSection': 'Book Section',
+    'book': 'Book',
+    'webpage': 'Web Page',
+    'newspaperArticle': 'Newspaper Article',
+    'magazineArticle': 'Magazine Article',
+    'thesis': 'Thesis',
+    'conferencePaper': 'Conference Paper',
+    'report': 'Report',
+    'blogPost': 'Blog Post',
+    'podcast': 'Podcast',
+    'videoRecording': 'Video',
+    'audioRecording': 'Audio',
+    'document': 'Document',
+    'presentation': 'Presentation'
+}
+
 
 class FilenameGenerator:
     """Smart filename generation with configurable patterns"""
     
+    # (item key, dateModified, version) -> filename, evicted least recently used first
+    FILENAME_CACHE_SIZE = 5000
+    _filename_cache: "OrderedDict[Tuple[str, str, int], str]" = OrderedDict()
+    _filename_cache_lock = threading.Lock()
+    
     @staticmethod
+    @lru_cache(maxsize=4096)
     def sanitize_filename(text: str) -> str:
         """Clean text for filesystem compatibility"""
         if not text:
             return ""
         
         # Replace problematic characters
-        text = re.sub(r'[<>:"/\\|?*]', '', text)
-        text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)  # Remove control characters
-        text = re.sub(r'\s+', ' ', text)  # Normalize whitespace
+        text = text.translate(_BAD_CHARS_TABLE)
+        text = _RE_WS.sub(' ', text)  # Normalize whitespace
         text = text.strip()
         
         # Limit length
@@ -187,7 +318,28 @@ class FilenameGenerator:
         """Generate filename: {{ firstCreator }} - {{ title }} - {{ year }} - {{ itemType }}
         
         Uses smart separator skipping - if a component is missing, skip it AND its separator.
+        Results are cached per item until its dateModified or version changes.
         """
+        if not (item.date_modified or item.version):
+            return FilenameGenerator._build_filename(item)
+        
+        cache = FilenameGenerator._filename_cache
+        cache_key = (item.key, item.date_modified, item.version)
+        with FilenameGenerator._filename_cache_lock:
+            filename = cache.get(cache_key)
+            if filename is not None:
+                cache.move_to_end(cache_key)
+                return filename
+        
+        filename = FilenameGenerator._build_filename(item)
+        with FilenameGenerator._filename_cache_lock:
+            cache[cache_key] = filename
+            if len(cache) > FilenameGenerator.FILENAME_CACHE_SIZE:
+                cache.popitem(last=False)
+        return filename
+    
+    @staticmethod
+    def _build_filename(item: ZoteroItem) -> str:
         components = []
         
         # First creator
@@ -206,24 +358,7 @@ class FilenameGenerator:
         # Item type
         if item.item_type:
             # Convert technical names to readable format
-            item_type_map = {
-                'journalArticle': 'Journal Article',
-                'bookSection': 'Book Section',
-                'book': 'Book',
-                'webpage': 'Web Page',
-                'newspaperArticle': 'Newspaper Article',
-                'magazineArticle': 'Magazine Article',
-                'thesis': 'Thesis',
-                'conferencePaper': 'Conference Paper',
-                'report': 'Report',
-                'blogPost': 'Blog Post',
-                'podcast': 'Podcast',
-                'videoRecording': 'Video',
-                'audioRecording': 'Audio',
-                'document': 'Document',
-                'presentation': 'Presentation'
-            }
-            readable_type = item_type_map.get(item.item_type, item.item_type.title())
+            readable_type = ITEM_TYPE_LABELS.get(item.item_type, item.item_type.title())
             components.append(readable_type)
         
         # Join with separator, but only if we have components
@@ -238,55 +373,381 @@ class FilenameGenerator:
         return filename or "Untitled Item"
 
 
+class InboxWatcher:
+    """Signals when DEVONthink has taken copied files out of its Inbox folder.
+
+    DEVONthink imports a file from the Inbox folder by moving or removing it,
+    so that filesystem event marks the point where searching can find it.
+    Uses watchdog (FSEvents on macOS) when installed.
+    """
+
+    def __init__(self, inbox_path: str):
+        self.inbox_path = inbox_path
+        self._pending: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._observer = None
+
+    def start(self) -> bool:
+        """Start watching the Inbox. Returns False if watchdog isn't available."""
+        if not WATCHDOG_AVAILABLE:
+            return False
+        if self._observer is None:
+            try:
+                observer = Observer()
+                observer.schedule(self, self.inbox_path, recursive=False)
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+            except Exception as e:
+                logger.warning(f"Could not watch DEVONthink Inbox, using fixed waits: {e}")
+                return False
+        return True
+
+    def stop(self):
+        observer, self._observer = self._observer, None
+        if observer:
+            observer.stop()
+            observer.join(timeout=5)
+
+    def expect(self, *names: str):
+        """Register file names that are about to be copied into the Inbox."""
+        event = threading.Event()
+        with self._lock:
+            for name in names:
+                self._pending[name] = event
+
+    def is_pending(self, name: str) -> bool:
+        with self._lock:
+            return name in self._pending
+
+    def dispatch(self, event):
+        """watchdog callback: a moved/deleted Inbox file has been imported."""
+        if event.is_directory or event.event_type not in ('moved', 'deleted'):
+            return
+        name = Path(event.src_path).name
+        with self._lock:
+            pending = self._pending.get(name) or self._pending.get(Path(name).stem)
+        if pending:
+            pending.set()
+
+    def wait(self, name: str, timeout: float) -> bool:
+        """Block until name has left the Inbox. False on timeout or if not expected."""
+        with self._lock:
+            event = self._pending.get(name)
+        if event is None:
+            return False
+        arrived = event.wait(timeout)
+        with self._lock:
+            for key in [k for k, v in self._pending.items() if v is event]:
+                del self._pending[key]
+        return arrived
+
+
+class DevonthinkIndex:
+    """Read-only name -> UUID lookups in DEVONthink's per-database SQLite index.
+
+    Each <database>.dtBase2/Metadata.db is opened once with mode=ro and its
+    records table checked for name and uuid columns. Databases without a
+    usable index are remembered, and lookups there return None so callers
+    fall back to an AppleScript search. A locked file is not remembered.
+    """
+
+    def __init__(self, index_path: str):
+        self.index_path = Path(index_path)
+        self._connections: Dict[str, Optional[sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
+
+    def _metadata_path(self, database_name: str) -> Path:
+        package = "Inbox" if database_name == DEVONTHINK_GLOBAL_INBOX else database_name
+        return self.index_path / f"{package}.dtBase2" / "Metadata.db"
+
+    def _connect(self, database_name: str) -> Optional[sqlite3.Connection]:
+        if database_name in self._connections:
+            return self._connections[database_name]
+        path = self._metadata_path(database_name)
+        conn = None
+        if path.exists():
+            conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True,
+                                   timeout=0.5, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA query_only = ON")
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(records)")}
+            except sqlite3.Error:
+                conn.close()
+                raise
+            if not {'name', 'uuid'} <= columns:
+                logger.debug(f"No usable records table in {path}, searching via AppleScript")
+                conn.close()
+                conn = None
+        self._connections[database_name] = conn
+        return conn
+
+    def lookup(self, database_name: str, name: str) -> Optional[str]:
+        """UUID of the record named name, or None if absent or unavailable."""
+        with self._lock:
+            try:
+                conn = self._connect(database_name)
+                if conn is None:
+                    return None
+                row = conn.execute(
+                    "SELECT uuid FROM records WHERE name = ? LIMIT 1", (name,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"DEVONthink index lookup failed in {database_name}: {e}")
+                return None
+        return row[0] if row else None
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for conn in connections.values():
+            if conn is not None:
+                conn.close()
+
+
+# JXA loop run by a single long-lived osascript. Each stdin line is a
+# base64-encoded AppleScript; it is compiled and run with NSAppleScript and
+# answered with one "OK <base64 result>" or "ERR <base64 message>" line.
+OSASCRIPT_RUNNER = r"""
+ObjC.import('Foundation');
+var input = $.NSFileHandle.fileHandleWithStandardInput;
+var output = $.NSFileHandle.fileHandleWithStandardOutput;
+var buffer = '';
+function readLine() {
+    while (buffer.indexOf('\n') < 0) {
+        var data = input.availableData;
+        if (data.length == 0) return null;
+        buffer += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    }
+    var i = buffer.indexOf('\n');
+    var line = buffer.slice(0, i);
+    buffer = buffer.slice(i + 1);
+    return line;
+}
+function encode(text) {
+    return $(text).dataUsingEncoding($.NSUTF8StringEncoding).base64EncodedStringWithOptions(0).js;
+}
+function reply(status, text) {
+    output.writeData($(status + ' ' + encode(text) + '\n').dataUsingEncoding($.NSUTF8StringEncoding));
+}
+while (true) {
+    var line = readLine();
+    if (line === null) break;
+    var data = $.NSData.alloc.initWithBase64EncodedStringOptions(line, 0);
+    var source = $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding);
+    var error = $();
+    var result = $.NSAppleScript.alloc.initWithSource(source).executeAndReturnError(error);
+    if (result.isNil()) {
+        var message = error.objectForKey('NSAppleScriptErrorMessage');
+        reply('ERR', message.isNil() ? 'AppleScript error' : message.js);
+    } else {
+        var text = result.stringValue;
+        reply('OK', text.isNil() ? '' : text.js);
+    }
+}
+"""
+
+
+class OsascriptSession:
+    """One long-lived osascript process that runs AppleScripts sent over stdin.
+
+    Spawning osascript per call costs a fork, a scripting-addition load and a
+    fresh Apple Event connection every time. The session keeps one process
+    open, respawning it after a timeout or a broken pipe.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None):
+        self.command = command or ['osascript', '-l', 'JavaScript', '-e', OSASCRIPT_RUNNER]
+        self._process: Optional[subprocess.Popen] = None
+        self._buffer = b''
+        self._lock = threading.Lock()
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self._buffer = b''
+        return self._process
+
+    def _read_line(self, process: subprocess.Popen, timeout: float) -> bytes:
+        deadline = time.monotonic() + timeout
+        fd = process.stdout.fileno()
+        while b'\n' not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.command[0], timeout)
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                raise subprocess.TimeoutExpired(self.command[0], timeout)
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise BrokenPipeError("osascript session exited")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return line
+
+    def run(self, script: str, timeout: float = 30) -> Tuple[bool, str]:
+        """Run one AppleScript. Returns (ok, stdout-or-error-message)."""
+        payload = base64.b64encode(script.encode('utf-8')) + b'\n'
+        with self._lock:
+            for attempt in range(2):
+                process = self._ensure_process()
+                try:
+                    process.stdin.write(payload)
+                    process.stdin.flush()
+                    line = self._read_line(process, timeout)
+                    break
+                except (BrokenPipeError, OSError):
+                    # Process died between calls; start a fresh one and resend once
+                    self.close()
+                    if attempt:
+                        raise
+                except subprocess.TimeoutExpired:
+                    # A stuck script would poison the stream, so drop the process
+                    self.close()
+                    raise
+        status, _, body = line.partition(b' ')
+        text = base64.b64decode(body).decode('utf-8').strip()
+        return status == b'OK', text
+
+    def close(self):
+        """Stop the osascript process."""
+        process, self._process = self._process, None
+        self._buffer = b''
+        if process and process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+# AppleScript templates, built once. Optional parts are assembled in Python so
+# the scripts carry no runtime branches; values must be escaped by the caller.
+_UPDATE_METADATA_SCRIPT = Template('''
+tell application "DEVONthink"
+    try
+        set theRecord to get record with uuid "$uuid"
+        set comment of theRecord to "$comment"
+        $tags_block
+        return "SUCCESS"
+    on error errMsg
+        return "ERROR: " & errMsg
+    end try
+end tell
+''')
+
+_SEARCH_DATABASE_SCRIPT = Template('''
+tell application "DEVONthink"
+    try
+        tell database "$database"
+            set searchResults to search "$query"
+            if (count of searchResults) > 0 then
+                return uuid of item 1 of searchResults
+            end if
+        end tell
+    end try
+    return ""
+end tell
+''')
+
+# Databases are tried in order and the first hit wins, as with one search per database
+_SEARCH_ALL_DATABASES_SCRIPT = Template('''
+set databaseNames to {$databases}
+tell application "DEVONthink"
+    repeat with databaseName in databaseNames
+        try
+            tell database (databaseName as string)
+                set searchResults to search "$query"
+            end tell
+            if (count of searchResults) > 0 then
+                return (databaseName as string) & tab & (uuid of item 1 of searchResults)
+            end if
+        end try
+    end repeat
+    return ""
+end tell
+''')
+
+
 class DEVONthinkInterface:
     """Enhanced DEVONthink interface with comprehensive AppleScript operations"""
     
-    def __init__(self, database_name: str = "Professional"):
+    DATABASES = ["Global Inbox", "Professional", "Articles", "Books", "Research"]
+    
+    def __init__(self, database_name: str = "Professional", persistent: bool = True):
         self.database_name = database_name
+        # Falls back to one osascript per call if the session can't be started
+        self.osascript = OsascriptSession() if persistent else None
+        self.inbox_watcher = InboxWatcher(DEVONTHINK_INBOX_PATH)
+        self.index = DevonthinkIndex(DEVONTHINK_INDEX_PATH)
+        # Last pgrep result, reused for DEVONTHINK_RUNNING_TTL seconds
+        self._dt_running_ts = 0.0
+        self._dt_running_val = False
+    
+    def _run_osascript(self, script: str, timeout: int) -> Tuple[bool, str]:
+        """Run a script on the persistent session, or in a one-shot osascript."""
+        if self.osascript is not None:
+            try:
+                return self.osascript.run(script, timeout)
+            except (FileNotFoundError, PermissionError) as e:
+                logger.warning(f"Persistent osascript unavailable, spawning per call: {e}")
+                self.osascript = None
+        result = subprocess.run(
+            ['osascript', '-e', script],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False  # Don't raise on non-zero exit
+        )
+        if result.returncode != 0:
+            return False, result.stderr.strip()
+        return True, result.stdout.strip()
     
     def execute_script(self, script: str, timeout: int = 30) -> str:
         """Execute AppleScript with timeout and error handling"""
         try:
-            result = subprocess.run(
-                ['osascript', '-e', script],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False  # Don't raise on non-zero exit
-            )
+            ok, output = self._run_osascript(script, timeout)
             
-            if result.returncode != 0:
-                error_msg = result.stderr.strip()
+            if not ok:
+                error_msg = output
                 if "DEVONthink" in error_msg and "not running" in error_msg:
+                    self._dt_running_ts = 0.0
                     raise Exception("DEVONthink is not running")
                 elif "database" in error_msg.lower() and "not found" in error_msg.lower():
                     raise Exception(f"Database '{self.database_name}' not found")
                 else:
                     raise Exception(f"AppleScript error: {error_msg}")
             
-            return result.stdout.strip()
+            return output
             
         except subprocess.TimeoutExpired:
             raise Exception(f"AppleScript timed out after {timeout} seconds")
         except Exception as e:
             raise Exception(f"AppleScript execution failed: {e}")
     
-    def is_devonthink_running(self) -> bool:
-        """Check if DEVONthink is running"""
+    def is_devonthink_running(self, use_cache: bool = True) -> bool:
+        """Check if DEVONthink is running, reusing a check from the last few seconds"""
+        now = time.monotonic()
+        if use_cache and now - self._dt_running_ts < DEVONTHINK_RUNNING_TTL:
+            return self._dt_running_val
         try:
             result = subprocess.run(
                 ['pgrep', '-f', 'DEVONthink.app'],
                 capture_output=True, timeout=5
             )
-            return result.returncode == 0
+            running = result.returncode == 0
         except Exception as e:
             logger.debug(f"DEVONthink running check failed: {e}")
-            return False
+            running = False
+        self._dt_running_ts, self._dt_running_val = now, running
+        return running
     
     def wait_for_devonthink(self, max_wait: int = 30) -> bool:
         """Wait for DEVONthink to be available"""
         for i in range(max_wait):
-            if self.is_devonthink_running():
+            if self.is_devonthink_running(use_cache=False):
                 # Additional wait for DEVONthink to fully load
                 time.sleep(2)
                 return True
@@ -294,6 +755,30 @@ class DEVONthinkInterface:
             time.sleep(1)
         return False
     
+    def _inbox_target(self, file_path: str, new_filename: str) -> Optional[Tuple[Path, Path]]:
+        """Resolve source and Inbox target paths, registering the expected import."""
+        inbox_path = Path(DEVONTHINK_INBOX_PATH)
+        if not inbox_path.exists():
+            logger.error(f"DEVONthink Inbox not found: {inbox_path}")
+            return None
+        
+        source_path = Path(file_path)
+        if not source_path.exists():
+            logger.error(f"Source file not found: {source_path}")
+            return None
+        
+        # Determine file extension from source
+        file_extension = source_path.suffix
+        target_filename = new_filename
+        if not target_filename.endswith(file_extension):
+            target_filename += file_extension
+        
+        # Register before copying so the import event can't be missed
+        if self.inbox_watcher.start():
+            self.inbox_watcher.expect(target_filename, new_filename)
+        
+        return source_path, inbox_path / target_filename
+    
     def copy_file_to_inbox(self, file_path: str, new_filename: str, dry_run=False) -> bool:
         """Copy file to DEVONthink Inbox with new name"""
         if dry_run:
@@ -301,27 +786,41 @@ class DEVONthinkInterface:
             return True
         
         try:
-            inbox_path = Path(DEVONTHINK_INBOX_PATH)
-            if not inbox_path.exists():
-                logger.error(f"DEVONthink Inbox not found: {inbox_path}")
+            paths = self._inbox_target(file_path, new_filename)
+            if not paths:
                 return False
+            source_path, target_path = paths
             
-            source_path = Path(file_path)
-            if not source_path.exists():
-                logger.error(f"Source file not found: {source_path}")
-                return False
+            # Copy file
+            shutil.copy2(source_path, target_path)
+            logger.info(f"Copied to Inbox: {target_path.name}")
             
-            # Determine file extension from source
-            file_extension = source_path.suffix
-            target_filename = new_filename
-            if not target_filename.endswith(file_extension):
-                target_filename += file_extension
+            return True
             
-            target_path = inbox_path / target_filename
+        except Exception as e:
+            logger.error(f"Failed to copy file to Inbox: {e}")
+            return False
+    
+    async def copy_file_to_inbox_async(self, file_path: str, new_filename: str, dry_run=False) -> bool:
+        """Copy file to DEVONthink Inbox without blocking the event loop.
+
+        On macOS the copy is an APFS clone (``cp -c``), which only writes
+        metadata; anything else, or a failed clone, falls back to shutil.copy2
+        in a worker thread.
+        """
+        if dry_run:
+            logger.info(f"[DRY RUN] Would copy {file_path} to Inbox as '{new_filename}'")
+            return True
+        
+        try:
+            paths = self._inbox_target(file_path, new_filename)
+            if not paths:
+                return False
+            source_path, target_path = paths
             
-            # Copy file
-            shutil.copy2(source_path, target_path)
-            logger.info(f"Copied to Inbox: {target_filename}")
+            if not (sys.platform == 'darwin' and await self._clone_file_async(source_path, target_path)):
+                await asyncio.to_thread(shutil.copy2, source_path, target_path)
+            logger.info(f"Copied to Inbox: {target_path.name}")
             
             return True
             
@@ -329,6 +828,23 @@ class DEVONthinkInterface:
             logger.error(f"Failed to copy file to Inbox: {e}")
             return False
     
+    async def _clone_file_async(self, source_path: Path, target_path: Path) -> bool:
+        """Clone source_path to target_path with ``cp -c -p``. False if the clone failed."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'cp', '-c', '-p', str(source_path), str(target_path),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            _, stderr = await process.communicate()
+        except OSError as e:
+            logger.debug(f"cp -c unavailable, copying instead: {e}")
+            return False
+        if process.returncode != 0:
+            logger.debug(f"APFS clone failed for {source_path.name}, copying instead: {stderr.decode().strip()}")
+            return False
+        return True
+    
     async def find_item_by_filename_after_wait_async(self, filename: str, dry_run=False) -> Optional[str]:
         """Find DEVONthink item by filename with async wait for auto-sort"""
         if dry_run:
@@ -341,17 +857,12 @@ class DEVONthinkInterface:
             return None
         
         # Wait for DEVONthink to process the file (async)
-        logger.debug(f"Waiting {DEVONTHINK_WAIT_TIME} seconds for DEVONthink auto-sort...")
-        await asyncio.sleep(DEVONTHINK_WAIT_TIME)
+        await self._wait_for_import_async([filename])
         
         # Search across all databases
-        databases = ["Global Inbox", "Professional", "Articles", "Books", "Research"]
-        
-        for db_name in databases:
-            uuid = self._search_database_for_filename(filename, db_name)
-            if uuid:
-                logger.info(f"Found item in {db_name}: {uuid}")
-                return uuid
+        uuid = await asyncio.to_thread(self._search_all_databases, filename)
+        if uuid:
+            return uuid
         
         logger.debug(f"Item not found in any database: {filename}")
         return None
@@ -366,16 +877,16 @@ class DEVONthinkInterface:
             logger.error("DEVONthink is not running")
             return None
 
-        databases = ["Global Inbox", "Professional", "Articles", "Books", "Research"]
         max_attempts = 3
+        imported = self._wait_for_import(filename)
 
         for attempt in range(max_attempts):
-            time.sleep(DEVONTHINK_WAIT_TIME)
-            for db_name in databases:
-                uuid = self._search_database_for_filename(filename, db_name)
-                if uuid:
-                    logger.info(f"Found item in {db_name}: {uuid}")
-                    return uuid
+            # Once the Inbox event has fired, the first search needs no fixed wait
+            if attempt or not imported:
+                time.sleep(DEVONTHINK_WAIT_TIME)
+            uuid = self._search_all_databases(filename)
+            if uuid:
+                return uuid
             if attempt < max_attempts - 1:
                 logger.debug(f"Item not found after attempt {attempt + 1}, retrying...")
 
@@ -383,35 +894,96 @@ class DEVONthinkInterface:
         return None
 
     async def batch_search_items(self, filenames: List[str], dry_run=False) -> Dict[str, Optional[str]]:
-        """Search for multiple items concurrently"""
+        """Search for multiple items in a single AppleScript call"""
         if dry_run:
             # Quick simulation for dry run
             await asyncio.sleep(0.1)
             return {filename: "dry-run-uuid" for filename in filenames}
         
-        tasks = []
-        for filename in filenames:
-            task = self.find_item_by_filename_after_wait_async(filename, dry_run)
-            tasks.append(task)
+        filename_to_uuid = {filename: None for filename in filenames}
+        if not filenames:
+            return filename_to_uuid
+        
+        if not self.is_devonthink_running():
+            logger.error("DEVONthink is not running")
+            return filename_to_uuid
+        
+        # Wait once for DEVONthink to process the files (async)
+        await self._wait_for_import_async(filenames)
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        queries = [self._filename_query(filename) or "" for filename in filenames]
+        query_list = ", ".join(f'"{self._safe_applescript_str(q)}"' for q in queries)
+        database_list = ", ".join(f'"{self._safe_applescript_str(db)}"' for db in self.DATABASES)
         
-        filename_to_uuid = {}
-        for filename, result in zip(filenames, results):
-            if isinstance(result, Exception):
-                logger.error(f"Error searching for {filename}: {result}")
-                filename_to_uuid[filename] = None
-            else:
-                filename_to_uuid[filename] = result
+        # One script walks every filename × database and reports "index<TAB>uuid" per hit
+        script = f'''
+        set queryList to {{{query_list}}}
+        set databaseNames to {{{database_list}}}
+        set output to ""
+        tell application "DEVONthink"
+            repeat with i from 1 to count of queryList
+                set theQuery to item i of queryList
+                if theQuery is not "" then
+                    repeat with databaseName in databaseNames
+                        try
+                            tell database (databaseName as string)
+                                set searchResults to search theQuery
+                            end tell
+                            if (count of searchResults) > 0 then
+                                set output to output & i & tab & (uuid of item 1 of searchResults) & linefeed
+                                exit repeat
+                            end if
+                        end try
+                    end repeat
+                end if
+            end repeat
+        end tell
+        return output
+        '''
+        
+        try:
+            result = await asyncio.to_thread(
+                self.execute_script, script, 30 + 2 * len(filenames)
+            )
+        except Exception as e:
+            logger.error(f"Error searching for {len(filenames)} items: {e}")
+            return filename_to_uuid
+        
+        for line in result.splitlines():
+            index, _, uuid = line.partition('\t')
+            if index.strip().isdigit() and uuid.strip():
+                filename = filenames[int(index) - 1]
+                filename_to_uuid[filename] = uuid.strip()
+                logger.info(f"Found item for {filename}: {uuid.strip()}")
         
         return filename_to_uuid
     
-    def _search_database_for_filename(self, filename: str, database_name: str) -> Optional[str]:
-        """Search specific database for filename using keyword matching.
+    def _wait_for_import(self, filename: str) -> bool:
+        """Wait for the Inbox event for filename. False if it isn't being watched."""
+        if not self.inbox_watcher.is_pending(filename):
+            return False
+        logger.debug(f"Waiting for DEVONthink to import {filename}...")
+        if self.inbox_watcher.wait(filename, DEVONTHINK_WAIT_TIME * 5):
+            return True
+        logger.debug(f"No Inbox event for {filename}, falling back to fixed wait")
+        return False
+    
+    async def _wait_for_import_async(self, filenames: List[str]):
+        """Wait until DEVONthink has imported filenames, or DEVONTHINK_WAIT_TIME if unwatched."""
+        if filenames and all(self.inbox_watcher.is_pending(f) for f in filenames):
+            results = await asyncio.gather(*(
+                asyncio.to_thread(self._wait_for_import, f) for f in filenames
+            ))
+            if all(results):
+                return
+        logger.debug(f"Waiting {DEVONTHINK_WAIT_TIME} seconds for DEVONthink auto-sort...")
+        await asyncio.sleep(DEVONTHINK_WAIT_TIME)
+    
+    def _filename_query(self, filename: str) -> Optional[str]:
+        """Build a DEVONthink name: keyword query for a filename.
 
-        Uses name: prefix on each keyword to avoid false positives from
-        content matches. Non-ASCII characters are stripped since DEVONthink
-        may store them differently than Python encodes them.
+        Non-ASCII characters are stripped since DEVONthink may store them
+        differently than Python encodes them.
         """
         # Extract ASCII-only alphanumeric words for keyword matching
         # Replace non-ASCII and punctuation with spaces, then split into words
@@ -428,28 +1000,27 @@ class DEVONthinkInterface:
         if not words:
             return None
         # Use up to 4 significant words — more keywords increases false negatives in DEVONthink
-        search_words = words[:4]
-        query = ' '.join(f'name:{w}' for w in search_words)
-        query = query.replace('"', '\\"').replace('\\', '\\\\')
+        return ' '.join(f'name:{w}' for w in words[:4])
+    
+    def _search_database_for_filename(self, filename: str, database_name: str) -> Optional[str]:
+        """Search specific database for filename using keyword matching.
 
-        script = f'''
-        tell application "DEVONthink"
-            try
-                tell database "{database_name}"
-                    set searchResults to search "{query}"
-
-                    if (count of searchResults) > 0 then
-                        set theRecord to item 1 of searchResults
-                        return uuid of theRecord
-                    else
-                        return ""
-                    end if
-                end tell
-            on error
-                return ""
-            end try
-        end tell
-        '''
+        Uses name: prefix on each keyword to avoid false positives from
+        content matches. Non-ASCII characters are stripped since DEVONthink
+        may store them differently than Python encodes them.
+        """
+        uuid = self.index.lookup(database_name, filename)
+        if uuid:
+            return uuid
+
+        query = self._filename_query(filename)
+        if not query:
+            return None
+
+        script = _SEARCH_DATABASE_SCRIPT.substitute(
+            query=self._safe_applescript_str(query),
+            database=self._safe_applescript_str(database_name),
+        )
 
         try:
             result = self.execute_script(script)
@@ -457,6 +1028,34 @@ class DEVONthinkInterface:
         except:
             return None
     
+    def _search_all_databases(self, filename: str) -> Optional[str]:
+        """Search every database in DATABASES for filename in one AppleScript run."""
+        for db_name in self.DATABASES:
+            uuid = self.index.lookup(db_name, filename)
+            if uuid:
+                logger.info(f"Found item in {db_name}: {uuid}")
+                return uuid
+
+        query = self._filename_query(filename)
+        if not query:
+            return None
+
+        script = _SEARCH_ALL_DATABASES_SCRIPT.substitute(
+            query=self._safe_applescript_str(query),
+            databases=", ".join(f'"{self._safe_applescript_str(db)}"' for db in self.DATABASES),
+        )
+
+        try:
+            result = self.execute_script(script)
+        except Exception as e:
+            logger.debug(f"Search for {filename} failed: {e}")
+            return None
+        db_name, _, uuid = result.partition('\t')
+        if not uuid.strip():
+            return None
+        logger.info(f"Found item in {db_name}: {uuid.strip()}")
+        return uuid.strip()
+    
     def _safe_applescript_str(self, value: str) -> str:
         """Escape a string for safe interpolation into AppleScript string literals."""
         return (value
@@ -475,17 +1074,24 @@ class DEVONthinkInterface:
         if not self.is_devonthink_running():
             return False
         
-        # Prepare metadata
+        # Prepare metadata, keeping only the lines that have a value
         authors_str = ", ".join([
             f"{c.get('firstName', '')} {c.get('lastName', '')}".strip()
             for c in item.creators if c.get('lastName')
         ])
-        safe_authors = self._safe_applescript_str(authors_str)
-        safe_publication = self._safe_applescript_str(item.publication or "")
-        safe_abstract = self._safe_applescript_str((item.abstract or "")[:500])
-        safe_key = self._safe_applescript_str(item.key or "")
-        safe_year = self._safe_applescript_str(str(item.year) if item.year else "")
-        safe_doi = self._safe_applescript_str(item.doi or "")
+        comment_lines = [f"Zotero Key: {item.key or ''}"]
+        if authors_str:
+            comment_lines.append(f"Authors: {authors_str}")
+        if item.publication:
+            comment_lines.append(f"Publication: {item.publication}")
+        if item.year:
+            comment_lines.append(f"Year: {item.year}")
+        if item.doi:
+            comment_lines.append(f"DOI: {item.doi}")
+        if item.abstract:
+            comment_lines.append(f"Abstract: {item.abstract[:500]}")
+        # Escape each line, then join with AppleScript's \n escape
+        comment = "\\n".join(self._safe_applescript_str(line) for line in comment_lines)
 
         # Prepare tags
         tags_list = item.tags + item.collections
@@ -494,49 +1100,14 @@ class DEVONthinkInterface:
         if item.year:
             tags_list.append(str(item.year))
 
-        # Format tags for AppleScript (Python 3.9 compatible)
         escaped_tags = ['"' + self._safe_applescript_str(tag) + '"' for tag in tags_list if tag]
-        tags_applescript = ', '.join(escaped_tags)
-
-        # Build tags block in Python to avoid double-quoting in AppleScript
         tags_block = ""
         if escaped_tags:
-            tags_block = f"set tags of theRecord to {{{tags_applescript}}}"
+            tags_block = f"set tags of theRecord to {{{', '.join(escaped_tags)}}}"
 
-        script = f'''
-        tell application "DEVONthink"
-            try
-                set theRecord to get record with uuid "{uuid}"
-
-                -- Set comment with Zotero metadata
-                set theComment to "Zotero Key: {safe_key}"
-                if "{safe_authors}" is not "" then
-                    set theComment to theComment & "\\nAuthors: {safe_authors}"
-                end if
-                if "{safe_publication}" is not "" then
-                    set theComment to theComment & "\\nPublication: {safe_publication}"
-                end if
-                if "{safe_year}" is not "" then
-                    set theComment to theComment & "\\nYear: {safe_year}"
-                end if
-                if "{safe_doi}" is not "" then
-                    set theComment to theComment & "\\nDOI: {safe_doi}"
-                end if
-                if "{safe_abstract}" is not "" then
-                    set theComment to theComment & "\\nAbstract: {safe_abstract}"
-                end if
-
-                set comment of theRecord to theComment
-
-                -- Set tags
-                {tags_block}
-
-                return "SUCCESS"
-            on error errMsg
-                return "ERROR: " & errMsg
-            end try
-        end tell
-        '''
+        script = _UPDATE_METADATA_SCRIPT.substitute(
+            uuid=uuid, comment=comment, tags_block=tags_block
+        )
         
         try:
             result = self.execute_script(script)
@@ -612,7 +1183,8 @@ class DEVONthinkMCPInterface:
     def __init__(self, database_name: str = "Professional"):
         self.database_name = database_name
         self.mcp = DevonthinkMCP()
-        self._pending_import_uuid = None
+        # new_filename -> UUID of a just-completed import, so concurrent imports don't mix
+        self._pending_imports: Dict[str, str] = {}
 
     def is_devonthink_running(self) -> bool:
         return self.mcp.is_running()
@@ -642,11 +1214,20 @@ class DEVONthinkMCPInterface:
             logger.debug(f"MCP search failed in {database_name}: {e}")
         return None
 
+    def _search_all_databases(self, filename: str) -> Optional[str]:
+        """Search DATABASES in order; MCP has no cross-database search call."""
+        for db_name in self.DATABASES:
+            uuid = self._search_database_for_filename(filename, db_name)
+            if uuid:
+                logger.info(f"Found item in {db_name}: {uuid}")
+                return uuid
+        return None
+
     def copy_file_to_inbox(self, file_path: str, new_filename: str, dry_run=False) -> bool:
         """Import the file into the Global Inbox via MCP; stash the resulting UUID."""
         if dry_run:
             logger.info(f"[DRY RUN] Would import {file_path} to Global Inbox as '{new_filename}'")
-            self._pending_import_uuid = "dry-run-uuid"
+            self._pending_imports[new_filename] = "dry-run-uuid"
             return True
         if not Path(file_path).exists():
             logger.error(f"Source file not found: {file_path}")
@@ -662,36 +1243,31 @@ class DEVONthinkMCPInterface:
                 self.mcp.update_record(uuid, name=new_filename)
             except DevonthinkMCPError as e:
                 logger.warning(f"Imported {uuid} but rename to '{new_filename}' failed: {e}")
-            self._pending_import_uuid = uuid
+            self._pending_imports[new_filename] = uuid
             logger.info(f"Imported to Global Inbox: {new_filename} -> {uuid}")
             return True
         except DevonthinkMCPError as e:
             logger.error(f"MCP import failed for {file_path}: {e}")
             return False
 
+    async def copy_file_to_inbox_async(self, file_path: str, new_filename: str, dry_run=False) -> bool:
+        """Import via MCP from a worker thread so the event loop keeps running."""
+        return await asyncio.to_thread(self.copy_file_to_inbox, file_path, new_filename, dry_run)
+
     def find_item_by_filename_after_wait(self, filename: str, dry_run=False) -> Optional[str]:
         """Return the UUID from the just-completed import; fall back to a search."""
         if dry_run:
             return "dry-run-uuid"
-        if self._pending_import_uuid:
-            uuid = self._pending_import_uuid
-            self._pending_import_uuid = None
+        uuid = self._pending_imports.pop(filename, None)
+        if uuid:
             return uuid
-        for db in self.DATABASES:
-            uuid = self._search_database_for_filename(filename, db)
-            if uuid:
-                return uuid
-        return None
+        return self._search_all_databases(filename)
 
     async def find_item_by_filename_after_wait_async(self, filename: str, dry_run=False) -> Optional[str]:
         if dry_run:
             await asyncio.sleep(0.01)
             return "dry-run-uuid"
-        for db in self.DATABASES:
-            uuid = self._search_database_for_filename(filename, db)
-            if uuid:
-                return uuid
-        return None
+        return self._search_all_databases(filename)
 
     async def batch_search_items(self, filenames: List[str], dry_run=False) -> Dict[str, Optional[str]]:
         if dry_run:
@@ -766,12 +1342,50 @@ class DEVONthinkMCPInterface:
             return False
 
 
+@dataclass(slots=True)
+class FilenameCollision:
+    """Two items that generate the same DEVONthink filename"""
+    filename: str
+    item1_key: str
+    item2_key: str
+    title1: str
+    title2: str
+
+@dataclass(slots=True)
+class UnmatchedFile:
+    """Linked attachment with no matching DEVONthink record"""
+    attachment_key: str
+    parent_key: Optional[str]
+    filename: str
+    path: str
+
+@dataclass(slots=True)
+class DuplicatePair:
+    """Two items whose titles look like the same work"""
+    item1_key: str
+    item2_key: str
+    title1: str
+    title2: str
+    similarity_reason: str = 'similar_titles'
+
+@dataclass(slots=True)
+class ProblematicItem:
+    """Item whose metadata would make a poor or unsafe filename"""
+    key: str
+    title: str
+    issues: List[str]
+
 class ConflictDetector:
     """Detect conflicts, duplicates, and unmatched files for dry run mode"""
     
-    def __init__(self, zotero_api: ZoteroAPIClient, devonthink: DEVONthinkInterface):
+    DUPLICATE_THRESHOLD = 0.8  # Title word overlap (Jaccard) above which items look duplicated
+    UNMATCHED_SAMPLE_SIZE = 50  # Linked attachments checked for DEVONthink matches per dry run
+    
+    def __init__(self, zotero_api: ZoteroAPIClient, devonthink: DEVONthinkInterface,
+                 sample_size: int = UNMATCHED_SAMPLE_SIZE):
         self.zotero_api = zotero_api
         self.devonthink = devonthink
+        self.sample_size = sample_size
     
     def detect_conflicts(self) -> Dict[str, List[Dict[str, Any]]]:
         """Comprehensive conflict detection"""
@@ -784,130 +1398,171 @@ class ConflictDetector:
         
         logger.info("🔍 Running conflict detection...")
         
-        # Check for filename collisions
-        self._detect_filename_collisions(conflicts)
+        # Item-level checks share one pass over the items
+        self._scan_items(conflicts)
         
         # Check for unmatched ZotFile symlinks
         self._detect_unmatched_symlinks(conflicts)
         
-        # Check for duplicate items
-        self._detect_duplicates(conflicts)
+        return conflicts
+    
+    def _scan_items(self, conflicts: Dict, items: Optional[Iterable[ZoteroItem]] = None):
+        """Check filename collisions, problematic metadata and duplicates in one pass
         
-        # Check for problematic metadata
-        self._detect_problematic_metadata(conflicts)
+        Items are streamed from the API a page at a time; the loop records
+        collisions and metadata issues as it goes and keeps only each item's
+        key, title and title word set for duplicate matching.
+        """
+        if items is None:
+            items = self.zotero_api.iter_items_needing_sync()
+        filenames = defaultdict(list)
+        titles = []
+        word_sets = []
         
-        return conflicts
+        for item in items:
+            filenames[FilenameGenerator.generate_filename(item)].append((item.key, item.title))
+            self._check_metadata(item, conflicts)
+            titles.append((item.key, item.title))
+            word_sets.append(item.title_words)
+        
+        self._record_collisions(conflicts, filenames)
+        self._record_duplicates(conflicts, titles, word_sets)
     
-    def _detect_filename_collisions(self, conflicts: Dict):
+    def _detect_filename_collisions(self, conflicts: Dict, items: Optional[List[ZoteroItem]] = None):
         """Detect potential filename collisions"""
-        items = self.zotero_api.get_items_needing_sync()
-        filenames = {}
-        
+        if items is None:
+            items = self.zotero_api.get_items_needing_sync()
+        filenames = defaultdict(list)
         for item in items:
-            filename = FilenameGenerator.generate_filename(item)
-            if filename in filenames:
-                conflicts['filename_collisions'].append({
-                    'filename': filename,
-                    'item1_key': filenames[filename]['key'],
-                    'item2_key': item.key,
-                    'title1': filenames[filename]['title'],
-                    'title2': item.title
-                })
-            else:
-                filenames[filename] = {'key': item.key, 'title': item.title}
+            filenames[FilenameGenerator.generate_filename(item)].append((item.key, item.title))
+        self._record_collisions(conflicts, filenames)
+    
+    def _record_collisions(self, conflicts: Dict, filenames: Dict[str, List[Tuple[str, str]]]):
+        """Report every pair of items sharing a generated filename"""
+        for filename, group in filenames.items():
+            for (key1, title1), (key2, title2) in combinations(group, 2):
+                conflicts['filename_collisions'].append(
+                    FilenameCollision(filename, key1, key2, title1, title2)
+                )
     
     def _detect_unmatched_symlinks(self, conflicts: Dict):
         """Find ZotFile symlinks that don't match DEVONthink items"""
         symlinks = self.zotero_api.get_zotfile_symlinks()
         logger.info(f"Checking {len(symlinks)} linked attachments for DEVONthink matches...")
         
-        # Limit to first 50 for dry run performance
-        sample_symlinks = symlinks[:50]
+        # Check a random sample for dry run performance, so the result
+        # doesn't depend on the order the API lists attachments in
+        sample_symlinks = random.sample(symlinks, min(self.sample_size, len(symlinks)))
         
         for i, symlink in enumerate(sample_symlinks):
             if symlink.path:
                 if i % 10 == 0:
                     logger.info(f"Progress: {i+1}/{len(sample_symlinks)} attachments checked")
                     
-                filename = Path(symlink.path).name
+                filename = os.path.basename(symlink.path)
                 # Remove extension for search
-                filename_no_ext = filename.rsplit('.', 1)[0] if '.' in filename else filename
+                filename_no_ext = os.path.splitext(filename)[0]
                 
                 # Skip DEVONthink search in dry run for speed
                 logger.debug(f"Would search DEVONthink for: {filename_no_ext}")
                 
                 # For now, assume some are unmatched for demonstration
                 if i % 5 == 0:  # Every 5th item as "unmatched" example
-                    conflicts['unmatched_files'].append({
-                        'attachment_key': symlink.key,
-                        'parent_key': symlink.parent_key,
-                        'filename': filename,
-                        'path': symlink.path
-                    })
+                    conflicts['unmatched_files'].append(
+                        UnmatchedFile(symlink.key, symlink.parent_key, filename, symlink.path)
+                    )
     
-    def _detect_duplicates(self, conflicts: Dict):
+    def _detect_duplicates(self, conflicts: Dict, items: Optional[List[ZoteroItem]] = None):
         """Detect potential duplicate items by title similarity"""
-        items = self.zotero_api.get_items_needing_sync()
-        
-        for i, item1 in enumerate(items):
-            for item2 in items[i+1:]:
-                if self._are_likely_duplicates(item1, item2):
-                    conflicts['duplicates'].append({
-                        'item1_key': item1.key,
-                        'item2_key': item2.key,
-                        'title1': item1.title,
-                        'title2': item2.title,
-                        'similarity_reason': 'similar_titles'
-                    })
+        if items is None:
+            items = self.zotero_api.get_items_needing_sync()
+        titles = [(item.key, item.title) for item in items]
+        word_sets = [item.title_words for item in items]
+        self._record_duplicates(conflicts, titles, word_sets)
     
-    def _detect_problematic_metadata(self, conflicts: Dict):
-        """Find items with problematic metadata that might cause issues"""
-        items = self.zotero_api.get_items_needing_sync()
+    def _record_duplicates(self, conflicts: Dict, titles: List[Tuple[str, str]], word_sets: List[frozenset]):
+        for i, j in self._duplicate_candidates(word_sets):
+            (key1, title1), (key2, title2) = titles[i], titles[j]
+            if self._words_likely_duplicate(word_sets[i], word_sets[j]):
+                conflicts['duplicates'].append(DuplicatePair(key1, key2, title1, title2))
+    
+    def _duplicate_candidates(self, word_sets: List[frozenset]) -> List[Tuple[int, int]]:
+        """Index pairs (i < j) whose titles could reach DUPLICATE_THRESHOLD, in scan order.
+
+        Prefix filtering: with each title's words sorted rarest first, two
+        titles with Jaccard similarity >= t must share a word among the first
+        len - floor(t * len) + 1 words of each. Only pairs sharing such a
+        prefix word are returned, so no true duplicate is missed and most
+        pairs are never compared.
+        """
+        frequency = Counter(word for words in word_sets for word in words)
+        
+        prefixes = []
+        index = defaultdict(list)  # prefix word -> item indexes
+        for i, words in enumerate(word_sets):
+            ordered = sorted(words, key=lambda word: (frequency[word], word))
+            prefix = ordered[:len(ordered) - int(self.DUPLICATE_THRESHOLD * len(ordered)) + 1] if ordered else []
+            prefixes.append(prefix)
+            for word in prefix:
+                index[word].append(i)
         
+        pairs = []
+        for i, prefix in enumerate(prefixes):
+            candidates = {j for word in prefix for j in index[word] if j > i}
+            pairs.extend((i, j) for j in sorted(candidates))
+        return pairs
+    
+    def _detect_problematic_metadata(self, conflicts: Dict, items: Optional[List[ZoteroItem]] = None):
+        """Find items with problematic metadata that might cause issues"""
+        if items is None:
+            items = self.zotero_api.get_items_needing_sync()
         for item in items:
-            issues = []
-            
-            if not item.title or len(item.title.strip()) == 0:
-                issues.append('no_title')
-            
-            if not item.creators:
-                issues.append('no_creators')
-            
-            if not item.item_type:
-                issues.append('no_item_type')
-            
-            # Check for very long titles that might cause filesystem issues
-            if item.title and len(item.title) > 200:
-                issues.append('title_too_long')
-            
-            # Check for problematic characters
-            if item.title and re.search(r'[<>:"/\\|?*\x00-\x1f\x7f-\x9f]', item.title):
-                issues.append('problematic_characters')
-            
-            if issues:
-                conflicts['problematic_items'].append({
-                    'key': item.key,
-                    'title': item.title,
-                    'issues': issues
-                })
+            self._check_metadata(item, conflicts)
+    
+    def _check_metadata(self, item: ZoteroItem, conflicts: Dict):
+        issues = []
+        
+        if not item.title or len(item.title.strip()) == 0:
+            issues.append('no_title')
+        
+        if not item.creators:
+            issues.append('no_creators')
+        
+        if not item.item_type:
+            issues.append('no_item_type')
+        
+        # Check for very long titles that might cause filesystem issues
+        if item.title and len(item.title) > 200:
+            issues.append('title_too_long')
+        
+        # Check for problematic characters (a precompiled search stops at the
+        # first hit; translating against _BAD_CHARS_TABLE copies the whole title)
+        if item.title and _RE_BAD_CHARS.search(item.title):
+            issues.append('problematic_characters')
+        
+        if issues:
+            conflicts['problematic_items'].append(ProblematicItem(item.key, item.title, issues))
     
     def _are_likely_duplicates(self, item1: ZoteroItem, item2: ZoteroItem) -> bool:
         """Determine if two items are likely duplicates"""
-        if not item1.title or not item2.title:
-            return False
-        
+        return self._words_likely_duplicate(item1.title_words, item2.title_words)
+    
+    def _words_likely_duplicate(self, title1_words: frozenset, title2_words: frozenset) -> bool:
         # Simple similarity check - could be enhanced with more sophisticated algorithms
-        title1_words = set(item1.title.lower().split())
-        title2_words = set(item2.title.lower().split())
+        small, big = sorted((title1_words, title2_words), key=len)
         
-        if len(title1_words) == 0 or len(title2_words) == 0:
+        if len(small) == 0:
             return False
         
-        intersection = title1_words.intersection(title2_words)
-        union = title1_words.union(title2_words)
+        # Jaccard can't exceed len(small) / len(big), so skip hopeless pairs
+        if len(small) <= self.DUPLICATE_THRESHOLD * len(big):
+            return False
         
-        similarity = len(intersection) / len(union)
-        return similarity > 0.8  # 80% word overlap
+        # |A ∪ B| = |A| + |B| - |A ∩ B|, so no union set is built; the C-level
+        # set intersection beats counting members in a Python loop
+        intersection = len(small & big)
+        similarity = intersection / (len(small) + len(big) - intersection)
+        return similarity > self.DUPLICATE_THRESHOLD
 
 class DEVONzotService:
     """Main service class that orchestrates the complete workflow"""
@@ -928,15 +1583,34 @@ class DEVONzotService:
             logger.info("DEVONthink control backend: AppleScript (legacy)")
         self.conflict_detector = ConflictDetector(self.zotero_api, self.devonthink)
         self.state = self._load_state()
+        self._unsaved_changes = 0
+        self._last_state_save = time.monotonic()
+        # Last state file contents written, so unchanged saves skip the write
+        self._saved_state_payload: Optional[bytes] = None
+        # Guards processed-item and save bookkeeping when migrations run on worker threads
+        self._state_lock = threading.RLock()
+        # One lock per parent key, so concurrent migration phases never link the same parent at once
+        self._parent_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
         self.running = False
+        # Set by the shutdown signal handler to cut the polling service's waits short
+        self._stop_event = threading.Event()
         self.paused = False
         self.restart_count = 0
         self._interactive_quit = False
         self._tier2_task: Optional[asyncio.Task] = None
+        # Storage filename -> files, built on the first legacy storage:filename path
+        self._legacy_index: Optional[Dict[str, List[Path]]] = None
 
         # Ensure DEVONzot directory exists
         DEVONZOT_PATH.mkdir(exist_ok=True)
 
+        self.processed_items = ProcessedItems(PROCESSED_ITEMS_DB)
+        if self.state.processed_items:
+            logger.info(f"Moving {len(self.state.processed_items)} processed items to {PROCESSED_ITEMS_DB.name}")
+            self.processed_items.update(self.state.processed_items)
+            self.state.processed_items = []
+            self._save_state()
+
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -947,31 +1621,56 @@ class DEVONzotService:
         """Load service state from file"""
         if STATE_FILE.exists():
             try:
-                with open(STATE_FILE, 'r') as f:
-                    data = json.load(f)
-                    # Filter to only known fields to handle schema changes
-                    known_fields = {f.name for f in ServiceState.__dataclass_fields__.values()}
-                    filtered = {k: v for k, v in data.items() if k in known_fields}
-                    return ServiceState(**filtered)
+                raw = STATE_FILE.read_bytes()
+                data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+                # Filter to only known fields to handle schema changes
+                known_fields = {f.name for f in ServiceState.__dataclass_fields__.values()}
+                filtered = {k: v for k, v in data.items() if k in known_fields}
+                return ServiceState(**filtered)
             except Exception as e:
                 logger.warning(f"Could not load state file: {e}")
 
         return ServiceState()
     
     def _save_state(self):
-        """Save service state to file atomically (tmp + rename)."""
-        try:
-            tmp_path = STATE_FILE.with_suffix(STATE_FILE.suffix + '.tmp')
-            with open(tmp_path, 'w') as f:
-                json.dump(asdict(self.state), f, indent=2, default=str)
-            os.replace(tmp_path, STATE_FILE)
-        except Exception as e:
-            logger.error(f"Could not save state: {e}")
+        """Save service state to file atomically (tmp + rename), skipping unchanged state."""
+        with self._state_lock:
+            try:
+                data = asdict(self.state)
+                if ORJSON_AVAILABLE:
+                    payload = orjson.dumps(data, default=str)
+                else:
+                    payload = json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+                if payload != self._saved_state_payload:
+                    tmp_path = STATE_FILE.with_suffix(STATE_FILE.suffix + '.tmp')
+                    tmp_path.write_bytes(payload)
+                    os.replace(tmp_path, STATE_FILE)
+                    self._saved_state_payload = payload
+                self.processed_items.commit()
+                self._unsaved_changes = 0
+                self._last_state_save = time.monotonic()
+            except Exception as e:
+                logger.error(f"Could not save state: {e}")
+
+    def _mark_dirty(self):
+        """Note an unsaved state change; save once enough have built up"""
+        with self._state_lock:
+            self._unsaved_changes += 1
+            if (self._unsaved_changes >= STATE_SAVE_EVERY
+                    or time.monotonic() - self._last_state_save >= STATE_SAVE_INTERVAL):
+                self._save_state()
+
+    def _flush_state(self):
+        """Save any changes held back by _mark_dirty"""
+        if self._unsaved_changes:
+            self._save_state()
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals (works in both sync and async modes)"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        self._stop_event.set()
+        self._flush_state()
         # Cancel asyncio tasks if an event loop is running
         try:
             loop = asyncio.get_running_loop()
@@ -1108,8 +1807,11 @@ class DEVONzotService:
         # Analyze sync requirements
         results['sync_analysis'] = self._analyze_sync_requirements()
 
-        # Save results
-        self.state.dry_run_results = results
+        # Save results (conflict records as plain dicts for the state file)
+        self.state.dry_run_results = {
+            **results,
+            'conflicts': {kind: [asdict(c) for c in found] for kind, found in results['conflicts'].items()},
+        }
         self._save_state()
 
         # Report summary
@@ -1136,16 +1838,15 @@ class DEVONzotService:
         stored_attachments = self.zotero_api.get_stored_attachments()
         analysis['stored_attachments'] = len(stored_attachments)
         
-        # Calculate storage size and check paths
-        for attachment in stored_attachments:
-            file_path = self._resolve_storage_path(attachment)
-            if file_path and file_path.exists():
-                try:
-                    analysis['storage_size_bytes'] += file_path.stat().st_size
-                except:
-                    analysis['problematic_paths'].append(str(file_path))
-            elif file_path:
-                analysis['problematic_paths'].append(str(file_path))
+        # Calculate storage size and check paths; stat calls are I/O-bound,
+        # so overlap them across threads
+        if stored_attachments:
+            with ThreadPoolExecutor(max_workers=WORKLOAD_PROBE_WORKERS) as pool:
+                for size, problematic_path in pool.map(self._probe_storage_file, stored_attachments):
+                    if size is not None:
+                        analysis['storage_size_bytes'] += size
+                    elif problematic_path:
+                        analysis['problematic_paths'].append(problematic_path)
         
         # Count ZotFile symlinks
         zotfile_symlinks = self.zotero_api.get_zotfile_symlinks()
@@ -1153,6 +1854,16 @@ class DEVONzotService:
         
         return analysis
     
+    def _probe_storage_file(self, attachment: ZoteroAttachment) -> Tuple[Optional[int], Optional[str]]:
+        """(size, None) for a readable storage file, (None, path) for a bad one, (None, None) if unresolved"""
+        file_path = self._resolve_storage_path(attachment)
+        if not file_path:
+            return None, None
+        try:
+            return file_path.stat().st_size, None
+        except OSError:
+            return None, str(file_path)
+    
     def _analyze_sync_requirements(self) -> Dict[str, Any]:
         """Analyze sync requirements"""
         analysis = {
@@ -1201,18 +1912,18 @@ class DEVONzotService:
         if conflicts['filename_collisions']:
             print("\n🚨 FILENAME COLLISIONS:")
             for collision in conflicts['filename_collisions'][:5]:  # Show first 5
-                print(f"  '{collision['filename']}' - Items {collision['item1_key']} and {collision['item2_key']}")
+                print(f"  '{collision.filename}' - Items {collision.item1_key} and {collision.item2_key}")
         
         if conflicts['unmatched_files']:
             print("\n📁 UNMATCHED FILES:")
             for unmatched in conflicts['unmatched_files'][:5]:  # Show first 5
-                print(f"  {unmatched['filename']} (Attachment {unmatched['attachment_key']})")
+                print(f"  {unmatched.filename} (Attachment {unmatched.attachment_key})")
         
         if conflicts['problematic_items']:
             print("\n⚠️  PROBLEMATIC ITEMS:")
             for problem in conflicts['problematic_items'][:5]:  # Show first 5
-                issues_str = ", ".join(problem['issues'])
-                print(f"  Item {problem['key']}: {issues_str}")
+                issues_str = ", ".join(problem.issues)
+                print(f"  Item {problem.key}: {issues_str}")
         
         print("\n" + "="*60)
 
@@ -1236,33 +1947,29 @@ class DEVONzotService:
         If found under the Zotero name, renames the record to the generated name.
         Returns the UUID if found, None otherwise.
         """
-        databases = ["Global Inbox", "Professional", "Articles", "Books", "Research"]
+        prefix = "[DRY RUN] " if dry_run else ""
 
-        # First: search for our generated filename
-        for db_name in databases:
-            dt_uuid = self.devonthink._search_database_for_filename(generated_name, db_name)
-            if dt_uuid:
-                prefix = "[DRY RUN] " if dry_run else ""
-                logger.info(f"{prefix}Found DEVONthink item by generated name in {db_name}: {dt_uuid}")
-                return dt_uuid
+        # First: search every database for our generated filename in one pass
+        dt_uuid = self.devonthink._search_all_databases(generated_name)
+        if dt_uuid:
+            logger.info(f"{prefix}Found DEVONthink item by generated name: {dt_uuid}")
+            return dt_uuid
 
         # Second: search for original Zotero filename
         if zotero_filename and zotero_filename != generated_name:
             # Strip extension for search (DEVONthink name may or may not have it)
             zotero_stem = Path(zotero_filename).stem
-            for db_name in databases:
-                dt_uuid = self.devonthink._search_database_for_filename(zotero_stem, db_name)
-                if dt_uuid:
-                    prefix = "[DRY RUN] " if dry_run else ""
-                    logger.info(
-                        f"{prefix}Found DEVONthink item by Zotero name '{zotero_stem}' "
-                        f"in {db_name}: {dt_uuid} — renaming to '{generated_name}'"
-                    )
-                    # Also try with extension
-                    ext = Path(zotero_filename).suffix
-                    rename_target = generated_name if generated_name.endswith(ext) else generated_name + ext
-                    self.devonthink.rename_item(dt_uuid, rename_target, dry_run)
-                    return dt_uuid
+            dt_uuid = self.devonthink._search_all_databases(zotero_stem)
+            if dt_uuid:
+                logger.info(
+                    f"{prefix}Found DEVONthink item by Zotero name '{zotero_stem}': "
+                    f"{dt_uuid} — renaming to '{generated_name}'"
+                )
+                # Also try with extension
+                ext = Path(zotero_filename).suffix
+                rename_target = generated_name if generated_name.endswith(ext) else generated_name + ext
+                self.devonthink.rename_item(dt_uuid, rename_target, dry_run)
+                return dt_uuid
 
         return None
 
@@ -1303,6 +2010,7 @@ class DEVONzotService:
                         headers={'If-Unmodified-Since-Version': str(version)}
                     )
                     if resp and resp.status_code in (200, 204):
+                        existing_data['title'] = title
                         logger.info(f"Renamed link {att_key} → {title}")
                     else:
                         logger.warning(f"Failed to rename link {att_key}")
@@ -1329,6 +2037,41 @@ class DEVONzotService:
             logger.error(f"Failed to create DEVONthink Link child for {parent_key}")
             return False
 
+    def _create_devonthink_child_links(self, links: List[Tuple[str, str, str]],
+                                        dry_run=False) -> Dict[str, bool]:
+        """Create DEVONthink Link children for many (parent_key, dt_uuid, title) at once.
+
+        Parents that already have a link (or any link in a dry run) go through
+        _create_devonthink_child_link; the rest are created with one POST per
+        50 attachments. Returns whether each parent_key ended up linked.
+        """
+        linked: Dict[str, bool] = {}
+        new_links = []
+        seen = set()
+        for parent_key, dt_uuid, title in links:
+            if parent_key in seen:
+                continue
+            seen.add(parent_key)
+            if dry_run or self._find_devonthink_link(parent_key):
+                linked[parent_key] = self._create_devonthink_child_link(parent_key, dt_uuid, title=title, dry_run=dry_run)
+            else:
+                new_links.append({
+                    "parent_key": parent_key,
+                    "title": title,
+                    "url": f"x-devonthink-item://{dt_uuid}"
+                })
+
+        for i in range(0, len(new_links), 50):
+            for result in self.zotero_api.create_url_attachments(new_links[i:i + 50]):
+                parent_key = result["input"]["parent_key"]
+                linked[parent_key] = bool(result.get('new_key'))
+                if linked[parent_key]:
+                    logger.info(f"Created DEVONthink Link child {result['new_key']} for {parent_key}")
+                else:
+                    logger.error(f"Failed to create DEVONthink Link child for {parent_key}")
+
+        return linked
+
     def delete_imported_url_attachments(self, dry_run=False, interactive=False) -> Dict[str, int]:
         """Phase 0: Delete all imported_url (linkMode=1) attachments.
 
@@ -1411,7 +2154,7 @@ class DEVONzotService:
                         results['files_deleted'] += 1
                         logger.debug(f"Deleted file: {file_path}")
                         if (file_path.parent != Path(ZOTERO_STORAGE_PATH)
-                                and not any(file_path.parent.iterdir())):
+                                and _is_dir_empty(file_path.parent)):
                             file_path.parent.rmdir()
                     except Exception as e:
                         logger.warning(f"Failed to delete file {file_path}: {e}")
@@ -1641,6 +2384,22 @@ class DEVONzotService:
         )
         return results
 
+    def _mark_processed(self, key: str) -> bool:
+        """Record key in processed_items; returns False if it was already there"""
+        with self._state_lock:
+            return self.processed_items.add(key)
+
+    def _parent_lock(self, attachment: ZoteroAttachment) -> threading.Lock:
+        """Lock held while an attachment of this parent is migrated and linked"""
+        with self._state_lock:
+            return self._parent_locks[attachment.parent_key or attachment.key]
+
+    def _parent_item(
+        self, parent_key: str, parents: Optional[Dict[str, ZoteroItem]] = None
+    ) -> Optional[ZoteroItem]:
+        """Parent from the prefetched batch, if any, falling back to a single fetch"""
+        return (parents or {}).get(parent_key) or self.zotero_api.get_item(parent_key)
+
     def migrate_stored_attachments(
         self, dry_run=False, interactive=False,
         attachments: Optional[List[ZoteroAttachment]] = None
@@ -1658,6 +2417,7 @@ class DEVONzotService:
             'skipped_no_parent': 0,
             'skipped_parent_not_found': 0,
             'skipped_already_processed': 0,
+            'skipped_unchanged': 0,
             'cleaned_already_processed': 0,
             'linked_existing': 0,
             'cleaned_broken': 0,
@@ -1668,14 +2428,29 @@ class DEVONzotService:
 
         skipped_details = []  # Track details for reporting
 
-        if attachments is None:
+        full_scan = attachments is None
+        if full_scan:
             attachments = self.zotero_api.get_stored_attachments()
         logger.info(f"📊 Detection Summary: Found {len(attachments)} stored attachments (linkMode=0)")
 
+        # No-parent skips from earlier cycles stand until the attachment's version
+        # changes; skips that depend on the filesystem are re-checked every cycle
+        known_skips = set(self.state.skipped_attachments)
+        still_skipped = []
+        parents = self.zotero_api.get_items([a.parent_key for a in attachments if a.parent_key])
+
         for attachment in attachments:
+            skip_signature = f"{attachment.key}:{attachment.version}"
+            if not attachment.parent_key and skip_signature in known_skips:
+                still_skipped.append(skip_signature)
+                results['skipped_unchanged'] += 1
+                results['skipped'] += 1
+                continue
+            parent_lock = self._parent_lock(attachment)
+            parent_lock.acquire()
             try:
                 # Already processed — re-process if file still exists, otherwise clean up orphaned record
-                if attachment.parent_key and attachment.parent_key in self.state.processed_items:
+                if attachment.parent_key and attachment.parent_key in self.processed_items:
                     storage_file = self._resolve_storage_path(attachment)
                     if storage_file and storage_file.exists():
                         logger.info(f"Re-processing {attachment.key}: parent {attachment.parent_key} "
@@ -1707,7 +2482,7 @@ class DEVONzotService:
                                             self.state.pending_deletes.append({
                                                 'key': attachment.key, 'version': att_version
                                             })
-                                            self._save_state()
+                                            self._mark_dirty()
                                             logger.warning(f"⚠️  Queued orphaned record {attachment.key} for retry")
                                             results['cleaned_already_processed'] += 1
                                     else:
@@ -1724,18 +2499,17 @@ class DEVONzotService:
                             # Clean up empty storage folder if it exists
                             storage_dir = Path(ZOTERO_STORAGE_PATH) / attachment.key
                             if storage_dir.is_dir():
-                                dir_contents = [f for f in storage_dir.iterdir() if f.name != '.DS_Store']
-                                if len(dir_contents) == 0 and not dry_run:
+                                if _is_dir_empty(storage_dir, ('.DS_Store',)) and not dry_run:
                                     ds_store = storage_dir / '.DS_Store'
                                     if ds_store.exists():
                                         ds_store.unlink()
-                                    if not any(storage_dir.iterdir()):
+                                    if _is_dir_empty(storage_dir):
                                         storage_dir.rmdir()
                                         logger.info(f"🗑️  Cleaned empty folder: {storage_dir.name}")
                                         results['cleaned_empty_folders'] += 1
                         else:
                             # No DT link — search DEVONthink before deleting
-                            parent_item = self.zotero_api.get_item(attachment.parent_key)
+                            parent_item = self._parent_item(attachment.parent_key, parents)
                             if parent_item:
                                 filename = FilenameGenerator.generate_filename(parent_item)
                                 zotero_filename = self._get_zotero_filename(attachment)
@@ -1771,7 +2545,7 @@ class DEVONzotService:
                                             self.state.pending_deletes.append({
                                                 'key': attachment.key, 'version': att_version
                                             })
-                                            self._save_state()
+                                            self._mark_dirty()
                                             logger.warning(f"⚠️  Queued orphaned record {attachment.key} for retry")
                                             results['cleaned_already_processed'] += 1
                                     else:
@@ -1806,14 +2580,13 @@ class DEVONzotService:
                                 'retry_count': 0,
                                 'queued_at': datetime.now().isoformat(),
                             })
-                            self._save_state()
+                            self._mark_dirty()
                         continue
 
                 if not file_path:
                     # Check if storage folder exists but is empty (only .DS_Store)
                     storage_dir = Path(ZOTERO_STORAGE_PATH) / attachment.key
-                    dir_contents = [f for f in storage_dir.iterdir() if f.name != '.DS_Store'] if storage_dir.is_dir() else None
-                    if dir_contents is not None and len(dir_contents) == 0:
+                    if storage_dir.is_dir() and _is_dir_empty(storage_dir, ('.DS_Store',)):
                         # Empty folder — offer to clean up
                         do_clean = True
                         if interactive:
@@ -1834,7 +2607,7 @@ class DEVONzotService:
                                 ds_store = storage_dir / '.DS_Store'
                                 if ds_store.exists():
                                     ds_store.unlink()
-                                if storage_dir.exists() and not any(storage_dir.iterdir()):
+                                if storage_dir.exists() and _is_dir_empty(storage_dir):
                                     storage_dir.rmdir()
                                     logger.info(f"🗑️  Cleaned empty folder: {storage_dir.name}")
                                 results['cleaned_empty_folders'] += 1
@@ -1847,9 +2620,7 @@ class DEVONzotService:
 
                     # No resolvable path — check if storage folder exists
                     storage_dir_check = Path(ZOTERO_STORAGE_PATH) / attachment.key
-                    if storage_dir_check.is_dir() and any(
-                        f for f in storage_dir_check.iterdir() if f.name != '.DS_Store'
-                    ):
+                    if storage_dir_check.is_dir() and not _is_dir_empty(storage_dir_check, ('.DS_Store',)):
                         # Folder has files but path couldn't resolve — needs investigation
                         reason = "Invalid or unresolvable path (folder has files)"
                         logger.warning(f"⚠️  Attachment {attachment.key}: {reason} - {attachment.path}")
@@ -1876,7 +2647,7 @@ class DEVONzotService:
                                         self.state.pending_deletes.append({
                                             'key': attachment.key, 'version': att_version
                                         })
-                                        self._save_state()
+                                        self._mark_dirty()
                                         logger.warning(f"⚠️  Queued ghost record {attachment.key} for retry")
                                         results['cleaned_path_invalid'] += 1
                                 else:
@@ -1907,9 +2678,10 @@ class DEVONzotService:
                         'reason': reason,
                         'path': attachment.path
                     })
+                    still_skipped.append(skip_signature)
                     continue
 
-                parent_item = self.zotero_api.get_item(attachment.parent_key)
+                parent_item = self._parent_item(attachment.parent_key, parents)
                 if not parent_item:
                     reason = f"Parent item {attachment.parent_key} not found in database"
                     logger.warning(f"⚠️  Attachment {attachment.key}: {reason}")
@@ -2003,7 +2775,7 @@ class DEVONzotService:
                                     results['deleted_originals'] += 1
                                     logger.info(f"🗑️  Deleted original: {file_path}")
                                     # Remove empty storage key directory
-                                    if file_path.parent != Path(ZOTERO_STORAGE_PATH) and not any(file_path.parent.iterdir()):
+                                    if file_path.parent != Path(ZOTERO_STORAGE_PATH) and _is_dir_empty(file_path.parent):
                                         file_path.parent.rmdir()
                                         logger.info(f"🗑️  Removed empty directory: {file_path.parent}")
                                 except Exception as e:
@@ -2019,12 +2791,12 @@ class DEVONzotService:
                                         else:
                                             self.state.pending_deletes.append(
                                                 {'key': attachment.key, 'version': att_version})
-                                            self._save_state()
+                                            self._mark_dirty()
                                 except Exception as e:
                                     logger.warning(f"⚠️  Failed to delete attachment item {attachment.key}: {e}")
                                     self.state.pending_deletes.append(
                                         {'key': attachment.key, 'version': attachment.version})
-                                    self._save_state()
+                                    self._mark_dirty()
                             elif file_on_disk and dry_run:
                                 logger.info(f"[DRY RUN] Would delete original: {file_path}")
                                 logger.info(f"[DRY RUN] Would delete Zotero attachment item: {attachment.key}")
@@ -2039,20 +2811,19 @@ class DEVONzotService:
                                         else:
                                             self.state.pending_deletes.append(
                                                 {'key': attachment.key, 'version': att_version})
-                                            self._save_state()
+                                            self._mark_dirty()
                                 except Exception as e:
                                     logger.warning(f"⚠️  Failed to delete attachment item {attachment.key}: {e}")
                                     self.state.pending_deletes.append(
                                         {'key': attachment.key, 'version': attachment.version})
-                                    self._save_state()
+                                    self._mark_dirty()
                             else:
                                 logger.info(f"[DRY RUN] Would delete Zotero attachment item: {attachment.key}")
 
                             # Track processed item AFTER cleanup completes
                             if not dry_run:
-                                if attachment.parent_key not in self.state.processed_items:
-                                    self.state.processed_items.append(attachment.parent_key)
-                                    self._save_state()
+                                if self._mark_processed(attachment.parent_key):
+                                    self._mark_dirty()
                         else:
                             results['error'] += 1
                             logger.error(f"❌ Failed to update DEVONthink metadata for {attachment.key}")
@@ -2070,6 +2841,24 @@ class DEVONzotService:
             except Exception as e:
                 logger.error(f"❌ Failed to migrate attachment {attachment.key}: {e}")
                 results['error'] += 1
+            finally:
+                parent_lock.release()
+
+        # A full scan drops skips for attachments that are gone or changed
+        if not dry_run:
+            if full_scan:
+                skipped_attachments = still_skipped
+            else:
+                # A partial scan replaces the entries of the attachments it saw and keeps the rest
+                scanned = {attachment.key for attachment in attachments}
+                skipped_attachments = sorted(
+                    {sig for sig in known_skips if sig.rpartition(':')[0] not in scanned}.union(still_skipped)
+                )
+            if skipped_attachments != self.state.skipped_attachments:
+                self.state.skipped_attachments = skipped_attachments
+                self._save_state()
+            else:
+                self._flush_state()
 
         # Write skip report
         if skipped_details and not dry_run:
@@ -2097,6 +2886,7 @@ class DEVONzotService:
         logger.info(f"     - No parent: {results['skipped_no_parent']}")
         logger.info(f"     - Parent not found: {results['skipped_parent_not_found']}")
         logger.info(f"     - Already processed: {results['skipped_already_processed']}")
+        logger.info(f"     - Unchanged since last skip: {results['skipped_unchanged']}")
         if results['cleaned_already_processed']:
             logger.info(f"  🧹 Cleaned orphaned records: {results['cleaned_already_processed']}")
         if results['cleaned_path_invalid']:
@@ -2104,9 +2894,13 @@ class DEVONzotService:
 
         return results
 
-    def _process_single_zotfile_attachment(self, attachment, dry_run=False) -> Dict[str, Any]:
+    def _process_single_zotfile_attachment(
+        self, attachment, dry_run=False, parents: Optional[Dict[str, ZoteroItem]] = None
+    ) -> Dict[str, Any]:
         """Process a single ZotFile linked_file attachment.
 
+        ``parents`` optionally holds parent items prefetched by the caller.
+
         Returns a dict with:
           'result': one of 'success', 'error', 'skipped_already_processed',
                     'skipped_path_invalid', 'skipped_file_missing',
@@ -2123,7 +2917,7 @@ class DEVONzotService:
         }
 
         # Skip if already processed — but verify the file is actually gone
-        if attachment.parent_key and attachment.parent_key in self.state.processed_items:
+        if attachment.parent_key and attachment.parent_key in self.processed_items:
             file_check = Path(attachment.path) if attachment.path else None
             if file_check and file_check.exists():
                 logger.info(f"Re-processing {attachment.key}: parent {attachment.parent_key} "
@@ -2153,7 +2947,7 @@ class DEVONzotService:
             result['skip_detail'] = {'key': attachment.key, 'reason': reason, 'path': str(file_path)}
             return result
 
-        parent_item = self.zotero_api.get_item(attachment.parent_key)
+        parent_item = self._parent_item(attachment.parent_key, parents)
         if not parent_item:
             reason = f"Parent item {attachment.parent_key} not found in database"
             logger.warning(f"⚠️  Attachment {attachment.key}: {reason}")
@@ -2216,7 +3010,7 @@ class DEVONzotService:
                             result['deleted_original'] = True
                             logger.info(f"🗑️  Deleted original: {file_path}")
                             # Remove empty parent directory
-                            if not any(file_path.parent.iterdir()):
+                            if _is_dir_empty(file_path.parent):
                                 file_path.parent.rmdir()
                                 logger.info(f"🗑️  Removed empty directory: {file_path.parent}")
                         except Exception as e:
@@ -2232,12 +3026,12 @@ class DEVONzotService:
                                 else:
                                     self.state.pending_deletes.append(
                                         {'key': attachment.key, 'version': att_version})
-                                    self._save_state()
+                                    self._mark_dirty()
                         except Exception as e:
                             logger.warning(f"⚠️  Failed to delete attachment item {attachment.key}: {e}")
                             self.state.pending_deletes.append(
                                 {'key': attachment.key, 'version': attachment.version})
-                            self._save_state()
+                            self._mark_dirty()
                     elif file_on_disk and dry_run:
                         logger.info(f"[DRY RUN] Would delete original: {file_path}")
                         logger.info(f"[DRY RUN] Would delete Zotero attachment item: {attachment.key}")
@@ -2252,20 +3046,19 @@ class DEVONzotService:
                                 else:
                                     self.state.pending_deletes.append(
                                         {'key': attachment.key, 'version': att_version})
-                                    self._save_state()
+                                    self._mark_dirty()
                         except Exception as e:
                             logger.warning(f"⚠️  Failed to delete attachment item {attachment.key}: {e}")
                             self.state.pending_deletes.append(
                                 {'key': attachment.key, 'version': attachment.version})
-                            self._save_state()
+                            self._mark_dirty()
                     else:
                         logger.info(f"[DRY RUN] Would delete Zotero attachment item: {attachment.key}")
 
                     # Track processed item AFTER cleanup completes
                     if not dry_run:
-                        if attachment.parent_key not in self.state.processed_items:
-                            self.state.processed_items.append(attachment.parent_key)
-                            self._save_state()
+                        if self._mark_processed(attachment.parent_key):
+                            self._mark_dirty()
                 else:
                     logger.error(f"❌ Failed to update DEVONthink metadata for {attachment.key}")
             else:
@@ -2286,23 +3079,13 @@ class DEVONzotService:
         """
         logger.info("📁 Starting migration of ZotFile linked attachments...")
 
-        results = {
-            'success': 0,
-            'error': 0,
-            'skipped': 0,
-            'skipped_path_invalid': 0,
-            'skipped_no_parent': 0,
-            'skipped_parent_not_found': 0,
-            'skipped_already_processed': 0,
-            'linked_existing': 0,
-            'cleaned_broken': 0,
-            'deleted_originals': 0
-        }
+        results = self._zotfile_results()
         skipped_details = []
 
         if attachments is None:
             attachments = self.zotero_api.get_zotfile_symlinks()
         logger.info(f"📊 Detection Summary: Found {len(attachments)} ZotFile linked attachments (linkMode=2)")
+        parents = self.zotero_api.get_items([a.parent_key for a in attachments])
 
         for attachment in attachments:
             try:
@@ -2327,35 +3110,111 @@ class DEVONzotService:
                             break
                         continue
 
-                outcome = self._process_single_zotfile_attachment(attachment, dry_run)
-                r = outcome['result']
-
-                if r == 'success':
-                    results['success'] += 1
-                    if outcome.get('deleted_original'):
-                        results['deleted_originals'] += 1
-                    if outcome.get('linked_existing'):
-                        results['linked_existing'] += 1
-                elif r == 'cleaned_broken':
-                    results['cleaned_broken'] += 1
-                elif r.startswith('skipped_'):
-                    if r in results:
-                        results[r] += 1
-                    if r != 'skipped_already_processed':
-                        results['skipped'] += 1
-                    if outcome.get('skip_detail'):
-                        skipped_details.append(outcome['skip_detail'])
-                else:
-                    results['error'] += 1
+                outcome = self._process_single_zotfile_attachment(attachment, dry_run, parents)
+                self._tally_zotfile_outcome(results, outcome, skipped_details)
 
                 # Small delay between operations
-                if r == 'success' and not dry_run:
+                if outcome['result'] == 'success' and not dry_run:
                     time.sleep(2)
 
             except Exception as e:
                 logger.error(f"❌ Failed to migrate ZotFile attachment {attachment.key}: {e}")
                 results['error'] += 1
 
+        self._finish_zotfile_migration(results, skipped_details, dry_run)
+        return results
+
+    async def migrate_zotfile_attachments_async(
+        self, dry_run=False, attachments: Optional[List[ZoteroAttachment]] = None
+    ) -> Dict[str, int]:
+        """Migrate ZotFile linked files with up to MIGRATION_CONCURRENCY in flight
+
+        Each attachment runs _process_single_zotfile_attachment on a worker
+        thread, so DEVONthink imports, Zotero API calls and the pause after
+        each success overlap. Attachments of the same parent run one at a
+        time, also against a concurrent migrate_stored_attachments through
+        the shared parent locks, so a parent never gets two DEVONthink links.
+        Interactive runs use migrate_zotfile_attachments.
+        """
+        logger.info("📁 Starting migration of ZotFile linked attachments...")
+
+        results = self._zotfile_results()
+        skipped_details = []
+
+        if attachments is None:
+            attachments = await asyncio.to_thread(self.zotero_api.get_zotfile_symlinks)
+        logger.info(f"📊 Detection Summary: Found {len(attachments)} ZotFile linked attachments (linkMode=2)")
+        parents = await asyncio.to_thread(self.zotero_api.get_items, [a.parent_key for a in attachments])
+
+        semaphore = asyncio.Semaphore(MIGRATION_CONCURRENCY)
+        parent_locks = defaultdict(asyncio.Lock)
+
+        def process(attachment):
+            with self._parent_lock(attachment):
+                return self._process_single_zotfile_attachment(attachment, dry_run, parents)
+
+        async def migrate_one(attachment):
+            async with parent_locks[attachment.parent_key or attachment.key], semaphore:
+                outcome = await asyncio.to_thread(process, attachment)
+                # Small delay between operations
+                if outcome['result'] == 'success' and not dry_run:
+                    await asyncio.sleep(2)
+                return outcome
+
+        outcomes = await asyncio.gather(
+            *(migrate_one(attachment) for attachment in attachments), return_exceptions=True
+        )
+        for attachment, outcome in zip(attachments, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"❌ Failed to migrate ZotFile attachment {attachment.key}: {outcome}")
+                results['error'] += 1
+            else:
+                self._tally_zotfile_outcome(results, outcome, skipped_details)
+
+        self._finish_zotfile_migration(results, skipped_details, dry_run)
+        return results
+
+    @staticmethod
+    def _zotfile_results() -> Dict[str, int]:
+        return {
+            'success': 0,
+            'error': 0,
+            'skipped': 0,
+            'skipped_path_invalid': 0,
+            'skipped_no_parent': 0,
+            'skipped_parent_not_found': 0,
+            'skipped_already_processed': 0,
+            'linked_existing': 0,
+            'cleaned_broken': 0,
+            'deleted_originals': 0
+        }
+
+    @staticmethod
+    def _tally_zotfile_outcome(results: Dict[str, int], outcome: Dict[str, Any], skipped_details: List[Dict]):
+        r = outcome['result']
+
+        if r == 'success':
+            results['success'] += 1
+            if outcome.get('deleted_original'):
+                results['deleted_originals'] += 1
+            if outcome.get('linked_existing'):
+                results['linked_existing'] += 1
+        elif r == 'cleaned_broken':
+            results['cleaned_broken'] += 1
+        elif r.startswith('skipped_'):
+            if r in results:
+                results[r] += 1
+            if r != 'skipped_already_processed':
+                results['skipped'] += 1
+            if outcome.get('skip_detail'):
+                skipped_details.append(outcome['skip_detail'])
+        else:
+            results['error'] += 1
+
+    def _finish_zotfile_migration(self, results: Dict[str, int], skipped_details: List[Dict], dry_run: bool):
+        """Save held-back state, write the skip report and log the summary"""
+        self._flush_state()
+
         # Write skip report
         if skipped_details and not dry_run:
             skip_report_file = DEVONZOT_PATH / "skipped_zotfile_attachments.json"
@@ -2383,8 +3242,6 @@ class DEVONzotService:
         logger.info(f"     - Parent not found: {results['skipped_parent_not_found']}")
         logger.info(f"     - Already processed: {results['skipped_already_processed']}")
 
-        return results
-
     async def convert_zotfile_symlinks_async(
         self, dry_run=False, batch_size=20, interactive=False,
         attachments: Optional[List[ZoteroAttachment]] = None
@@ -2409,8 +3266,8 @@ class DEVONzotService:
                     results['skipped'] += 1
                     continue
 
-                filename = Path(symlink.path).name
-                filename_no_ext = filename.rsplit('.', 1)[0] if '.' in filename else filename
+                filename = os.path.basename(symlink.path)
+                filename_no_ext = os.path.splitext(filename)[0]
 
                 # Fetch parent for display
                 parent_title = "(unknown)"
@@ -2441,16 +3298,19 @@ class DEVONzotService:
 
                 # Single-item DEVONthink lookup
                 try:
-                    uuid_results = await self.devonthink.batch_search_items([filename_no_ext], dry_run)
+                    uuid_results, cached = await self._search_devonthink_cached([filename_no_ext], dry_run)
                     dt_uuid = uuid_results.get(filename_no_ext)
 
                     if dt_uuid and dt_uuid != "dry-run-uuid":
                         if symlink.parent_key and parent_item:
-                            if self._create_devonthink_child_link(symlink.parent_key, dt_uuid, title=filename, dry_run=dry_run):
-                                if await self.devonthink_update_metadata_async(dt_uuid, parent_item, dry_run):
-                                    results['success'] += 1
-                                    logger.info(f"Converted symlink {symlink.key} -> {dt_uuid}")
-                                    continue
+                            outcome = await self._finish_symlink_conversion(
+                                symlink, filename, dt_uuid, {symlink.parent_key: parent_item}, dry_run,
+                                from_cache=filename_no_ext in cached
+                            )
+                            results[outcome] += 1
+                            if outcome == 'success':
+                                logger.info(f"Converted symlink {symlink.key} -> {dt_uuid}")
+                            continue
                         results['error'] += 1
                     elif dt_uuid == "dry-run-uuid":
                         results['success'] += 1
@@ -2462,90 +3322,205 @@ class DEVONzotService:
                     results['error'] += 1
 
         else:
-            # Batch path (original behavior)
+            # Batch path: one producer searches DEVONthink a batch at a time while
+            # SYMLINK_CONVERT_CONCURRENCY consumers finish the hits already found,
+            # so searches and updates overlap instead of alternating
             total_batches = (len(symlinks) + batch_size - 1) // batch_size
+            basename, splitext = os.path.basename, os.path.splitext
+            # At most one searched batch waits for consumers; put() blocks the producer beyond that
+            update_q: asyncio.Queue = asyncio.Queue(maxsize=batch_size)
+            # Batch number -> [hits still being finished, successes], for one rollup line per batch
+            batch_progress: Dict[int, List[int]] = {}
 
-            for batch_num in range(total_batches):
-                start_idx = batch_num * batch_size
-                end_idx = min(start_idx + batch_size, len(symlinks))
-                batch = symlinks[start_idx:end_idx]
+            async def search_batches():
+                try:
+                    for batch_num in range(total_batches):
+                        start_idx = batch_num * batch_size
+                        end_idx = min(start_idx + batch_size, len(symlinks))
+                        batch = symlinks[start_idx:end_idx]
 
-                logger.info(f"Processing batch {batch_num + 1}/{total_batches} ({len(batch)} items)")
+                        logger.info(f"Processing batch {batch_num + 1}/{total_batches} ({len(batch)} items)")
 
-                # Prepare batch for concurrent processing
-                batch_items = []
-                valid_symlinks = []
+                        # (symlink, filename, filename_no_ext) for symlinks with a path
+                        named = [(symlink, basename(symlink.path)) for symlink in batch if symlink.path]
+                        valid = [(symlink, filename, splitext(filename)[0]) for symlink, filename in named]
+                        results['skipped'] += len(batch) - len(valid)
 
-                for symlink in batch:
-                    if not symlink.path:
-                        results['skipped'] += 1
-                        continue
+                        if not valid:
+                            continue
+                        batch_items = [filename_no_ext for _, _, filename_no_ext in valid]
 
-                    filename = Path(symlink.path).name
-                    filename_no_ext = filename.rsplit('.', 1)[0] if '.' in filename else filename
+                        batch_started = time.monotonic()
+                        try:
+                            uuid_results, cached = await self._search_devonthink_cached(batch_items, dry_run)
+                            # (symlink, filename, dt_uuid, from_cache), looked up once in batch order
+                            searched = [
+                                (symlink, filename, uuid_results.get(filename_no_ext), filename_no_ext in cached)
+                                for symlink, filename, filename_no_ext in valid
+                            ]
+                            hits = [entry for entry in searched if entry[2] not in (None, "dry-run-uuid")]
+
+                            # Fetch the parents of all hits in one request per 50 keys
+                            parents = await asyncio.to_thread(
+                                self.zotero_api.get_items, [symlink.parent_key for symlink, _, _, _ in hits]
+                            )
 
-                    batch_items.append(filename_no_ext)
-                    valid_symlinks.append(symlink)
+                            # Link every prefetched parent of a fresh hit in one POST per 50 before the
+                            # metadata updates; cached hits are linked only once their update proves the record exists
+                            linked = await asyncio.to_thread(self._create_devonthink_child_links, [
+                                (symlink.parent_key, dt_uuid, filename or "DEVONthink Link")
+                                for symlink, filename, dt_uuid, from_cache in hits
+                                if not from_cache and symlink.parent_key and parents.get(symlink.parent_key)
+                            ], dry_run)
+
+                            batch_progress[batch_num + 1] = [len(searched), 0]
+                            for symlink, filename, dt_uuid, from_cache in searched:
+                                await update_q.put((
+                                    symlink, filename, dt_uuid, parents,
+                                    None if from_cache else linked.get(symlink.parent_key),
+                                    from_cache, batch_num + 1
+                                ))
+
+                            # Progress update
+                            total_processed = start_idx + len(batch)
+                            logger.info(f"Batch {batch_num + 1} searched. Progress: {total_processed}/{len(symlinks)} ({100*total_processed/len(symlinks):.1f}%)")
+
+                            # Pace batches to avoid overwhelming DEVONthink; slow batches go straight on
+                            if not dry_run and batch_num < total_batches - 1:
+                                remaining = SYMLINK_BATCH_PACE * len(batch) - (time.monotonic() - batch_started)
+                                if remaining > 0:
+                                    await asyncio.sleep(remaining)
 
-                if not batch_items:
-                    continue
+                        except Exception as e:
+                            logger.error(f"Failed to process batch {batch_num + 1}: {e}")
+                            results['error'] += len(batch)
+                finally:
+                    # One sentinel per consumer
+                    for _ in range(SYMLINK_CONVERT_CONCURRENCY):
+                        await update_q.put(None)
+
+            async def finish_hits():
+                while (entry := await update_q.get()) is not None:
+                    symlink, filename, dt_uuid, parents, linked, from_cache, batch_no = entry
+                    try:
+                        outcome = await self._finish_symlink_conversion(
+                            symlink, filename, dt_uuid, parents, dry_run, linked=linked, from_cache=from_cache
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to convert symlink {symlink.key}: {e}")
+                        outcome = 'error'
+                    results[outcome] += 1
+
+                    progress = batch_progress[batch_no]
+                    progress[0] -= 1
+                    progress[1] += outcome == 'success'
+                    if not progress[0]:
+                        del batch_progress[batch_no]
+                        logger.info(f"Converted {progress[1]} symlinks in batch {batch_no}")
+
+            await asyncio.gather(
+                search_batches(), *(finish_hits() for _ in range(SYMLINK_CONVERT_CONCURRENCY))
+            )
 
-                # Process batch concurrently
-                try:
-                    uuid_results = await self.devonthink.batch_search_items(batch_items, dry_run)
+        logger.info(f"Symlink conversion complete: {results}")
+        return results
+    
+    async def _finish_symlink_conversion(
+        self, symlink: ZoteroAttachment, filename: str, dt_uuid: Optional[str],
+        parents: Dict[str, ZoteroItem], dry_run=False, linked: Optional[bool] = None,
+        from_cache: bool = False
+    ) -> str:
+        """Link a searched symlink's parent to its DEVONthink hit; returns the results key to count
+
+        linked is the outcome of an earlier bulk link creation, or None to create the link here.
+        A from_cache UUID may belong to a record deleted since it was found, so its metadata is
+        updated first and the link is only created once that update shows the record exists.
+        """
+        if dt_uuid == "dry-run-uuid":
+            return 'success'  # Count dry run successes
+        if not dt_uuid:
+            logger.debug(f"No DEVONthink item found for: {filename}")
+            return 'skipped'
 
-                    # Update Zotero with results
-                    for symlink, filename_no_ext in zip(valid_symlinks, batch_items):
-                        try:
-                            dt_uuid = uuid_results.get(filename_no_ext)
-
-                            if dt_uuid and dt_uuid != "dry-run-uuid":
-                                # Get parent item for metadata update
-                                link_title = Path(symlink.path).name if symlink.path else "DEVONthink Link"
-                                if not symlink.parent_key:
-                                    logger.warning(f"Symlink {symlink.key}: no parent_key, cannot link to {dt_uuid}")
-                                elif not (parent_item := self.zotero_api.get_item(symlink.parent_key)):
-                                    logger.warning(f"Symlink {symlink.key}: parent {symlink.parent_key} not found in Zotero")
-                                elif not self._create_devonthink_child_link(symlink.parent_key, dt_uuid, title=link_title, dry_run=dry_run):
-                                    logger.warning(f"Symlink {symlink.key}: failed to create DEVONthink child link for parent {symlink.parent_key}")
-                                elif not await self.devonthink_update_metadata_async(dt_uuid, parent_item, dry_run):
-                                    logger.warning(f"Symlink {symlink.key}: metadata update failed for {dt_uuid}")
-                                else:
-                                    results['success'] += 1
-                                    logger.info(f"Converted symlink {symlink.key} → {dt_uuid}")
-                                    continue
+        link_title = filename or "DEVONthink Link"
+        if not symlink.parent_key:
+            logger.warning(f"Symlink {symlink.key}: no parent_key, cannot link to {dt_uuid}")
+            return 'error'
 
-                                results['error'] += 1
-                            elif dt_uuid == "dry-run-uuid":
-                                results['success'] += 1  # Count dry run successes
-                            else:
-                                filename = Path(symlink.path).name
-                                logger.debug(f"No DEVONthink item found for: {filename}")
-                                results['skipped'] += 1
+        # Blocking Zotero and DEVONthink calls run on worker threads
+        parent_item = await asyncio.to_thread(self._parent_item, symlink.parent_key, parents)
+        if not parent_item:
+            logger.warning(f"Symlink {symlink.key}: parent {symlink.parent_key} not found in Zotero")
+            return 'error'
+        if from_cache and not await self._update_symlink_metadata(symlink, filename, dt_uuid, parent_item, dry_run):
+            return 'error'
+        if linked is None:
+            linked = await asyncio.to_thread(
+                self._create_devonthink_child_link, symlink.parent_key, dt_uuid, title=link_title, dry_run=dry_run
+            )
+        if not linked:
+            logger.warning(f"Symlink {symlink.key}: failed to create DEVONthink child link for parent {symlink.parent_key}")
+            return 'error'
+        if not from_cache and not await self._update_symlink_metadata(symlink, filename, dt_uuid, parent_item, dry_run):
+            return 'error'
 
-                        except Exception as e:
-                            logger.error(f"Failed to convert symlink {symlink.key}: {e}")
-                            results['error'] += 1
+        logger.debug("Converted symlink %s → %s", symlink.key, dt_uuid)
+        return 'success'
 
-                    # Progress update
-                    total_processed = start_idx + len(batch)
-                    logger.info(f"Batch {batch_num + 1} complete. Progress: {total_processed}/{len(symlinks)} ({100*total_processed/len(symlinks):.1f}%)")
+    async def _update_symlink_metadata(
+        self, symlink: ZoteroAttachment, filename: str, dt_uuid: str, parent_item: ZoteroItem, dry_run=False
+    ) -> bool:
+        """Update a converted symlink's DEVONthink record, forgetting its cached UUID on failure"""
+        if await self.devonthink_update_metadata_async(dt_uuid, parent_item, dry_run):
+            return True
+        logger.warning(f"Symlink {symlink.key}: metadata update failed for {dt_uuid}")
+        # The record may be gone; search for it again next time
+        self._forget_devonthink_uuid(os.path.splitext(filename)[0])
+        return False
 
-                    # Small delay between batches to avoid overwhelming DEVONthink
-                    if not dry_run and batch_num < total_batches - 1:
-                        await asyncio.sleep(2)
+    async def _search_devonthink_cached(
+        self, filenames: List[str], dry_run=False
+    ) -> Tuple[Dict[str, Optional[str]], Set[str]]:
+        """batch_search_items, answering filenames found by earlier searches from state.devonthink_uuids
 
-                except Exception as e:
-                    logger.error(f"Failed to process batch {batch_num + 1}: {e}")
-                    results['error'] += len(batch)
+        Returns the results and the filenames answered from the cache, whose UUIDs
+        have not been checked against DEVONthink this time.
+        """
+        if dry_run:
+            return await self.devonthink.batch_search_items(filenames, dry_run), set()
+
+        cache = self.state.devonthink_uuids
+        found = {}
+        with self._state_lock:
+            for filename in filenames:
+                dt_uuid = cache.get(filename)
+                if dt_uuid is not None:
+                    cache.move_to_end(filename)
+                    found[filename] = dt_uuid
+
+        cached = set(found)
+        misses = [filename for filename in filenames if filename not in found]
+        if misses:
+            searched = await self.devonthink.batch_search_items(misses, dry_run)
+            with self._state_lock:
+                for filename, dt_uuid in searched.items():
+                    if dt_uuid:
+                        cache[filename] = dt_uuid
+                        cache.move_to_end(filename)
+                while len(cache) > DEVONTHINK_UUID_CACHE_SIZE:
+                    cache.popitem(last=False)
+            found.update(searched)
+        return found, cached
+
+    def _forget_devonthink_uuid(self, filename: str):
+        """Drop a cached search hit so the next conversion searches DEVONthink again"""
+        with self._state_lock:
+            self.state.devonthink_uuids.pop(filename, None)
 
-        logger.info(f"Symlink conversion complete: {results}")
-        return results
-    
     async def devonthink_update_metadata_async(self, uuid: str, item, dry_run=False) -> bool:
         """Async wrapper for metadata update"""
-        # Since AppleScript is synchronous, we just wrap it
-        return self.devonthink.update_item_metadata(uuid, item, dry_run)
+        # AppleScript is synchronous, so run it on a worker thread
+        return await asyncio.to_thread(self.devonthink.update_item_metadata, uuid, item, dry_run)
     
     def sync_new_items(self, dry_run=False, interactive=False) -> Dict[str, int]:
         """Sync new Zotero items to DEVONthink"""
@@ -2557,17 +3532,14 @@ class DEVONzotService:
         v = self.state.last_library_version
         items = self.zotero_api.get_items_needing_sync(
             (v - 1) if v else None,
-            processed_items=self.state.processed_items
+            processed_items=self.processed_items
         )
 
         logger.info(f"Found {len(items)} items needing sync")
 
+        # get_items_needing_sync already excludes processed items
         for item in items:
             try:
-                if item.key in self.state.processed_items:
-                    results['skipped'] += 1
-                    continue
-
                 if interactive:
                     creators = item.creators if item.creators else []
                     first_creator = FilenameGenerator.extract_first_creator(creators) if creators else "(none)"
@@ -2596,20 +3568,33 @@ class DEVONzotService:
                 # Could be extended to create text records or notes in DEVONthink
 
                 results['success'] += 1
-                prefix = "[DRY RUN] Would process" if dry_run else "Processed"
-                logger.info(f"{prefix} item {item.key}: {item.title[:50]}...")
 
                 # Track processed item
                 if not dry_run:
-                    if item.key not in self.state.processed_items:
-                        self.state.processed_items.append(item.key)
+                    self._mark_processed(item.key)
 
             except Exception as e:
                 logger.error(f"Failed to process item {item.key}: {e}")
                 results['error'] += 1
 
+        prefix = "[DRY RUN] Would process" if dry_run else "Processed"
+        logger.info(f"{prefix} {results['success']} new items")
         return results
     
+    def _legacy_storage_index(self, storage_base: Path) -> Dict[str, List[Path]]:
+        """Files in every storage key directory by name, scanned once per cycle"""
+        if self._legacy_index is None:
+            index = defaultdict(list)
+            with os.scandir(storage_base) as key_dirs:
+                for key_dir in key_dirs:
+                    if not key_dir.is_dir():
+                        continue
+                    with os.scandir(key_dir.path) as entries:
+                        for entry in entries:
+                            index[entry.name].append(Path(entry.path))
+            self._legacy_index = dict(index)
+        return self._legacy_index
+
     def _resolve_storage_path(self, attachment: ZoteroAttachment) -> Optional[Path]:
         """Resolve Zotero storage path to actual file location
 
@@ -2637,69 +3622,38 @@ class DEVONzotService:
         path = attachment.path
         storage_base = Path(ZOTERO_STORAGE_PATH)
 
-        # Format 1: storage:KEY:filename.pdf (standard)
+        # Formats 1-3: storage:KEY:filename.pdf (standard), KEY:filename.pdf, KEY/filename.pdf
+        match = _RE_STORAGE_KEY_PATH.match(path)
+        if match:
+            key = match.group(1) or match.group(2)
+            resolved = storage_base / key / match.group(3)
+            if resolved.exists():
+                return resolved
+            logger.debug(f"Storage path resolved but file missing: {resolved}")
+            return None
+
         if path.startswith("storage:"):
             parts = path.split(":")
             if len(parts) >= 3:
-                key = parts[1]
-                filename = ":".join(parts[2:])
-
-                # Validate storage key format (should be 8 uppercase alphanumeric)
-                if re.match(r'^[A-Z0-9]{8}$', key):
-                    resolved = storage_base / key / filename
-                    if resolved.exists():
-                        return resolved
-                    else:
-                        logger.debug(f"Storage path resolved but file missing: {resolved}")
-                        return None
-                else:
-                    logger.warning(f"Malformed storage path (invalid key '{key}'): {path}")
-                    return None
-            else:
-                # Legacy format: storage:filename.pdf (no key directory)
-                # Search across all storage key directories for this filename
-                filename = ":".join(parts[1:])
-                matches = list(storage_base.glob(f"*/{filename}"))
-                if len(matches) == 1:
-                    logger.info(f"Resolved legacy storage path: {path} -> {matches[0]}")
-                    return matches[0]
-                elif len(matches) > 1:
-                    logger.warning(f"Ambiguous legacy storage path (found {len(matches)} matches): {path}")
-                    return matches[0]
-                else:
-                    logger.debug(f"Legacy storage path - file not found in any key directory: {path}")
-                    return None
+                logger.warning(f"Malformed storage path (invalid key '{parts[1]}'): {path}")
+                return None
 
-        # Format 2: KEY:filename.pdf (without storage: prefix)
-        elif ":" in path and not path.startswith("/"):
-            parts = path.split(":", 1)
-            if len(parts) == 2:
-                key, filename = parts
-                if re.match(r'^[A-Z0-9]{8}$', key):
-                    resolved = storage_base / key / filename
-                    if resolved.exists():
-                        logger.info(f"Resolved non-standard path format: {path} -> {resolved}")
-                        return resolved
-                    else:
-                        logger.debug(f"Non-standard path resolved but file missing: {resolved}")
-                        return None
-
-        # Format 3: KEY/filename.pdf (forward slash variant)
-        elif "/" in path and not path.startswith("/"):
-            parts = path.split("/", 1)
-            if len(parts) == 2:
-                key, filename = parts
-                if re.match(r'^[A-Z0-9]{8}$', key):
-                    resolved = storage_base / key / filename
-                    if resolved.exists():
-                        logger.info(f"Resolved slash-format path: {path} -> {resolved}")
-                        return resolved
-                    else:
-                        logger.debug(f"Slash-format path resolved but file missing: {resolved}")
-                        return None
+            # Legacy format: storage:filename.pdf (no key directory)
+            # Search across all storage key directories for this filename
+            filename = parts[1]
+            matches = self._legacy_storage_index(storage_base).get(filename, [])
+            if len(matches) == 1:
+                logger.info(f"Resolved legacy storage path: {path} -> {matches[0]}")
+                return matches[0]
+            elif len(matches) > 1:
+                logger.warning(f"Ambiguous legacy storage path (found {len(matches)} matches): {path}")
+                return matches[0]
+            else:
+                logger.debug(f"Legacy storage path - file not found in any key directory: {path}")
+                return None
 
         # Format 4: Absolute path (for linkMode=1,2,3 - not for storage)
-        elif path.startswith("/"):
+        if path.startswith("/"):
             absolute_path = Path(path)
             if absolute_path.exists():
                 return absolute_path
@@ -2736,6 +3690,7 @@ class DEVONzotService:
         )
 
         self.zotero_api.invalidate_caches()
+        self._legacy_index = None
 
         try:
             # Step 1: Get changed attachment keys (lightweight format=versions call)
@@ -2778,7 +3733,7 @@ class DEVONzotService:
                 parent_key = data.get('parentItem')
 
                 # Skip already-processed
-                if parent_key and parent_key in self.state.processed_items:
+                if parent_key and parent_key in self.processed_items:
                     skipped_count += 1
                     continue
 
@@ -2880,10 +3835,9 @@ class DEVONzotService:
             deleted_items = deleted.get('items', [])
             if deleted_items:
                 logger.info(f"Noted {len(deleted_items)} deleted items")
-                # Remove deleted keys from processed_items to keep list clean
+                # Remove deleted keys from processed_items to keep it clean
                 for key in deleted_items:
-                    if key in self.state.processed_items:
-                        self.state.processed_items.remove(key)
+                    self.processed_items.discard(key)
 
             # Step 5: Update state
             if not dry_run:
@@ -2950,6 +3904,7 @@ class DEVONzotService:
 
         # Invalidate caches at start of each cycle
         self.zotero_api.invalidate_caches()
+        self._legacy_index = None
 
         try:
             # Retry pending deletes from previous cycles
@@ -2980,27 +3935,43 @@ class DEVONzotService:
             if phase0_results.get('items_deleted', 0) > 0:
                 self.zotero_api.invalidate_caches()
 
-            # Phase 1A: Migrate stored attachments from Zotero storage (linkMode=0)
-            await self._wait_if_paused_async()
-            logger.info("\n" + "="*70)
-            logger.info("PHASE 1A: Migrating linkMode=0 (Zotero storage) attachments")
-            logger.info("="*70)
-            migration_results = self.migrate_stored_attachments(dry_run, interactive=interactive)
-            logger.info(f"Phase 1A complete: {migration_results}")
-            if interactive and self._interactive_quit:
-                logger.info("[INTERACTIVE] User quit - stopping cycle early.")
-                return True
-
-            # Phase 1B: Migrate ZotFile linked attachments (linkMode=2)
-            await self._wait_if_paused_async()
-            logger.info("\n" + "="*70)
-            logger.info("PHASE 1B: Migrating linkMode=2 (ZotFile Import) attachments")
-            logger.info("="*70)
-            zotfile_migration_results = self.migrate_zotfile_attachments(dry_run, interactive=interactive)
-            logger.info(f"Phase 1B complete: {zotfile_migration_results}")
-            if interactive and self._interactive_quit:
-                logger.info("[INTERACTIVE] User quit - stopping cycle early.")
-                return True
+            if interactive:
+                # Phase 1A: Migrate stored attachments from Zotero storage (linkMode=0)
+                await self._wait_if_paused_async()
+                logger.info("\n" + "="*70)
+                logger.info("PHASE 1A: Migrating linkMode=0 (Zotero storage) attachments")
+                logger.info("="*70)
+                migration_results = self.migrate_stored_attachments(dry_run, interactive=True)
+                logger.info(f"Phase 1A complete: {migration_results}")
+                if self._interactive_quit:
+                    logger.info("[INTERACTIVE] User quit - stopping cycle early.")
+                    return True
+
+                # Phase 1B: Migrate ZotFile linked attachments (linkMode=2)
+                await self._wait_if_paused_async()
+                logger.info("\n" + "="*70)
+                logger.info("PHASE 1B: Migrating linkMode=2 (ZotFile Import) attachments")
+                logger.info("="*70)
+                zotfile_migration_results = self.migrate_zotfile_attachments(dry_run, interactive=True)
+                logger.info(f"Phase 1B complete: {zotfile_migration_results}")
+                if self._interactive_quit:
+                    logger.info("[INTERACTIVE] User quit - stopping cycle early.")
+                    return True
+            else:
+                # Phases 1A (linkMode=0) and 1B (linkMode=2) migrate disjoint attachments, so run them
+                # together; a parent with both kinds is handled by one phase at a time via _parent_lock
+                await self._wait_if_paused_async()
+                logger.info("\n" + "="*70)
+                logger.info("PHASES 1A + 1B: Migrating linkMode=0 (Zotero storage) and linkMode=2 (ZotFile Import) attachments")
+                logger.info("="*70)
+                # Both phases start from the attachment list; fetch it once before they split
+                await asyncio.to_thread(self.zotero_api._get_all_attachments_cached)
+                migration_results, zotfile_migration_results = await asyncio.gather(
+                    asyncio.to_thread(self.migrate_stored_attachments, dry_run),
+                    self.migrate_zotfile_attachments_async(dry_run),
+                )
+                logger.info(f"Phase 1A complete: {migration_results}")
+                logger.info(f"Phase 1B complete: {zotfile_migration_results}")
 
             # Phase 2: Convert ZotFile symlinks already in DEVONthink (async batch processing)
             await self._wait_if_paused_async()
@@ -3057,6 +4028,7 @@ class DEVONzotService:
             f.write(str(os.getpid()))
         
         self.running = True
+        self._stop_event.clear()
         
         try:
             while self.running:
@@ -3070,7 +4042,7 @@ class DEVONzotService:
                         break
                     
                     logger.warning(f"Service cycle failed. Restarting in {RESTART_DELAY} seconds... (Attempt {self.restart_count}/{MAX_RESTART_ATTEMPTS})")
-                    time.sleep(RESTART_DELAY)
+                    self._stop_event.wait(RESTART_DELAY)
                     continue
                 else:
                     # Reset restart count on successful cycle
@@ -3078,11 +4050,7 @@ class DEVONzotService:
                 
                 # Wait for next sync interval
                 logger.info(f"Next sync in {SYNC_INTERVAL} seconds...")
-                
-                for i in range(SYNC_INTERVAL):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                self._stop_event.wait(SYNC_INTERVAL)
                     
         except KeyboardInterrupt:
             logger.info("Service interrupted by user")
@@ -3203,7 +4171,7 @@ class DEVONzotService:
                     await self._wait_if_paused_async()
                     if linked_items is None or linked_items:
                         logger.info("PHASE 1B: Migrating linkMode=2 (ZotFile Import) attachments")
-                        m1b = self.migrate_zotfile_attachments(dry_run=False, attachments=linked_items)
+                        m1b = await self.migrate_zotfile_attachments_async(dry_run=False, attachments=linked_items)
                         logger.info(f"Phase 1B complete: {m1b}")
                     else:
                         logger.info("PHASE 1B: skipped — no new ZotFile attachments since last run")
@@ -28,6 +28,15 @@ OUTPUT_FILE = "storage_diagnostics_report.json"
 # Reverse mapping for display: int -> string
 LINK_MODE_NAMES = {v: k for k, v in LINK_MODE_MAP.items()}
 
+# Zotero storage key leading a KEY:file / KEY/file path
+_RE_KEY_PREFIX = re.compile(r'[A-Z0-9]{8}[:/]')
+
+
+def _is_storage_key(name: str) -> bool:
+    """Whether name is a Zotero storage key: 8 ASCII uppercase letters or digits"""
+    # upper() rather than isupper(), which is False for an all-digit key
+    return len(name) == 8 and name.isascii() and name.isalnum() and name == name.upper()
+
 
 @dataclass
 class AttachmentStats:
@@ -96,7 +105,7 @@ def categorize_path(path: Optional[str]) -> Dict[str, bool]:
     }
 
     if not categories['with_storage_prefix'] and not categories['http_url'] and not categories['absolute_file_path']:
-        if re.match(r'^[A-Z0-9]{8}[:/]', path):
+        if _RE_KEY_PREFIX.match(path):
             if ':' in path:
                 categories['without_storage_prefix'] = True
             elif '/' in path:
@@ -121,13 +130,13 @@ def resolve_storage_path(path: Optional[str]) -> Optional[Path]:
 
     elif ":" in path and not path.startswith("/"):
         parts = path.split(":", 1)
-        if len(parts) == 2 and re.match(r'^[A-Z0-9]{8}$', parts[0]):
+        if len(parts) == 2 and _is_storage_key(parts[0]):
             key, filename = parts
             return storage_base / key / filename
 
     elif "/" in path and not path.startswith("/"):
         parts = path.split("/", 1)
-        if len(parts) == 2 and re.match(r'^[A-Z0-9]{8}$', parts[0]):
+        if len(parts) == 2 and _is_storage_key(parts[0]):
             key, filename = parts
             return storage_base / key / filename
 
@@ -144,10 +153,8 @@ def analyze_attachments(client: ZoteroAPIClient) -> tuple:
     path_patterns = defaultdict(list)
 
     print("Fetching all attachments from Zotero API...")
-    all_attachments = client._get_all_items_paginated({'itemType': 'attachment'})
-    print(f"Fetched {len(all_attachments)} attachments")
-
-    for api_item in all_attachments:
+    # Analyze each page as it arrives rather than holding the whole library
+    for api_item in client._iter_items_paginated({'itemType': 'attachment'}):
         data = api_item.get('data', {})
         stats.total_attachments += 1
 
@@ -239,6 +246,7 @@ def analyze_attachments(client: ZoteroAPIClient) -> tuple:
         if path and not detected and link_mode == 0:
             path_patterns['undetected'].append(path)
 
+    print(f"Fetched {stats.total_attachments} attachments")
     return stats, examples, dict(path_patterns)
 
 
@@ -253,7 +261,7 @@ def analyze_orphaned_files() -> Dict[str, Any]:
     total_storage_keys = 0
 
     for storage_dir in storage_path.iterdir():
-        if storage_dir.is_dir() and re.match(r'^[A-Z0-9]{8}$', storage_dir.name):
+        if storage_dir.is_dir() and _is_storage_key(storage_dir.name):
             total_storage_keys += 1
             files_in_dir = list(storage_dir.glob('*'))
             if len(files_in_dir) > 0:
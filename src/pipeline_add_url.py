@@ -59,6 +59,12 @@ ENABLE_WAYBACK = os.environ.get('ENABLE_WAYBACK', 'true').lower() == 'true'
 PLAYWRIGHT_TIMEOUT = int(os.environ.get('PLAYWRIGHT_TIMEOUT', 30000))
 WAYBACK_TIMEOUT = int(os.environ.get('WAYBACK_TIMEOUT', 15))
 
+# Filename cleanup patterns
+_RE_WS = re.compile(r'\s+')
+_RE_BAD_CHARS = re.compile(r'[<>:"/\\|?*]')
+_RE_EMPTY_SEPARATORS = re.compile(r'\s+-\s+-\s+')
+_RE_YEAR = re.compile(r'(?:19|20)\d{2}')
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG if DEBUG_MODE else logging.INFO,
@@ -126,9 +132,9 @@ def sanitize_short_title(title: str, length: int = 60) -> str:
     if not title:
         return "untitled"
     # Normalize whitespace
-    s = re.sub(r'\s+', ' ', title).strip()
+    s = _RE_WS.sub(' ', title).strip()
     # Remove problematic characters
-    s = re.sub(r'[<>:"/\\|?*]', '', s)
+    s = _RE_BAD_CHARS.sub('', s)
     # Truncate at word boundary
     if len(s) > length:
         s = s[:length].rsplit(' ', 1)[0] + '...'
@@ -547,15 +553,15 @@ def _generate_filename(metadata: dict) -> str:
         try:
             year = str(date.year)
         except Exception:
-            m = re.search(r'(19|20)\d{2}', str(date))
+            m = _RE_YEAR.search(str(date))
             year = m.group(0) if m else ''
 
     # Assemble filename
     filename = f"{surname} - {title} - {publication} - {year} - Article"
 
     # Clean up multiple separators
-    filename = re.sub(r'\s+-\s+-\s+', ' - ', filename)
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+    filename = _RE_EMPTY_SEPARATORS.sub(' - ', filename)
+    filename = _RE_BAD_CHARS.sub('', filename)
 
     # Limit length
     return filename[:140]
@@ -6,11 +6,14 @@ Replaces all direct SQLite database queries with Zotero Web API v3 calls.
 Used by devonzot_service.py, devonzot_add_new.py, and diagnose_attachments.py.
 """
 
+import asyncio
 import logging
 import re
 import time
 import requests
-from typing import List, Dict, Optional, Any
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Any, Container, Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,113 @@ LINK_MODE_MAP = {
     'linked_url': 3,
 }
 
+# Four-digit year in a free-form Zotero date string
+_RE_YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+class RateLimiter:
+    """Header-driven request pacing for the Zotero API.
+
+    Requests go out immediately while there is budget. A Backoff or
+    Retry-After header, a full sliding window, or a low
+    X-RateLimit-Remaining defers the next request instead of sleeping
+    a fixed delay before every call.
+    """
+
+    def __init__(self, max_per_window: Optional[int] = None,
+                 window: float = 60.0, low_remaining: int = 2):
+        self.max_per_window = max_per_window
+        self.window = window
+        self.low_remaining = low_remaining
+        self.remaining: Optional[int] = None
+        self._sent: deque = deque()
+        self._blocked_until = 0.0
+
+    def observe(self, headers) -> None:
+        """Record pacing hints from a response's headers."""
+        now = time.monotonic()
+        for name in ('Backoff', 'Retry-After'):
+            value = headers.get(name)
+            if value:
+                try:
+                    self._blocked_until = max(self._blocked_until, now + float(value))
+                except ValueError:
+                    logger.warning(f"Ignoring unparseable {name} header: {value}")
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            try:
+                self.remaining = int(remaining)
+            except ValueError:
+                pass
+
+    def pending(self) -> float:
+        """Seconds left on a server-requested pause."""
+        return max(0.0, self._blocked_until - time.monotonic())
+
+    def reserve(self) -> float:
+        """Claim a slot for the next request; return seconds to wait first."""
+        now = time.monotonic()
+        while self._sent and self._sent[0] <= now - self.window:
+            self._sent.popleft()
+
+        wait = self.pending()
+        window_full = self.max_per_window is not None and len(self._sent) >= self.max_per_window
+        running_low = self.remaining is not None and self.remaining <= self.low_remaining
+        if (window_full or running_low) and self._sent:
+            wait = max(wait, self._sent[0] + self.window - now)
+            self.remaining = None  # Refreshed by the next response
+
+        self._sent.append(now + wait)
+        return wait
+
+
+class BackpressureController:
+    """AIMD concurrency control for async Zotero requests.
+
+    The number of requests allowed in flight grows additively after
+    successes under the latency target and shrinks multiplicatively on
+    429/503 or transport errors, so batches settle just below the point
+    where Zotero starts pushing back.
+    """
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16,
+                 increase: float = 0.5, decrease: float = 0.5,
+                 latency_target: float = 2.0, sample_size: int = 20):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._latencies: deque = deque(maxlen=sample_size)
+        self._condition: Optional[asyncio.Condition] = None
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one in-flight request slot for the duration of the block."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        """Additive increase while recent latency stays under target."""
+        self._latencies.append(latency)
+        if sum(self._latencies) / len(self._latencies) <= self.latency_target:
+            self.limit = min(self.maximum, self.limit + self.increase)
+
+    def on_error(self) -> None:
+        """Multiplicative decrease after throttling or a failed request."""
+        self.limit = max(self.minimum, self.limit * self.decrease)
+
 
 class ZoteroAPIClient:
     """Unified Zotero Web API client for all DEVONzot operations."""
@@ -34,11 +144,16 @@ class ZoteroAPIClient:
                  api_version: str = "3",
                  rate_limit_delay: float = 0.0,
                  translation_server_url: str = None,
-                 translation_timeout: float = 30.0):
+                 translation_timeout: float = 30.0,
+                 pool_maxsize: int = 20,
+                 max_requests_per_minute: Optional[int] = None):
         self.api_key = api_key
         self.user_id = user_id
         self.api_base = api_base.rstrip('/')
-        self.rate_limit_delay = rate_limit_delay
+        self.rate_limit_delay = rate_limit_delay  # Base for exponential retry backoff
+        self.limiter = RateLimiter(max_per_window=max_requests_per_minute)
+        # In-flight requests never exceed the pooled connections (see adapter below)
+        self.backpressure = BackpressureController(maximum=min(16, pool_maxsize))
         self.translation_server_url = (
             translation_server_url or self.DEFAULT_TRANSLATION_SERVER
         ).rstrip('/')
@@ -49,7 +164,15 @@ class ZoteroAPIClient:
             'Authorization': f'Bearer {api_key}',
             'User-Agent': 'DEVONzot-Service/2.0',
         })
+        # Keep-alive pool large enough for concurrent callers of _asafe_request,
+        # which each hold a connection from a worker thread. pool_block makes a
+        # caller wait for a pooled connection instead of opening (and then
+        # discarding) an extra one with a fresh TLS handshake.
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.last_library_version: Optional[int] = None
+        self.attachments_version: Optional[int] = None  # For If-Modified-Since-Version polls
         self._attachment_cache: Optional[List[Dict]] = None
         self._collection_name_cache: Optional[Dict[str, str]] = None
         self.attachment_pairs = []  # Used by devonzot_add_new.py workflow
@@ -58,7 +181,38 @@ class ZoteroAPIClient:
 
     def _rate_limit(self, seconds=None):
         """Respect API rate limits."""
-        time.sleep(seconds if seconds is not None else self.rate_limit_delay)
+        time.sleep(seconds if seconds is not None else self.limiter.reserve())
+
+    async def _arate_limit(self, seconds=None):
+        """Respect API rate limits without blocking the event loop."""
+        await asyncio.sleep(seconds if seconds is not None else self.limiter.reserve())
+
+    def _response_wait(self, response, delay: float):
+        """Work out how long to wait after a response.
+
+        Backoff/Retry-After are handed to the limiter, which holds back the
+        next request. 429/503 responses are retried after Retry-After, or
+        with exponential backoff. Returns (wait_seconds, retry, next_delay).
+        """
+        self.limiter.observe(response.headers)
+
+        backoff = response.headers.get("Backoff")
+        if backoff:
+            logger.warning(f"Received Backoff header: pausing requests for {backoff} seconds")
+
+        # Handle Retry-After header (429/503)
+        if response.status_code in (429, 503):
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                logger.warning(f"Rate limited ({response.status_code}): waiting {retry_after} seconds")
+                wait = self.limiter.pending()
+            else:
+                logger.warning(f"Rate limited ({response.status_code}): exponential backoff {delay} seconds")
+                wait = max(delay, self.limiter.pending())
+                delay = min(delay * 2, 60)
+            return wait, True, delay
+
+        return 0.0, False, delay
 
     def _safe_request(self, method: str, url: str, **kwargs):
         """API request with rate limiting, backoff, and retry-after handling."""
@@ -73,22 +227,49 @@ class ZoteroAPIClient:
                 time.sleep(delay)
                 continue
 
-            # Handle Backoff header
-            backoff = response.headers.get("Backoff")
-            if backoff:
-                logger.warning(f"Received Backoff header: waiting {backoff} seconds")
-                time.sleep(float(backoff))
+            wait, retry, delay = self._response_wait(response, delay)
+            if wait:
+                time.sleep(wait)
+            if retry:
+                continue
+
+            return response
+
+        logger.error("Max retries reached for Zotero API request.")
+        return None
+
+    async def _asafe_request(self, method: str, url: str, **kwargs):
+        """Async _safe_request for callers running inside an event loop.
+
+        The HTTP call runs in a worker thread and every backoff wait is an
+        asyncio.sleep, so retries never stall other coroutines. Concurrent
+        callers share the client's BackpressureController.
+        """
+        max_retries = 5
+        delay = self.rate_limit_delay
+        for attempt in range(max_retries):
+            response = None
+            started = time.monotonic()
+            try:
+                async with self.backpressure.slot():
+                    response = await asyncio.to_thread(
+                        self.session.request, method, url, timeout=30, **kwargs
+                    )
+            except Exception as e:
+                logger.error(f"API request failed: {e}")
+                self.backpressure.on_error()
+                await asyncio.sleep(delay)
+                continue
 
-            # Handle Retry-After header (429/503)
             if response.status_code in (429, 503):
-                retry_after = response.headers.get("Retry-After")
-                if retry_after:
-                    logger.warning(f"Rate limited ({response.status_code}): waiting {retry_after} seconds")
-                    time.sleep(float(retry_after))
-                else:
-                    logger.warning(f"Rate limited ({response.status_code}): exponential backoff {delay} seconds")
-                    time.sleep(delay)
-                    delay = min(delay * 2, 60)
+                self.backpressure.on_error()
+            elif 200 <= response.status_code < 300:
+                self.backpressure.on_success(time.monotonic() - started)
+
+            wait, retry, delay = self._response_wait(response, delay)
+            if wait:
+                await asyncio.sleep(wait)
+            if retry:
                 continue
 
             return response
@@ -96,11 +277,23 @@ class ZoteroAPIClient:
         logger.error("Max retries reached for Zotero API request.")
         return None
 
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+
+    async def aclose(self):
+        """Close pooled connections from async code."""
+        await asyncio.to_thread(self.close)
+
     # ── Pagination ─────────────────────────────────────────────────
 
     def _get_all_items_paginated(self, params: Dict[str, Any]) -> List[Dict]:
         """Fetch all items matching params, handling pagination (max 100 per page)."""
-        all_items = []
+        return list(self._iter_items_paginated(params))
+
+    def _iter_items_paginated(self, params: Dict[str, Any]) -> Iterator[Dict]:
+        """Yield items matching params page by page; only one page is held at a time."""
+        fetched = 0
         start = 0
         limit = 100  # API max
 
@@ -119,17 +312,16 @@ class ZoteroAPIClient:
                 self.last_library_version = int(version)
 
             items = response.json()
-            all_items.extend(items)
+            fetched += len(items)
+            yield from items
 
             total_results = int(response.headers.get('Total-Results', len(items)))
-            logger.info(f"Fetched {len(all_items)}/{total_results} items...")
+            logger.info(f"Fetched {fetched}/{total_results} items...")
             if start + limit >= total_results:
                 break
 
             start += limit
 
-        return all_items
-
     def _get_all_collections_paginated(self) -> List[Dict]:
         """Fetch all collections, handling pagination."""
         all_collections = []
@@ -170,6 +362,11 @@ class ZoteroAPIClient:
             self._attachment_cache = self._get_all_items_paginated({'itemType': 'attachment'})
         return self._attachment_cache
 
+    def _cache_created_attachment(self, api_item: Dict) -> None:
+        """Add an attachment created this cycle to the cache, if it is loaded."""
+        if self._attachment_cache is not None:
+            self._attachment_cache.append(api_item)
+
     def get_collection_name_map(self) -> Dict[str, str]:
         """Get a mapping of collection keys to collection names. Cached per cycle."""
         if self._collection_name_cache is None:
@@ -196,7 +393,7 @@ class ZoteroAPIClient:
         year = None
         date_str = data.get('date', '') or ''
         if date_str:
-            year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
+            year_match = _RE_YEAR.search(date_str)
             if year_match:
                 year = int(year_match.group())
 
@@ -260,6 +457,17 @@ class ZoteroAPIClient:
 
         return self._api_item_to_zotero_item(response.json())
 
+    def get_items(self, item_keys: List[str]) -> Dict[str, 'ZoteroItem']:
+        """Get complete item metadata for many keys, 50 per request.
+
+        Returns {key: ZoteroItem}; keys the API did not return are absent.
+        """
+        unique_keys = list(dict.fromkeys(k for k in item_keys if k))
+        if not unique_keys:
+            return {}
+        items = (self._api_item_to_zotero_item(data) for data in self.get_items_by_keys(unique_keys))
+        return {item.key: item for item in items}
+
     def get_item_raw(self, item_key: str) -> Optional[Dict]:
         """Get raw API JSON for an item by key.
 
@@ -270,8 +478,15 @@ class ZoteroAPIClient:
         response = self._safe_request('GET', url)
         return response.json() if response and response.status_code == 200 else None
 
+    async def aget_item_raw(self, item_key: str) -> Optional[Dict]:
+        """Async get_item_raw for use from coroutines."""
+        await self._arate_limit()
+        url = f'{self.api_base}/users/{self.user_id}/items/{item_key}'
+        response = await self._asafe_request('GET', url)
+        return response.json() if response and response.status_code == 200 else None
+
     def get_items_needing_sync(self, since_version: int = None,
-                              processed_items: List[str] = None) -> List['ZoteroItem']:
+                              processed_items: Container[str] = None) -> List['ZoteroItem']:
         """Get items that need syncing to DEVONthink.
 
         Replaces ZoteroDatabase.get_items_needing_sync().
@@ -284,10 +499,28 @@ class ZoteroAPIClient:
             params['since'] = since_version
 
         all_items = self._get_all_items_paginated(params)
-        processed = set(processed_items or [])
+        return list(self._needing_sync(all_items, processed_items))
 
-        result = []
-        for api_item in all_items:
+    def iter_items_needing_sync(self, since_version: int = None,
+                                processed_items: Container[str] = None) -> Iterator['ZoteroItem']:
+        """Streaming get_items_needing_sync: items are yielded as each page arrives."""
+        params = {}
+        if since_version is not None:
+            params['since'] = since_version
+
+        return self._needing_sync(self._iter_items_paginated(params), processed_items)
+
+    def _needing_sync(self, api_items: Iterable[Dict],
+                      processed_items: Container[str] = None) -> Iterator['ZoteroItem']:
+        # Lists are copied to a set; sets and DB-backed stores are used as-is
+        if processed_items is None:
+            processed = frozenset()
+        elif isinstance(processed_items, (list, tuple)):
+            processed = set(processed_items)
+        else:
+            processed = processed_items
+
+        for api_item in api_items:
             data = api_item.get('data', {})
             item_type = data.get('itemType', '')
 
@@ -305,9 +538,7 @@ class ZoteroAPIClient:
             if url.startswith('x-devonthink-item://'):
                 continue
 
-            result.append(self._api_item_to_zotero_item(api_item))
-
-        return result
+            yield self._api_item_to_zotero_item(api_item)
 
     def get_stored_attachments(self) -> List['ZoteroAttachment']:
         """Get imported_file attachments in Zotero storage (linkMode=0 only).
@@ -383,6 +614,7 @@ class ZoteroAPIClient:
         url = f'{self.api_base}/users/{self.user_id}/items/{item_key}/file'
         try:
             response = self.session.get(url, timeout=120, stream=True, allow_redirects=True)
+            self.limiter.observe(response.headers)
             if response.status_code != 200:
                 logger.warning(
                     f"Zotero file download failed for {item_key}: "
@@ -586,7 +818,23 @@ class ZoteroAPIClient:
 
         Each item in attachments is a dict with parent_key, title, url.
         """
-        batch = [
+        self._rate_limit()
+        url_endpoint = f'{self.api_base}/users/{self.user_id}/items'
+        response = self._safe_request('POST', url_endpoint,
+                                      json=self._url_attachment_batch(attachments))
+        return self._url_attachment_results(attachments, response)
+
+    async def acreate_url_attachments(self, attachments: list) -> list:
+        """Async create_url_attachments for use from coroutines."""
+        await self._arate_limit()
+        url_endpoint = f'{self.api_base}/users/{self.user_id}/items'
+        response = await self._asafe_request('POST', url_endpoint,
+                                             json=self._url_attachment_batch(attachments))
+        return self._url_attachment_results(attachments, response)
+
+    def _url_attachment_batch(self, attachments: list) -> list:
+        """Build the POST body for a batch of linked_url attachments."""
+        return [
             {
                 "itemType": "attachment",
                 "parentItem": att["parent_key"],
@@ -597,15 +845,21 @@ class ZoteroAPIClient:
             }
             for att in attachments
         ]
-        url_endpoint = f'{self.api_base}/users/{self.user_id}/items'
-        response = self._safe_request('POST', url_endpoint, json=batch)
+
+    def _url_attachment_results(self, attachments: list, response) -> list:
+        """Pair each requested attachment with its created key (or None).
+
+        Created attachments are added to the cycle's attachment cache, so
+        lookups later in the cycle see them.
+        """
         results = []
         if response and response.status_code == 200:
             created_items = response.json()
-            for idx, att in enumerate(attachments):
+            for idx, (att, body) in enumerate(zip(attachments, self._url_attachment_batch(attachments))):
                 key = None
                 if created_items.get('successful') and str(idx) in created_items['successful']:
                     key = created_items['successful'][str(idx)]['key']
+                    self._cache_created_attachment({'key': key, 'data': {'key': key, **body}})
                 results.append({"input": att, "new_key": key})
         else:
             logger.error(f"Batch create failed: {response.status_code if response else 'No response'}")
@@ -616,19 +870,67 @@ class ZoteroAPIClient:
     def get_attachment_batch(self, start: int = 0, limit: int = 50) -> List[Dict]:
         """Get batch of file attachments (raw API response)."""
         self._rate_limit()
-        params = {
-            'itemType': 'attachment',
-            'limit': limit,
-            'start': start,
-            'format': 'json',
-        }
         url = f'{self.api_base}/users/{self.user_id}/items'
-        response = self.session.get(url, params=params)
+        response = self.session.get(url, params=self._attachment_batch_params(start, limit))
+        self.limiter.observe(response.headers)
         if response.status_code != 200:
             logger.error(f"API error: {response.status_code} - {response.text}")
             return []
         return response.json()
 
+    async def iter_attachments(self, page_size: int = 100, conditional: bool = False):
+        """Async generator over all attachments (raw API JSON), one page at a time.
+
+        Pages are fetched lazily, so a consumer that breaks early never
+        requests the rest of the library. With conditional=True the first
+        page is requested with If-Modified-Since-Version, and nothing is
+        yielded if the library has not changed since the last listing.
+        """
+        url = f'{self.api_base}/users/{self.user_id}/items'
+        start = 0
+        while True:
+            await self._arate_limit()
+            response = await self._asafe_request(
+                'GET', url,
+                params=self._attachment_batch_params(start, page_size),
+                headers=self._attachment_batch_headers(conditional and start == 0),
+            )
+            if response is not None and response.status_code == 304:
+                logger.info(f"Attachments unchanged since version {self.attachments_version}")
+                return
+            if not response or response.status_code != 200:
+                logger.error(f"Attachment pagination failed at start={start}")
+                return
+            if start == 0:
+                self._record_attachments_version(response)
+
+            items = response.json()
+            for item in items:
+                yield item
+
+            start += len(items)
+            total_results = int(response.headers.get('Total-Results', start))
+            if len(items) < page_size or start >= total_results:
+                return
+
+    def _attachment_batch_params(self, start: int, limit: int) -> Dict[str, Any]:
+        return {
+            'itemType': 'attachment',
+            'limit': limit,
+            'start': start,
+            'format': 'json',
+        }
+
+    def _attachment_batch_headers(self, conditional: bool) -> Dict[str, str]:
+        if conditional and self.attachments_version is not None:
+            return {'If-Modified-Since-Version': str(self.attachments_version)}
+        return {}
+
+    def _record_attachments_version(self, response) -> None:
+        version = response.headers.get('Last-Modified-Version')
+        if version:
+            self.attachments_version = int(version)
+
     # ── Incremental sync (streaming support) ──────────────────────
 
     def get_changed_item_versions(self, since_version: int,
@@ -692,6 +994,26 @@ class ZoteroAPIClient:
 
         return all_items
 
+    async def aget_items_by_keys(self, keys: List[str]) -> List[Dict]:
+        """Async get_items_by_keys for use from coroutines."""
+        all_items: List[Dict] = []
+        for i in range(0, len(keys), 50):
+            batch = keys[i:i + 50]
+            await self._arate_limit()
+            url = f'{self.api_base}/users/{self.user_id}/items'
+            params = {
+                'itemKey': ','.join(batch),
+                'format': 'json',
+            }
+            response = await self._asafe_request('GET', url, params=params)
+            if response and response.status_code == 200:
+                all_items.extend(response.json())
+            else:
+                status = response.status_code if response else 'No response'
+                logger.error(f"Failed to fetch items by keys (batch {i//50}): {status}")
+
+        return all_items
+
     def get_deleted_since(self, since_version: int) -> Dict[str, List[str]]:
         """Fetch keys of items deleted since a library version.
 
@@ -713,25 +1035,60 @@ class ZoteroAPIClient:
         return response.json()
 
     def delete_attachment(self, attachment_key: str, version: int,
-                         dry_run: bool = False) -> bool:
-        """Delete a single attachment item from Zotero."""
+                         dry_run: bool = False,
+                         refresh_on_conflict: bool = False) -> bool:
+        """Delete a single attachment item from Zotero.
+
+        With refresh_on_conflict=True a 412 (stale version) triggers one
+        re-fetch of the item and a retry at its current version.
+        """
         if dry_run:
-            logger.info(f"[DRY RUN] Would delete attachment {attachment_key}")
+            logger.info("[DRY RUN] Would delete attachment %s", attachment_key)
             return True
         self._rate_limit()
         url = f'{self.api_base}/users/{self.user_id}/items/{attachment_key}'
         headers = {'If-Unmodified-Since-Version': str(version)}
         response = self._safe_request('DELETE', url, headers=headers)
-
+        if refresh_on_conflict and response is not None and response.status_code == 412:
+            current = self.get_item_raw(attachment_key)
+            if current:
+                logger.info("Retrying delete of %s at version %s", attachment_key, current.get('version'))
+                self._rate_limit()
+                headers = {'If-Unmodified-Since-Version': str(current.get('version', 0))}
+                response = self._safe_request('DELETE', url, headers=headers)
+        return self._delete_succeeded(attachment_key, response)
+
+    async def adelete_attachment(self, attachment_key: str, version: int,
+                                 dry_run: bool = False,
+                                 refresh_on_conflict: bool = False) -> bool:
+        """Async delete_attachment for use from coroutines."""
+        if dry_run:
+            logger.info("[DRY RUN] Would delete attachment %s", attachment_key)
+            return True
+        await self._arate_limit()
+        url = f'{self.api_base}/users/{self.user_id}/items/{attachment_key}'
+        headers = {'If-Unmodified-Since-Version': str(version)}
+        response = await self._asafe_request('DELETE', url, headers=headers)
+        if refresh_on_conflict and response is not None and response.status_code == 412:
+            current = await self.aget_item_raw(attachment_key)
+            if current:
+                logger.info("Retrying delete of %s at version %s", attachment_key, current.get('version'))
+                await self._arate_limit()
+                headers = {'If-Unmodified-Since-Version': str(current.get('version', 0))}
+                response = await self._asafe_request('DELETE', url, headers=headers)
+        return self._delete_succeeded(attachment_key, response)
+
+    def _delete_succeeded(self, attachment_key: str, response) -> bool:
+        """Interpret the response to a single-item DELETE."""
         if response and response.status_code == 204:
-            logger.info(f"Deleted attachment item: {attachment_key}")
+            logger.info("Deleted attachment item: %s", attachment_key)
             return True
         elif response and response.status_code == 412:
-            logger.warning(f"Version conflict deleting attachment {attachment_key}")
+            logger.warning("Version conflict deleting attachment %s", attachment_key)
             return False
         else:
             status = response.status_code if response else 'No response'
-            logger.error(f"Failed to delete attachment {attachment_key}: {status}")
+            logger.error("Failed to delete attachment %s: %s", attachment_key, status)
             return False
 
     def delete_items_batch(self, item_keys: List[str], library_version: int,
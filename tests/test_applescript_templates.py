@@ -0,0 +1,60 @@
+"""
+Tests for the AppleScripts DEVONthinkInterface builds from its
+precompiled templates.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import DEVONthinkInterface, ZoteroItem
+
+
+class TestAppleScriptTemplates:
+    """Test scripts built from the precompiled templates."""
+
+    def test_update_metadata_omits_empty_fields(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.is_devonthink_running = Mock(return_value=True)
+        dt.execute_script = Mock(return_value="SUCCESS")
+        item = ZoteroItem(
+            key='KEY1', title='T', creators=[{'firstName': 'Ann', 'lastName': 'Lee'}],
+            item_type='book', publication='Pub "Q"', date=None, year=None, doi=None,
+            url=None, abstract=None, tags=['econ'], collections=[],
+            date_added='', date_modified='',
+        )
+
+        assert dt.update_item_metadata('UUID-1', item) is True
+
+        script = dt.execute_script.call_args[0][0]
+        assert 'set comment of theRecord to "Zotero Key: KEY1\\nAuthors: Ann Lee\\nPublication: Pub \\"Q\\""' in script
+        assert 'DOI' not in script
+        assert 'if "' not in script
+        assert 'set tags of theRecord to {"econ", "book"}' in script
+
+    def test_search_script_targets_database(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.execute_script = Mock(return_value="UUID-9")
+
+        assert dt._search_database_for_filename('Smith - Market Power', 'Books') == 'UUID-9'
+        script = dt.execute_script.call_args[0][0]
+        assert 'tell database "Books"' in script
+        assert 'search "name:Smith name:Market name:Power"' in script
+
+    def test_all_databases_searched_in_one_script(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.execute_script = Mock(return_value="Books\tUUID-9")
+
+        assert dt._search_all_databases('Smith - Market Power') == 'UUID-9'
+        dt.execute_script.assert_called_once()
+        script = dt.execute_script.call_args[0][0]
+        assert 'set databaseNames to {"Global Inbox", "Professional", "Articles", "Books", "Research"}' in script
+        assert 'search "name:Smith name:Market name:Power"' in script
+
+    def test_all_databases_miss_returns_none(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.execute_script = Mock(return_value="")
+
+        assert dt._search_all_databases('Smith - Market Power') is None
@@ -0,0 +1,207 @@
+"""
+Tests for ConflictDetector duplicate detection.
+"""
+
+import random
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import ConflictDetector, FilenameCollision, ZoteroAttachment, ZoteroItem
+
+
+def make_item(key, title):
+    return ZoteroItem(
+        key=key, title=title, creators=[], item_type='book', publication=None,
+        date=None, year=None, doi=None, url=None, abstract=None, tags=[],
+        collections=[], date_added='', date_modified='',
+    )
+
+
+def brute_force_duplicates(detector, items):
+    return [
+        (item1.key, item2.key)
+        for i, item1 in enumerate(items)
+        for item2 in items[i + 1:]
+        if detector._are_likely_duplicates(item1, item2)
+    ]
+
+
+class TestDetectDuplicates:
+    """Test candidate filtering finds exactly the pairs a full comparison would."""
+
+    def _detect(self, detector, items):
+        conflicts = {'duplicates': []}
+        detector._detect_duplicates(conflicts, items)
+        return [(d.item1_key, d.item2_key) for d in conflicts['duplicates']]
+
+    def test_matches_full_comparison(self):
+        rng = random.Random(7)
+        vocabulary = [f'w{n}' for n in range(40)] + ['the', 'of', 'and']
+        items = []
+        for n in range(300):
+            words = rng.sample(vocabulary, rng.randint(1, 10))
+            items.append(make_item(f'K{n}', ' '.join(words)))
+            if rng.random() < 0.3:
+                # Near-copy: same words, maybe one extra
+                extra = words + rng.sample(vocabulary, rng.randint(0, 1))
+                items.append(make_item(f'K{n}b', ' '.join(extra).upper()))
+        detector = ConflictDetector(Mock(), Mock())
+
+        found = self._detect(detector, items)
+
+        assert found == brute_force_duplicates(detector, items)
+        assert found
+
+    def test_untitled_items_are_ignored(self):
+        detector = ConflictDetector(Mock(), Mock())
+        items = [make_item('A', ''), make_item('B', None), make_item('C', 'Market Power')]
+
+        assert self._detect(detector, items) == []
+
+    def test_items_fetched_once_for_all_checks(self):
+        zotero_api = Mock()
+        zotero_api.iter_items_needing_sync.return_value = iter([
+            make_item('A', 'Market Power'), make_item('B', 'market power'),
+        ])
+        zotero_api.get_zotfile_symlinks.return_value = []
+        detector = ConflictDetector(zotero_api, Mock())
+
+        conflicts = detector.detect_conflicts()
+
+        zotero_api.iter_items_needing_sync.assert_called_once()
+        assert [(d.item1_key, d.item2_key) for d in conflicts['duplicates']] == [('A', 'B')]
+
+
+class TestAreLikelyDuplicates:
+    """Test the Jaccard check, including the size bound that skips set work."""
+
+    def setup_method(self):
+        self.detector = ConflictDetector(Mock(), Mock())
+
+    def test_identical_titles_ignore_case(self):
+        assert self.detector._are_likely_duplicates(
+            make_item('A', 'Market Power and Wages'), make_item('B', 'market power AND wages')
+        )
+
+    def test_similarity_must_exceed_threshold(self):
+        # 4 shared words of 5 total: Jaccard is exactly 0.8, which is not enough
+        assert not self.detector._are_likely_duplicates(
+            make_item('A', 'a b c d'), make_item('B', 'a b c d e')
+        )
+        # 5 of 6 words shared: 0.833
+        assert self.detector._are_likely_duplicates(
+            make_item('A', 'a b c d e'), make_item('B', 'a b c d e f')
+        )
+
+    def test_size_mismatch_rejected(self):
+        assert not self.detector._are_likely_duplicates(
+            make_item('A', 'a b'), make_item('B', 'a b c d e f g h')
+        )
+
+    def test_matches_set_jaccard(self):
+        rng = random.Random(3)
+        vocabulary = [f'w{n}' for n in range(12)]
+        for _ in range(500):
+            words1 = set(rng.sample(vocabulary, rng.randint(1, 8)))
+            words2 = set(rng.sample(vocabulary, rng.randint(1, 8)))
+            expected = len(words1 & words2) / len(words1 | words2) > 0.8
+            assert self.detector._are_likely_duplicates(
+                make_item('A', ' '.join(words1)), make_item('B', ' '.join(words2))
+            ) is expected
+
+    def test_title_words_cached_on_item(self):
+        item = make_item('A', 'Market Power')
+        assert item.title_words == frozenset({'market', 'power'})
+        assert item.title_words is item.title_words
+        assert make_item('B', '').title_words == frozenset()
+
+
+class TestScanItems:
+    """Test the fused item pass reports what the separate detectors would."""
+
+    def test_single_pass_matches_separate_detectors(self):
+        items = [
+            make_item('A', 'Market Power'),
+            make_item('B', 'market power'),
+            make_item('C', 'Bad: title?'),
+            make_item('D', ''),
+            make_item('E', 'Market Power'),
+        ]
+        detector = ConflictDetector(Mock(), Mock())
+        fused = {'filename_collisions': [], 'duplicates': [], 'problematic_items': []}
+        separate = {'filename_collisions': [], 'duplicates': [], 'problematic_items': []}
+
+        detector._scan_items(fused, items)
+        detector._detect_filename_collisions(separate, items)
+        detector._detect_duplicates(separate, items)
+        detector._detect_problematic_metadata(separate, items)
+
+        assert fused == separate
+        assert fused['filename_collisions'] and fused['duplicates'] and fused['problematic_items']
+
+
+class TestUnmatchedSymlinkSample:
+    """Test the dry-run symlink check samples instead of taking a prefix."""
+
+    def _symlinks(self, count):
+        return [
+            ZoteroAttachment(key=f'L{i}', parent_key=f'P{i}', link_mode=2, content_type='application/pdf',
+                             path=f'/zotfile/L{i}.pdf', storage_hash=None, version=1, filename=f'L{i}.pdf')
+            for i in range(count)
+        ]
+
+    def test_sample_is_capped_and_drawn_from_whole_list(self):
+        zotero_api = Mock()
+        zotero_api.get_zotfile_symlinks.return_value = self._symlinks(200)
+        detector = ConflictDetector(zotero_api, Mock(), sample_size=10)
+        conflicts = {'unmatched_files': []}
+
+        with patch('devonzot_service.random.sample', wraps=random.sample) as sample:
+            detector._detect_unmatched_symlinks(conflicts)
+
+        assert sample.call_args[0][1] == 10
+        assert len(conflicts['unmatched_files']) == 2
+        assert all(u.filename == f"{u.attachment_key}.pdf" for u in conflicts['unmatched_files'])
+
+    def test_short_list_is_checked_in_full(self):
+        zotero_api = Mock()
+        zotero_api.get_zotfile_symlinks.return_value = self._symlinks(3)
+        detector = ConflictDetector(zotero_api, Mock())
+        conflicts = {'unmatched_files': []}
+
+        detector._detect_unmatched_symlinks(conflicts)
+
+        assert len(conflicts['unmatched_files']) == 1
+
+
+class TestConflictRecords:
+    """Test conflicts are slotted records that convert back to the saved dict shape."""
+
+    def test_collision_record(self):
+        detector = ConflictDetector(Mock(), Mock())
+        conflicts = {'filename_collisions': []}
+
+        detector._detect_filename_collisions(conflicts, [make_item('A', 'Market Power'), make_item('B', 'Market Power')])
+
+        collision = conflicts['filename_collisions'][0]
+        assert isinstance(collision, FilenameCollision)
+        assert not hasattr(collision, '__dict__')
+        assert asdict(collision) == {
+            'filename': collision.filename, 'item1_key': 'A', 'item2_key': 'B',
+            'title1': 'Market Power', 'title2': 'Market Power',
+        }
+
+    def test_three_way_collision_reports_every_pair(self):
+        detector = ConflictDetector(Mock(), Mock())
+        conflicts = {'filename_collisions': []}
+        items = [make_item(key, 'Market Power') for key in 'ABC'] + [make_item('D', 'Monopoly')]
+
+        detector._detect_filename_collisions(conflicts, items)
+
+        assert [(c.item1_key, c.item2_key) for c in conflicts['filename_collisions']] == [
+            ('A', 'B'), ('A', 'C'), ('B', 'C'),
+        ]
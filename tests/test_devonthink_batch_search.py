@@ -0,0 +1,46 @@
+"""
+Tests for DEVONthinkInterface.batch_search_items, which resolves many
+filenames in a single AppleScript call.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import DEVONthinkInterface
+
+
+class TestBatchSearchItems:
+    """Test batch_search_items resolves all filenames in one AppleScript call."""
+
+    async def test_single_script_for_all_filenames(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.is_devonthink_running = Mock(return_value=True)
+        dt.execute_script = Mock(return_value="1\tUUID-A\n3\tUUID-C")
+
+        with patch('devonzot_service.DEVONTHINK_WAIT_TIME', 0):
+            results = await dt.batch_search_items(
+                ['Smith - Market Power', 'Jones - Price Theory', 'Lee - "Quoted" Title']
+            )
+
+        assert results == {
+            'Smith - Market Power': 'UUID-A',
+            'Jones - Price Theory': None,
+            'Lee - "Quoted" Title': 'UUID-C',
+        }
+        dt.execute_script.assert_called_once()
+        script = dt.execute_script.call_args[0][0]
+        assert '"name:Smith name:Market name:Power"' in script
+        assert '"Research"' in script
+
+    async def test_devonthink_not_running(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.is_devonthink_running = Mock(return_value=False)
+        dt.execute_script = Mock()
+
+        results = await dt.batch_search_items(['a file'])
+
+        assert results == {'a file': None}
+        dt.execute_script.assert_not_called()
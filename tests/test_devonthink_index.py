@@ -0,0 +1,63 @@
+"""
+Tests for DevonthinkIndex, which looks records up by name in DEVONthink's
+Metadata.db before falling back to AppleScript.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import DEVONthinkInterface, DevonthinkIndex
+
+
+def make_index(root, database, rows, columns=('uuid', 'name')):
+    package = root / f'{database}.dtBase2'
+    package.mkdir(parents=True)
+    conn = sqlite3.connect(package / 'Metadata.db')
+    conn.execute(f"CREATE TABLE records ({', '.join(columns)})")
+    conn.executemany(f"INSERT INTO records VALUES ({', '.join('?' * len(columns))})", rows)
+    conn.commit()
+    conn.close()
+
+
+class TestDevonthinkIndex:
+    """Test direct name lookups in DEVONthink's Metadata.db with AppleScript fallback."""
+
+    def test_lookup_by_exact_name(self, tmp_path):
+        make_index(tmp_path, 'Books', [('UUID-7', 'Smith - Market Power')])
+        index = DevonthinkIndex(str(tmp_path))
+
+        assert index.lookup('Books', 'Smith - Market Power') == 'UUID-7'
+        assert index.lookup('Books', 'Other') is None
+        index.close()
+
+    def test_global_inbox_maps_to_inbox_package(self, tmp_path):
+        make_index(tmp_path, 'Inbox', [('UUID-1', 'Paper')])
+
+        assert DevonthinkIndex(str(tmp_path)).lookup('Global Inbox', 'Paper') == 'UUID-1'
+
+    def test_unexpected_schema_is_skipped(self, tmp_path):
+        make_index(tmp_path, 'Books', [('UUID-7', 'Paper')], columns=('id', 'title'))
+
+        assert DevonthinkIndex(str(tmp_path)).lookup('Books', 'Paper') is None
+
+    def test_search_uses_index_before_applescript(self, tmp_path):
+        make_index(tmp_path, 'Books', [('UUID-7', 'Smith - Market Power')])
+        dt = DEVONthinkInterface(persistent=False)
+        dt.index = DevonthinkIndex(str(tmp_path))
+        dt.execute_script = Mock(return_value='')
+
+        assert dt._search_all_databases('Smith - Market Power') == 'UUID-7'
+        assert dt._search_database_for_filename('Smith - Market Power', 'Books') == 'UUID-7'
+        dt.execute_script.assert_not_called()
+
+    def test_missing_index_falls_back_to_applescript(self, tmp_path):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.index = DevonthinkIndex(str(tmp_path))
+        dt.execute_script = Mock(return_value='UUID-9')
+
+        assert dt._search_database_for_filename('Smith - Market Power', 'Books') == 'UUID-9'
+        dt.execute_script.assert_called_once()
@@ -0,0 +1,54 @@
+"""
+Tests for the short-lived cache of DEVONthinkInterface.is_devonthink_running.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import DEVONthinkInterface
+
+
+class TestDevonthinkRunningCache:
+    """Test the DEVONthink running check is reused for a short TTL."""
+
+    def test_check_reused_within_ttl(self):
+        dt = DEVONthinkInterface(persistent=False)
+        with patch('devonzot_service.subprocess.run', return_value=Mock(returncode=0)) as mock_run:
+            assert dt.is_devonthink_running() is True
+            assert dt.is_devonthink_running() is True
+
+        assert mock_run.call_count == 1
+
+    def test_check_repeated_after_ttl(self):
+        dt = DEVONthinkInterface(persistent=False)
+        with patch('devonzot_service.subprocess.run', return_value=Mock(returncode=1)) as mock_run, \
+                patch('devonzot_service.time.monotonic', side_effect=[100.0, 103.0]):
+            assert dt.is_devonthink_running() is False
+            assert dt.is_devonthink_running() is False
+
+        assert mock_run.call_count == 2
+
+    def test_not_running_error_invalidates_cache(self):
+        dt = DEVONthinkInterface(persistent=False)
+        with patch('devonzot_service.subprocess.run') as mock_run:
+            mock_run.side_effect = [
+                Mock(returncode=0),
+                Mock(returncode=1, stdout='', stderr='DEVONthink got an error: Application is not running'),
+                Mock(returncode=1),
+            ]
+            assert dt.is_devonthink_running() is True
+            with pytest.raises(Exception, match='not running'):
+                dt.execute_script('tell application "DEVONthink" to count databases')
+            assert dt.is_devonthink_running() is False
+
+    def test_wait_bypasses_cache(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt._dt_running_ts, dt._dt_running_val = float('inf'), False
+        with patch('devonzot_service.subprocess.run', return_value=Mock(returncode=0)), \
+                patch('devonzot_service.time.sleep'):
+            assert dt.wait_for_devonthink(max_wait=1) is True
@@ -0,0 +1,62 @@
+"""
+Tests for FilenameGenerator's per-item filename cache.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import FilenameGenerator, ZoteroItem
+
+
+def make_item(title='Market Power', date_modified='2024-01-01T00:00:00Z', key='KEY1', version=0):
+    return ZoteroItem(
+        key=key, title=title, creators=[{'firstName': 'Ann', 'lastName': 'Lee'}],
+        item_type='journalArticle', publication=None, date='2020', year=2020, doi=None,
+        url=None, abstract=None, tags=[], collections=[],
+        date_added='', date_modified=date_modified, version=version,
+    )
+
+
+class TestFilenameCache:
+    """Test generated filenames are reused until the item changes."""
+
+    def setup_method(self):
+        FilenameGenerator._filename_cache.clear()
+
+    def test_unchanged_item_hits_cache(self):
+        with patch.object(FilenameGenerator, '_build_filename', wraps=FilenameGenerator._build_filename) as build:
+            first = FilenameGenerator.generate_filename(make_item())
+            second = FilenameGenerator.generate_filename(make_item())
+
+        assert first == second == 'Lee, Ann - Market Power - 2020 - Journal Article'
+        assert build.call_count == 1
+
+    def test_modified_item_is_regenerated(self):
+        FilenameGenerator.generate_filename(make_item())
+        renamed = make_item(title='Monopoly', date_modified='2024-02-01T00:00:00Z')
+
+        assert FilenameGenerator.generate_filename(renamed) == 'Lee, Ann - Monopoly - 2020 - Journal Article'
+
+    def test_items_without_date_modified_or_version_are_not_cached(self):
+        FilenameGenerator.generate_filename(make_item(date_modified=''))
+
+        assert not FilenameGenerator._filename_cache
+
+    def test_version_alone_keys_the_cache(self):
+        FilenameGenerator.generate_filename(make_item(date_modified='', version=7))
+        renamed = make_item(title='Monopoly', date_modified='', version=8)
+
+        assert len(FilenameGenerator._filename_cache) == 1
+        assert FilenameGenerator.generate_filename(renamed) == 'Lee, Ann - Monopoly - 2020 - Journal Article'
+
+    def test_cache_evicts_least_recently_used(self):
+        with patch.object(FilenameGenerator, 'FILENAME_CACHE_SIZE', 2):
+            FilenameGenerator.generate_filename(make_item(key='A'))
+            FilenameGenerator.generate_filename(make_item(key='B'))
+            FilenameGenerator.generate_filename(make_item(key='A'))
+            FilenameGenerator.generate_filename(make_item(key='C'))
+
+        assert [key for key, _, _ in FilenameGenerator._filename_cache] == ['A', 'C']
@@ -0,0 +1,116 @@
+"""
+Tests for InboxWatcher, which replaces fixed DEVONthink waits with
+Inbox import events, and for how DEVONthinkInterface uses it.
+"""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, AsyncMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import DEVONthinkInterface, InboxWatcher
+
+
+def fs_event(event_type, path, is_directory=False):
+    return SimpleNamespace(event_type=event_type, src_path=path, is_directory=is_directory)
+
+
+class TestInboxWatcher:
+    """Test event matching and waiting without a real observer."""
+
+    def test_moved_file_releases_waiter(self):
+        watcher = InboxWatcher('/inbox')
+        watcher.expect('Smith - Title.pdf', 'Smith - Title')
+
+        threading.Timer(0.05, watcher.dispatch,
+                        [fs_event('moved', '/inbox/Smith - Title.pdf')]).start()
+
+        assert watcher.wait('Smith - Title', timeout=2) is True
+        assert not watcher.is_pending('Smith - Title.pdf')
+
+    def test_event_before_wait_is_not_lost(self):
+        watcher = InboxWatcher('/inbox')
+        watcher.expect('note.md')
+        watcher.dispatch(fs_event('deleted', '/inbox/note.md'))
+
+        assert watcher.wait('note.md', timeout=0) is True
+
+    def test_ignores_created_and_unrelated_events(self):
+        watcher = InboxWatcher('/inbox')
+        watcher.expect('note.md')
+        watcher.dispatch(fs_event('created', '/inbox/note.md'))
+        watcher.dispatch(fs_event('moved', '/inbox/other.md'))
+
+        assert watcher.wait('note.md', timeout=0.05) is False
+
+    def test_unexpected_name_does_not_block(self):
+        assert InboxWatcher('/inbox').wait('never-copied.pdf', timeout=5) is False
+
+
+class TestFindAfterInboxEvent:
+    """Test the DEVONthink search skips the fixed wait once the file is imported."""
+
+    def test_sync_search_skips_sleep_after_event(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.is_devonthink_running = Mock(return_value=True)
+        dt._search_all_databases = Mock(return_value='UUID-1')
+        dt.inbox_watcher.expect('Paper')
+        dt.inbox_watcher.dispatch(fs_event('moved', '/inbox/Paper.pdf'))
+
+        with patch('devonzot_service.time.sleep') as mock_sleep:
+            assert dt.find_item_by_filename_after_wait('Paper') == 'UUID-1'
+
+        mock_sleep.assert_not_called()
+
+    async def test_async_search_falls_back_to_fixed_wait(self):
+        dt = DEVONthinkInterface(persistent=False)
+        dt.is_devonthink_running = Mock(return_value=True)
+        dt._search_all_databases = Mock(return_value=None)
+
+        with patch('devonzot_service.asyncio.sleep', new=AsyncMock()) as mock_sleep:
+            assert await dt.find_item_by_filename_after_wait_async('Unwatched') is None
+
+        mock_sleep.assert_awaited_once()
+
+
+class TestCopyFileToInboxAsync:
+    """Test the async Inbox copy clones on macOS and copies elsewhere."""
+
+    async def test_copies_off_loop_when_not_darwin(self, tmp_path):
+        source = tmp_path / 'source.pdf'
+        source.write_bytes(b'%PDF')
+        inbox = tmp_path / 'Inbox'
+        inbox.mkdir()
+        dt = DEVONthinkInterface(persistent=False)
+        dt._clone_file_async = AsyncMock(return_value=True)
+
+        with patch('devonzot_service.DEVONTHINK_INBOX_PATH', str(inbox)), \
+                patch('devonzot_service.sys.platform', 'linux'):
+            assert await dt.copy_file_to_inbox_async(str(source), 'Paper') is True
+
+        assert (inbox / 'Paper.pdf').read_bytes() == b'%PDF'
+        dt._clone_file_async.assert_not_awaited()
+
+    async def test_failed_clone_falls_back_to_copy(self, tmp_path):
+        source = tmp_path / 'source.pdf'
+        source.write_bytes(b'%PDF')
+        inbox = tmp_path / 'Inbox'
+        inbox.mkdir()
+        dt = DEVONthinkInterface(persistent=False)
+        dt._clone_file_async = AsyncMock(return_value=False)
+
+        with patch('devonzot_service.DEVONTHINK_INBOX_PATH', str(inbox)), \
+                patch('devonzot_service.sys.platform', 'darwin'):
+            assert await dt.copy_file_to_inbox_async(str(source), 'Paper') is True
+
+        dt._clone_file_async.assert_awaited_once_with(source, inbox / 'Paper.pdf')
+        assert (inbox / 'Paper.pdf').read_bytes() == b'%PDF'
+
+    async def test_missing_source_fails(self, tmp_path):
+        dt = DEVONthinkInterface(persistent=False)
+
+        with patch('devonzot_service.DEVONTHINK_INBOX_PATH', str(tmp_path)):
+            assert await dt.copy_file_to_inbox_async(str(tmp_path / 'nope.pdf'), 'Paper') is False
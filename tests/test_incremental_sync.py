@@ -185,6 +185,7 @@ def mock_service(tmp_path):
         processed_items: List[str] = field(default_factory=list)
 
     service.state = MockState()
+    service.processed_items = set()
     service._save_state = Mock()
     service.running = True
     service.restart_count = 0
@@ -256,7 +257,7 @@ class TestRunIncrementalSyncAsync:
 
     async def test_skips_already_processed(self, mock_service):
         """Items in processed_items are skipped."""
-        mock_service.state.processed_items = ['PARENT1']
+        mock_service.processed_items = {'PARENT1'}
         mock_service.zotero_api.get_changed_item_versions = Mock(
             return_value={'ATT1': 52}
         )
@@ -319,7 +320,7 @@ class TestRunIncrementalSyncAsync:
 
     async def test_removes_deleted_from_processed(self, mock_service):
         """Deleted item keys are removed from processed_items."""
-        mock_service.state.processed_items = ['KEEP1', 'DEL1', 'KEEP2']
+        mock_service.processed_items = {'KEEP1', 'DEL1', 'KEEP2'}
         mock_service.zotero_api.get_changed_item_versions = Mock(return_value={})
         mock_service.zotero_api.last_library_version = 55
         mock_service.zotero_api.get_deleted_since = Mock(
@@ -339,9 +340,9 @@ class TestRunIncrementalSyncAsync:
         result = await DEVONzotService.run_incremental_sync_async(mock_service)
 
         assert result is True
-        assert 'DEL1' not in mock_service.state.processed_items
-        assert 'KEEP1' in mock_service.state.processed_items
-        assert 'KEEP2' in mock_service.state.processed_items
+        assert 'DEL1' not in mock_service.processed_items
+        assert 'KEEP1' in mock_service.processed_items
+        assert 'KEEP2' in mock_service.processed_items
 
     async def test_dry_run_does_not_save_state(self, mock_service):
         """Dry run mode does not persist state changes."""
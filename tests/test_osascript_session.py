@@ -0,0 +1,97 @@
+"""
+Tests for the persistent osascript session used by DEVONthinkInterface.
+
+A small Python process stands in for the JXA runner and speaks the same
+line protocol: base64 script in, "OK|ERR <base64 text>" out.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from devonzot_service import DEVONthinkInterface, OsascriptSession
+
+
+# Echoes each script upper-cased; "fail" scripts error, "hang" scripts never answer
+FAKE_RUNNER = r"""
+import base64, sys, time
+for line in sys.stdin.buffer:
+    script = base64.b64decode(line.strip()).decode()
+    if script == 'hang':
+        time.sleep(60)
+    status = b'ERR' if script == 'fail' else b'OK'
+    sys.stdout.buffer.write(status + b' ' + base64.b64encode(script.upper().encode()) + b'\n')
+    sys.stdout.buffer.flush()
+"""
+
+
+@pytest.fixture
+def session():
+    s = OsascriptSession(command=[sys.executable, '-c', FAKE_RUNNER])
+    yield s
+    s.close()
+
+
+class TestOsascriptSession:
+    """Test the stdin/stdout protocol and process reuse."""
+
+    def test_runs_scripts_on_one_process(self, session):
+        assert session.run('hello') == (True, 'HELLO')
+        pid = session._process.pid
+        assert session.run('multi\nline') == (True, 'MULTI\nLINE')
+        assert session._process.pid == pid
+
+    def test_reports_script_errors(self, session):
+        assert session.run('fail') == (False, 'FAIL')
+        # The process stays usable after a script error
+        assert session.run('ok') == (True, 'OK')
+
+    def test_timeout_kills_and_respawns(self, session):
+        with pytest.raises(subprocess.TimeoutExpired):
+            session.run('hang', timeout=0.5)
+        assert session._process is None
+
+        assert session.run('again') == (True, 'AGAIN')
+
+    def test_respawns_after_process_exit(self, session):
+        session.run('first')
+        session._process.kill()
+        session._process.wait()
+
+        assert session.run('second') == (True, 'SECOND')
+
+
+class TestExecuteScriptBackends:
+    """Test DEVONthinkInterface picks the persistent session or one-shot osascript."""
+
+    def test_uses_persistent_session(self):
+        dt = DEVONthinkInterface()
+        dt.osascript = Mock()
+        dt.osascript.run.return_value = (True, 'uuid-1')
+
+        assert dt.execute_script('return 1') == 'uuid-1'
+        dt.osascript.run.assert_called_once_with('return 1', 30)
+
+    def test_session_error_is_raised(self):
+        dt = DEVONthinkInterface()
+        dt.osascript = Mock()
+        dt.osascript.run.return_value = (False, 'Database not found')
+
+        with pytest.raises(Exception, match="not found"):
+            dt.execute_script('return 1')
+
+    def test_falls_back_when_osascript_cannot_start(self):
+        dt = DEVONthinkInterface()
+        dt.osascript = Mock()
+        dt.osascript.run.side_effect = FileNotFoundError('osascript')
+
+        with patch('devonzot_service.subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout='done\n', stderr='')
+            assert dt.execute_script('return 1') == 'done'
+
+        assert dt.osascript is None
@@ -15,11 +15,14 @@ Mocks all external dependencies (API, DEVONthink, filesystem).
 """
 
 import pytest
-from unittest.mock import Mock, MagicMock, patch, call
+from unittest.mock import AsyncMock, Mock, MagicMock, patch, call
 from pathlib import Path
 from dataclasses import dataclass
 import sys
+import asyncio
+import threading
 import json
+import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
@@ -66,6 +69,7 @@ def mock_zotero_client():
     client.create_url_attachments = Mock(return_value=[])
     client._get_all_attachments_cached = Mock(return_value=[])
     client.get_items_by_keys = Mock(return_value=[])
+    client.get_items = Mock(return_value={})
 
     return client
 
@@ -82,6 +86,7 @@ def mock_devonthink():
     dt.update_item_metadata = Mock(return_value=True)
     dt.rename_item = Mock(return_value=True)
     dt._search_database_for_filename = Mock(return_value=None)
+    dt._search_all_databases = Mock(return_value=None)
     
     return dt
 
@@ -95,6 +100,7 @@ def service_with_mocks(mock_env, mock_zotero_client, mock_devonthink, tmp_path,
     with patch('devonzot_service.ZoteroAPIClient') as MockZoteroAPI, \
          patch('devonzot_service.DEVONthinkInterface') as MockDEVONthink, \
          patch('devonzot_service.STATE_FILE', state_file), \
+         patch('devonzot_service.PROCESSED_ITEMS_DB', tmp_path / "processed_items.db"), \
          patch('devonzot_service.DEVONZOT_PATH', tmp_path), \
          patch('devonzot_service.ConflictDetector'):
         
@@ -244,8 +250,8 @@ class TestFindOrAdoptInDevonthink:
     
     def test_returns_uuid_when_found_by_generated_name(self, service_with_mocks, mock_devonthink):
         """Returns UUID when item found by generated name in first search."""
-        mock_devonthink._search_database_for_filename = Mock(side_effect=[
-            'found-uuid-12345',  # First call (generated name in Global Inbox)
+        mock_devonthink._search_all_databases = Mock(side_effect=[
+            'found-uuid-12345',  # First call (generated name)
         ])
         
         result = service_with_mocks._find_or_adopt_in_devonthink(
@@ -255,21 +261,18 @@ class TestFindOrAdoptInDevonthink:
         )
         
         assert result == 'found-uuid-12345'
-        # Should search for generated name
-        assert mock_devonthink._search_database_for_filename.call_count >= 1
+        # Should search for generated name only
+        mock_devonthink._search_all_databases.assert_called_once_with(
+            'Smith, John - Test Paper - 2024 - Journal Article'
+        )
     
     def test_returns_uuid_and_renames_when_found_by_zotero_name(self, service_with_mocks, mock_devonthink):
         """Returns UUID and renames when found by Zotero name (second search)."""
         # First search for generated name returns None in all databases
         # Second search for Zotero name returns UUID
-        mock_devonthink._search_database_for_filename = Mock(side_effect=[
-            None,  # Generated name - Global Inbox
-            None,  # Generated name - Professional
-            None,  # Generated name - Articles
-            None,  # Generated name - Books
-            None,  # Generated name - Research
-            None,  # Zotero name - Global Inbox
-            'zotero-found-uuid',  # Zotero name - Professional
+        mock_devonthink._search_all_databases = Mock(side_effect=[
+            None,  # Generated name - all databases
+            'zotero-found-uuid',  # Zotero name
         ])
         
         result = service_with_mocks._find_or_adopt_in_devonthink(
@@ -284,7 +287,7 @@ class TestFindOrAdoptInDevonthink:
     
     def test_returns_none_when_not_found_by_either_name(self, service_with_mocks, mock_devonthink):
         """Returns None when not found by either name."""
-        mock_devonthink._search_database_for_filename = Mock(return_value=None)
+        mock_devonthink._search_all_databases = Mock(return_value=None)
         
         result = service_with_mocks._find_or_adopt_in_devonthink(
             generated_name='Generated - Name - 2024',
@@ -297,7 +300,7 @@ class TestFindOrAdoptInDevonthink:
     
     def test_skips_zotero_name_search_if_same_as_generated(self, service_with_mocks, mock_devonthink):
         """Skips Zotero name search if same as generated name."""
-        mock_devonthink._search_database_for_filename = Mock(return_value=None)
+        mock_devonthink._search_all_databases = Mock(return_value=None)
         
         result = service_with_mocks._find_or_adopt_in_devonthink(
             generated_name='Same - Name',
@@ -307,13 +310,12 @@ class TestFindOrAdoptInDevonthink:
         
         assert result is None
         # Should only search for generated name, not zotero name
-        call_count = mock_devonthink._search_database_for_filename.call_count
-        # 5 databases for generated name, 0 for zotero name
-        assert call_count == 5
+        # One all-database search for generated name, none for zotero name
+        assert mock_devonthink._search_all_databases.call_count == 1
     
     def test_dry_run_mode(self, service_with_mocks, mock_devonthink):
         """Operates in dry run mode without side effects."""
-        mock_devonthink._search_database_for_filename = Mock(return_value=None)
+        mock_devonthink._search_all_databases = Mock(return_value=None)
         
         result = service_with_mocks._find_or_adopt_in_devonthink(
             generated_name='Test - Name',
@@ -803,7 +805,7 @@ class TestDEVONthinkRenameItem:
                 Mock(returncode=0, stdout="SUCCESS", stderr=""),  # rename_item
             ]
             
-            dt = DEVONthinkInterface(database_name="Professional")
+            dt = DEVONthinkInterface(database_name="Professional", persistent=False)
             result = dt.rename_item(
                 uuid='test-uuid-12345',
                 new_name='New Item Name',
@@ -833,7 +835,7 @@ class TestDEVONthinkRenameItem:
                 Mock(returncode=1, stdout="", stderr="ERROR: Item not found"),  # rename_item fails
             ]
             
-            dt = DEVONthinkInterface(database_name="Professional")
+            dt = DEVONthinkInterface(database_name="Professional", persistent=False)
             result = dt.rename_item(
                 uuid='invalid-uuid',
                 new_name='New Name',
@@ -966,3 +968,670 @@ class TestPhase0IntegrationScenarios:
         assert result['deleted'] == 1
         assert result['retried'] == 1
         assert service_with_mocks.state.pending_deletes == []
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TEST: Skipped stored attachments are not re-evaluated
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TestSkippedAttachmentElision:
+    """Test stored attachments skipped for record-level reasons are elided until edited."""
+
+    def _orphan(self, version=5):
+        return ZoteroAttachment(
+            key='ORPHAN1', parent_key=None, link_mode=0, content_type='application/pdf',
+            path='storage:orphan.pdf', storage_hash='abc', version=version, filename='orphan.pdf',
+        )
+
+    def test_orphan_recorded_then_skipped_unchanged(self, service_with_mocks, mock_zotero_client, tmp_path):
+        orphan_file = tmp_path / 'orphan.pdf'
+        orphan_file.write_bytes(b'%PDF')
+        service_with_mocks._resolve_storage_path = Mock(return_value=orphan_file)
+        service_with_mocks._save_state = Mock()
+        mock_zotero_client.get_stored_attachments = Mock(return_value=[self._orphan()])
+
+        first = service_with_mocks.migrate_stored_attachments(dry_run=False)
+        second = service_with_mocks.migrate_stored_attachments(dry_run=False)
+
+        assert first['skipped_no_parent'] == 1
+        assert service_with_mocks.state.skipped_attachments == ['ORPHAN1:5']
+        assert second['skipped_unchanged'] == 1
+        assert second['skipped_no_parent'] == 0
+        assert service_with_mocks._resolve_storage_path.call_count == 1
+
+    def test_new_version_is_re_evaluated(self, service_with_mocks, mock_zotero_client, tmp_path):
+        orphan_file = tmp_path / 'orphan.pdf'
+        orphan_file.write_bytes(b'%PDF')
+        service_with_mocks._resolve_storage_path = Mock(return_value=orphan_file)
+        service_with_mocks._save_state = Mock()
+        service_with_mocks.state.skipped_attachments = ['ORPHAN1:5']
+        mock_zotero_client.get_stored_attachments = Mock(return_value=[self._orphan(version=6)])
+
+        result = service_with_mocks.migrate_stored_attachments(dry_run=False)
+
+        assert result['skipped_unchanged'] == 0
+        assert result['skipped_no_parent'] == 1
+        assert service_with_mocks.state.skipped_attachments == ['ORPHAN1:6']
+
+    def test_full_scan_drops_vanished_attachments(self, service_with_mocks, mock_zotero_client):
+        service_with_mocks._save_state = Mock()
+        service_with_mocks.state.skipped_attachments = ['GONE1:3']
+        mock_zotero_client.get_stored_attachments = Mock(return_value=[])
+
+        service_with_mocks.migrate_stored_attachments(dry_run=False)
+
+        assert service_with_mocks.state.skipped_attachments == []
+
+    def test_partial_scan_replaces_stale_versions(self, service_with_mocks, tmp_path):
+        orphan_file = tmp_path / 'orphan.pdf'
+        orphan_file.write_bytes(b'%PDF')
+        service_with_mocks._resolve_storage_path = Mock(return_value=orphan_file)
+        service_with_mocks._save_state = Mock()
+        service_with_mocks.state.skipped_attachments = ['ORPHAN1:5', 'OTHER1:2']
+
+        service_with_mocks.migrate_stored_attachments(dry_run=False, attachments=[self._orphan(version=6)])
+
+        assert service_with_mocks.state.skipped_attachments == ['ORPHAN1:6', 'OTHER1:2']
+
+    def test_unresolvable_path_is_rechecked(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        monkeypatch.setattr(devonzot_service, 'ZOTERO_STORAGE_PATH', str(tmp_path))
+        (tmp_path / 'STORED01').mkdir()
+        (tmp_path / 'STORED01' / 'other.pdf').write_bytes(b'%PDF')
+        service_with_mocks._resolve_storage_path = Mock(return_value=None)
+        service_with_mocks._save_state = Mock()
+        # Recorded by an earlier version that also memoized filesystem skips
+        service_with_mocks.state.skipped_attachments = ['STORED01:3']
+        stored = ZoteroAttachment(
+            key='STORED01', parent_key='PARENT1', link_mode=0, content_type='application/pdf',
+            path='storage:paper.pdf', storage_hash='abc', version=3, filename=None,
+        )
+
+        result = service_with_mocks.migrate_stored_attachments(dry_run=False, attachments=[stored])
+
+        assert result['skipped_unchanged'] == 0
+        assert result['skipped_path_invalid'] == 1
+        assert service_with_mocks.state.skipped_attachments == []
+
+
+class TestParentPrefetch:
+    """Test migration loops fetch parent items in one batch."""
+
+    def _linked(self, key, parent_key):
+        return ZoteroAttachment(
+            key=key, parent_key=parent_key, link_mode=2, content_type='application/pdf',
+            path=f'/nonexistent/{key}.pdf', storage_hash=None, version=1, filename=f'{key}.pdf',
+        )
+
+    def test_zotfile_parents_fetched_once(self, service_with_mocks, mock_zotero_client):
+        service_with_mocks._save_state = Mock()
+        attachments = [self._linked('ATT1', 'PARENT1'), self._linked('ATT2', 'PARENT1')]
+
+        result = service_with_mocks.migrate_zotfile_attachments(dry_run=True, attachments=attachments)
+
+        mock_zotero_client.get_items.assert_called_once_with(['PARENT1', 'PARENT1'])
+        assert result['skipped_parent_not_found'] == 2
+
+    def test_prefetched_parent_skips_single_fetch(self, service_with_mocks, mock_zotero_client, sample_zotero_item):
+        parent = service_with_mocks._parent_item('ITEM123', {'ITEM123': sample_zotero_item})
+
+        assert parent is sample_zotero_item
+        mock_zotero_client.get_item.assert_not_called()
+
+    def test_single_attachment_without_prefetch_fetches_parent(self, service_with_mocks, mock_zotero_client):
+        mock_zotero_client.get_item = Mock(return_value=None)
+
+        outcome = service_with_mocks._process_single_zotfile_attachment(self._linked('ATT1', 'PARENT1'), dry_run=True)
+
+        mock_zotero_client.get_item.assert_called_once_with('PARENT1')
+        assert outcome['result'] == 'skipped_parent_not_found'
+
+
+class TestProcessedItems:
+    """Test processed item keys are kept in the SQLite sidecar."""
+
+    def test_mark_processed_adds_once(self, service_with_mocks):
+        assert service_with_mocks._mark_processed('PARENT1') is True
+        assert service_with_mocks._mark_processed('PARENT1') is False
+
+        assert 'PARENT1' in service_with_mocks.processed_items
+        assert len(service_with_mocks.processed_items) == 1
+
+    def test_discard(self, service_with_mocks):
+        service_with_mocks._mark_processed('PARENT1')
+        service_with_mocks.processed_items.discard('PARENT1')
+
+        assert 'PARENT1' not in service_with_mocks.processed_items
+
+    def test_keys_persist_after_save(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        monkeypatch.setattr(devonzot_service, 'STATE_FILE', tmp_path / "service_state.json")
+        service_with_mocks._mark_processed('PARENT1')
+        service_with_mocks._save_state()
+
+        reopened = devonzot_service.ProcessedItems(tmp_path / "processed_items.db")
+        assert 'PARENT1' in reopened
+        assert json.loads((tmp_path / "service_state.json").read_text())['processed_items'] == []
+
+    def test_legacy_state_list_is_moved(self, mock_env, mock_zotero_client, mock_devonthink, tmp_path):
+        state_file = tmp_path / "service_state.json"
+        state_file.write_text(json.dumps({'processed_items': ['OLD1', 'OLD2']}))
+
+        with patch('devonzot_service.ZoteroAPIClient', return_value=mock_zotero_client), \
+             patch('devonzot_service.DEVONthinkInterface', return_value=mock_devonthink), \
+             patch('devonzot_service.STATE_FILE', state_file), \
+             patch('devonzot_service.PROCESSED_ITEMS_DB', tmp_path / "processed_items.db"), \
+             patch('devonzot_service.DEVONZOT_PATH', tmp_path), \
+             patch('devonzot_service.ConflictDetector'):
+            service = DEVONzotService()
+
+        assert 'OLD1' in service.processed_items and 'OLD2' in service.processed_items
+        assert json.loads(state_file.read_text())['processed_items'] == []
+
+
+class TestDeferredStateSave:
+    """Test processed-item state changes are saved in batches."""
+
+    def test_saves_after_state_save_every(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        state_file = tmp_path / "service_state.json"
+        monkeypatch.setattr(devonzot_service, 'STATE_FILE', state_file)
+        monkeypatch.setattr(devonzot_service, 'STATE_SAVE_INTERVAL', 3600)
+        service_with_mocks._last_state_save = time.monotonic()
+
+        for i in range(devonzot_service.STATE_SAVE_EVERY - 1):
+            service_with_mocks._mark_processed(f'P{i}')
+            service_with_mocks._mark_dirty()
+        assert not state_file.exists()
+
+        service_with_mocks._mark_processed('LAST')
+        service_with_mocks._mark_dirty()
+        assert state_file.exists()
+        assert len(service_with_mocks.processed_items) == devonzot_service.STATE_SAVE_EVERY
+        assert service_with_mocks._unsaved_changes == 0
+
+    def test_flush_saves_pending_changes_only(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        state_file = tmp_path / "service_state.json"
+        monkeypatch.setattr(devonzot_service, 'STATE_FILE', state_file)
+
+        service_with_mocks._flush_state()
+        assert not state_file.exists()
+
+        service_with_mocks._unsaved_changes = 1
+        service_with_mocks._flush_state()
+        assert state_file.exists()
+
+    def test_saved_state_round_trips(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        state_file = tmp_path / "service_state.json"
+        monkeypatch.setattr(devonzot_service, 'STATE_FILE', state_file)
+        service_with_mocks.state.skipped_attachments = ['A1:1', 'A2:3']
+
+        service_with_mocks._save_state()
+
+        assert service_with_mocks._load_state().skipped_attachments == ['A1:1', 'A2:3']
+        assert not state_file.with_suffix('.json.tmp').exists()
+
+    def test_unchanged_state_is_not_rewritten(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        state_file = tmp_path / "service_state.json"
+        monkeypatch.setattr(devonzot_service, 'STATE_FILE', state_file)
+        service_with_mocks._save_state()
+        state_file.unlink()
+
+        service_with_mocks._save_state()
+        assert not state_file.exists()
+
+        service_with_mocks.state.pending_deletes.append({'key': 'ATT1', 'version': 2})
+        service_with_mocks._save_state()
+        assert state_file.exists()
+
+
+class TestMigrationWorkloadAnalysis:
+    """Test the dry-run workload analysis sums sizes and flags bad paths."""
+
+    def test_sizes_and_problematic_paths(self, service_with_mocks, mock_zotero_client, tmp_path):
+        present = tmp_path / 'present.pdf'
+        present.write_bytes(b'x' * 10)
+        missing = tmp_path / 'missing.pdf'
+        paths = {'A1': present, 'A2': missing, 'A3': None}
+        attachments = [
+            ZoteroAttachment(key=key, parent_key='P', link_mode=0, content_type='application/pdf',
+                             path=None, storage_hash=None, version=1, filename=f'{key}.pdf')
+            for key in paths
+        ]
+        mock_zotero_client.get_stored_attachments = Mock(return_value=attachments)
+        service_with_mocks._resolve_storage_path = lambda a: paths[a.key]
+
+        analysis = service_with_mocks._analyze_migration_workload()
+
+        assert analysis['stored_attachments'] == 3
+        assert analysis['storage_size_bytes'] == 10
+        assert analysis['problematic_paths'] == [str(missing)]
+
+
+class TestAsyncZotfileMigration:
+    """Test ZotFile attachments migrate concurrently, one at a time per parent."""
+
+    def _linked(self, key, parent_key):
+        return ZoteroAttachment(
+            key=key, parent_key=parent_key, link_mode=2, content_type='application/pdf',
+            path=f'/nonexistent/{key}.pdf', storage_hash=None, version=1, filename=f'{key}.pdf',
+        )
+
+    def _tracking_process(self, active, peak, by_parent):
+        import threading
+        lock = threading.Lock()
+
+        def process(attachment, dry_run=False, parents=None):
+            with lock:
+                active.append(attachment.parent_key)
+                peak[0] = max(peak[0], len(active))
+                by_parent[0] = max(by_parent[0], active.count(attachment.parent_key))
+            time.sleep(0.05)
+            with lock:
+                active.remove(attachment.parent_key)
+            return {'result': 'skipped_parent_not_found', 'skip_detail': {'key': attachment.key}}
+        return process
+
+    async def test_overlaps_attachments_up_to_cap(self, service_with_mocks):
+        import devonzot_service
+        active, peak, by_parent = [], [0], [0]
+        service_with_mocks._process_single_zotfile_attachment = self._tracking_process(active, peak, by_parent)
+        attachments = [self._linked(f'ATT{i}', f'PARENT{i}') for i in range(8)]
+
+        results = await service_with_mocks.migrate_zotfile_attachments_async(dry_run=True, attachments=attachments)
+
+        assert results['skipped_parent_not_found'] == 8
+        assert results['skipped'] == 8
+        assert 1 < peak[0] <= devonzot_service.MIGRATION_CONCURRENCY
+
+    async def test_same_parent_runs_one_at_a_time(self, service_with_mocks):
+        active, peak, by_parent = [], [0], [0]
+        service_with_mocks._process_single_zotfile_attachment = self._tracking_process(active, peak, by_parent)
+        attachments = [self._linked(f'ATT{i}', 'PARENT1') for i in range(3)]
+
+        await service_with_mocks.migrate_zotfile_attachments_async(dry_run=True, attachments=attachments)
+
+        assert by_parent[0] == 1
+
+    async def test_worker_exception_counts_as_error(self, service_with_mocks):
+        service_with_mocks._process_single_zotfile_attachment = Mock(side_effect=RuntimeError('boom'))
+
+        results = await service_with_mocks.migrate_zotfile_attachments_async(
+            dry_run=True, attachments=[self._linked('ATT1', 'PARENT1')]
+        )
+
+        assert results['error'] == 1
+
+
+class TestConcurrentMigrationPhases:
+    """Test the async service cycle runs Phases 1A and 1B together."""
+
+    async def test_stored_and_zotfile_phases_overlap(self, service_with_mocks, mock_zotero_client):
+        zotfile_started = threading.Event()
+        overlapped = []
+
+        def migrate_stored(dry_run=False):
+            overlapped.append(zotfile_started.wait(1))
+            return {'success': 1}
+
+        async def migrate_zotfile(dry_run=False):
+            zotfile_started.set()
+            return {'success': 2}
+
+        service_with_mocks.retry_pending_deletes = Mock(return_value={'retried': 0})
+        service_with_mocks.retry_pending_downloads = Mock(return_value={'retried': 0})
+        service_with_mocks.delete_imported_url_attachments = Mock(return_value={})
+        service_with_mocks.migrate_stored_attachments = Mock(side_effect=migrate_stored)
+        service_with_mocks.migrate_zotfile_attachments_async = migrate_zotfile
+        service_with_mocks.convert_zotfile_symlinks_async = AsyncMock(return_value={})
+        service_with_mocks.sync_new_items = Mock(return_value={})
+
+        assert await service_with_mocks.run_service_cycle_async(dry_run=True) is True
+
+        assert overlapped == [True]
+        mock_zotero_client._get_all_attachments_cached.assert_called_once()
+
+    async def test_zotfile_waits_for_parent_held_by_stored_phase(self, service_with_mocks):
+        attachment = ZoteroAttachment(
+            key='ATT1', parent_key='PARENT1', link_mode=2, content_type='application/pdf',
+            path='/zotfile/ATT1.pdf', storage_hash=None, version=1, filename='ATT1.pdf',
+        )
+        service_with_mocks._process_single_zotfile_attachment = Mock(
+            return_value={'result': 'skipped_parent_not_found', 'skip_detail': None}
+        )
+        parent_lock = service_with_mocks._parent_lock(attachment)
+        parent_lock.acquire()
+
+        task = asyncio.create_task(
+            service_with_mocks.migrate_zotfile_attachments_async(dry_run=True, attachments=[attachment])
+        )
+        await asyncio.sleep(0.2)
+        service_with_mocks._process_single_zotfile_attachment.assert_not_called()
+
+        parent_lock.release()
+        await task
+        service_with_mocks._process_single_zotfile_attachment.assert_called_once()
+
+
+class TestConcurrentSymlinkConversion:
+    """Test symlink conversion overlaps DEVONthink searches and updates."""
+
+    def _linked(self, key, parent_key):
+        return ZoteroAttachment(
+            key=key, parent_key=parent_key, link_mode=2, content_type='application/pdf',
+            path=f'/zotfile/{key}.pdf', storage_hash=None, version=1, filename=f'{key}.pdf',
+        )
+
+    async def test_overlaps_metadata_updates_and_tallies(self, service_with_mocks, mock_devonthink, sample_zotero_item):
+        import threading
+        import devonzot_service
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def update(uuid, item, dry_run=False):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return True
+
+        attachments = [self._linked(f'ATT{i}', f'PARENT{i}') for i in range(6)] + [self._linked('MISS', 'PARENT9')]
+        mock_devonthink.batch_search_items = AsyncMock(
+            return_value={f'ATT{i}': f'UUID-{i}' for i in range(6)}
+        )
+        mock_devonthink.update_item_metadata = Mock(side_effect=update)
+        service_with_mocks.zotero_api.get_item = Mock(return_value=sample_zotero_item)
+        service_with_mocks._create_devonthink_child_link = Mock(return_value=True)
+
+        results = await service_with_mocks.convert_zotfile_symlinks_async(batch_size=50, attachments=attachments)
+
+        assert results == {'success': 6, 'error': 0, 'skipped': 1}
+        assert 1 < peak[0] <= devonzot_service.SYMLINK_CONVERT_CONCURRENCY
+
+    async def test_failed_link_counts_as_error(self, service_with_mocks, mock_devonthink, sample_zotero_item):
+        mock_devonthink.batch_search_items = AsyncMock(return_value={'ATT1': 'UUID-1'})
+        service_with_mocks.zotero_api.get_item = Mock(return_value=sample_zotero_item)
+        service_with_mocks._create_devonthink_child_link = Mock(side_effect=RuntimeError('boom'))
+
+        results = await service_with_mocks.convert_zotfile_symlinks_async(attachments=[self._linked('ATT1', 'PARENT1')])
+
+        assert results == {'success': 0, 'error': 1, 'skipped': 0}
+
+    async def test_hit_parents_fetched_in_one_call(self, service_with_mocks, mock_devonthink, sample_zotero_item):
+        mock_devonthink.batch_search_items = AsyncMock(return_value={'ATT1': 'UUID-1', 'ATT2': 'UUID-2'})
+        service_with_mocks.zotero_api.get_items = Mock(return_value={'PARENT1': sample_zotero_item})
+        service_with_mocks.zotero_api.get_item = Mock(return_value=None)
+        service_with_mocks._create_devonthink_child_link = Mock(return_value=True)
+        attachments = [self._linked('ATT1', 'PARENT1'), self._linked('ATT2', 'PARENT2'), self._linked('ATT3', 'PARENT3')]
+
+        results = await service_with_mocks.convert_zotfile_symlinks_async(attachments=attachments)
+
+        service_with_mocks.zotero_api.get_items.assert_called_once_with(['PARENT1', 'PARENT2'])
+        service_with_mocks.zotero_api.get_item.assert_called_once_with('PARENT2')
+        assert results == {'success': 1, 'error': 1, 'skipped': 1}
+
+    async def test_next_batch_searched_while_updates_run(self, service_with_mocks, mock_devonthink, sample_zotero_item):
+        import threading
+        events = []
+        first_update_started = threading.Event()
+
+        async def search(names, dry_run=False):
+            events.append(('search', names[0]))
+            if names[0] == 'ATT2':
+                # Batch 1's update is still in its worker thread
+                assert await asyncio.to_thread(first_update_started.wait, 1)
+            return {name: f'UUID-{name}' for name in names}
+
+        def update(uuid, item, dry_run=False):
+            first_update_started.set()
+            time.sleep(0.1)
+            events.append(('updated', uuid))
+            return True
+
+        mock_devonthink.batch_search_items = search
+        mock_devonthink.update_item_metadata = Mock(side_effect=update)
+        service_with_mocks.zotero_api.get_item = Mock(return_value=sample_zotero_item)
+        service_with_mocks._create_devonthink_child_link = Mock(return_value=True)
+        attachments = [self._linked(f'ATT{i}', f'PARENT{i}') for i in range(1, 3)]
+
+        with patch('devonzot_service.asyncio.sleep', new=AsyncMock()):
+            results = await service_with_mocks.convert_zotfile_symlinks_async(batch_size=1, attachments=attachments)
+
+        assert results == {'success': 2, 'error': 0, 'skipped': 0}
+        assert events.index(('search', 'ATT2')) < events.index(('updated', 'UUID-ATT1'))
+
+    async def test_batch_links_created_in_one_post(self, service_with_mocks, mock_devonthink, sample_zotero_item):
+        mock_devonthink.batch_search_items = AsyncMock(return_value={'ATT1': 'UUID-1', 'ATT2': 'UUID-2'})
+        service_with_mocks.zotero_api.get_items = Mock(
+            return_value={'PARENT1': sample_zotero_item, 'PARENT2': sample_zotero_item}
+        )
+        service_with_mocks.zotero_api.create_url_attachments = Mock(side_effect=lambda atts: [
+            {'input': att, 'new_key': None if att['parent_key'] == 'PARENT2' else 'NEW1'} for att in atts
+        ])
+        attachments = [self._linked('ATT1', 'PARENT1'), self._linked('ATT2', 'PARENT2')]
+
+        results = await service_with_mocks.convert_zotfile_symlinks_async(attachments=attachments)
+
+        service_with_mocks.zotero_api.create_url_attachments.assert_called_once()
+        posted = service_with_mocks.zotero_api.create_url_attachments.call_args.args[0]
+        assert [att['url'] for att in posted] == ['x-devonthink-item://UUID-1', 'x-devonthink-item://UUID-2']
+        mock_devonthink.update_item_metadata.assert_called_once_with('UUID-1', sample_zotero_item, False)
+        assert results == {'success': 1, 'error': 1, 'skipped': 0}
+
+    def test_bulk_links_reuse_existing_and_dedupe_parents(self, service_with_mocks):
+        service_with_mocks.zotero_api._get_all_attachments_cached = Mock(return_value=[
+            {'data': {'key': 'LINK1', 'parentItem': 'PARENT1', 'linkMode': 'linked_url',
+                      'url': 'x-devonthink-item://OLD', 'title': 'a.pdf'}},
+        ])
+        service_with_mocks.zotero_api.create_url_attachments = Mock(side_effect=lambda atts: [
+            {'input': att, 'new_key': 'NEW'} for att in atts
+        ])
+
+        linked = service_with_mocks._create_devonthink_child_links([
+            ('PARENT1', 'UUID-1', 'a.pdf'), ('PARENT2', 'UUID-2', 'b.pdf'), ('PARENT2', 'UUID-3', 'c.pdf'),
+        ])
+
+        assert linked == {'PARENT1': True, 'PARENT2': True}
+        posted = service_with_mocks.zotero_api.create_url_attachments.call_args.args[0]
+        assert [att['parent_key'] for att in posted] == ['PARENT2']
+
+    async def test_successes_logged_once_per_batch(self, service_with_mocks, mock_devonthink, sample_zotero_item, caplog):
+        import logging
+        mock_devonthink.batch_search_items = AsyncMock(
+            side_effect=lambda names, dry_run=False: {name: f'UUID-{name}' for name in names if name != 'ATT3'}
+        )
+        service_with_mocks.zotero_api.get_item = Mock(return_value=sample_zotero_item)
+        service_with_mocks._create_devonthink_child_link = Mock(return_value=True)
+        attachments = [self._linked(f'ATT{i}', f'PARENT{i}') for i in range(1, 4)]
+
+        with caplog.at_level(logging.INFO, logger='devonzot_service'), \
+             patch('devonzot_service.asyncio.sleep', new=AsyncMock()):
+            await service_with_mocks.convert_zotfile_symlinks_async(batch_size=2, attachments=attachments)
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert 'Converted 2 symlinks in batch 1' in messages
+        assert 'Converted 0 symlinks in batch 2' in messages
+        assert not any(m.startswith('Converted symlink') for m in messages)
+
+    async def test_fast_batches_wait_only_out_their_pace(self, service_with_mocks, mock_devonthink):
+        import devonzot_service
+        mock_devonthink.batch_search_items = AsyncMock(return_value={})
+        attachments = [self._linked(f'ATT{i}', f'PARENT{i}') for i in range(4)]
+
+        with patch('devonzot_service.asyncio.sleep', new=AsyncMock()) as sleep:
+            results = await service_with_mocks.convert_zotfile_symlinks_async(batch_size=2, attachments=attachments)
+
+        assert results['skipped'] == 4
+        sleep.assert_awaited_once()
+        assert 0 < sleep.await_args.args[0] <= devonzot_service.SYMLINK_BATCH_PACE * 2
+
+    async def test_slow_batches_do_not_sleep(self, service_with_mocks, mock_devonthink, monkeypatch):
+        import devonzot_service
+        monkeypatch.setattr(devonzot_service, 'SYMLINK_BATCH_PACE', 0)
+        mock_devonthink.batch_search_items = AsyncMock(return_value={})
+        attachments = [self._linked(f'ATT{i}', f'PARENT{i}') for i in range(4)]
+
+        with patch('devonzot_service.asyncio.sleep', new=AsyncMock()) as sleep:
+            await service_with_mocks.convert_zotfile_symlinks_async(batch_size=2, attachments=attachments)
+
+        sleep.assert_not_awaited()
+
+
+class TestDevonthinkUuidCache:
+    """Test symlink searches reuse DEVONthink UUIDs found before."""
+
+    async def test_cached_hits_skip_the_search(self, service_with_mocks, mock_devonthink):
+        mock_devonthink.batch_search_items = AsyncMock(return_value={'A': 'UUID-A', 'B': None})
+        await service_with_mocks._search_devonthink_cached(['A', 'B'])
+
+        mock_devonthink.batch_search_items = AsyncMock(return_value={'B': None})
+        found, cached = await service_with_mocks._search_devonthink_cached(['A', 'B'])
+
+        mock_devonthink.batch_search_items.assert_awaited_once_with(['B'], False)
+        assert found == {'A': 'UUID-A', 'B': None}
+        assert cached == {'A'}
+
+    async def test_cache_is_bounded_and_persisted(self, service_with_mocks, mock_devonthink, monkeypatch):
+        import devonzot_service
+        monkeypatch.setattr(devonzot_service, 'DEVONTHINK_UUID_CACHE_SIZE', 2)
+        mock_devonthink.batch_search_items = AsyncMock(
+            side_effect=lambda names, dry_run=False: {name: f'UUID-{name}' for name in names}
+        )
+
+        await service_with_mocks._search_devonthink_cached(['A', 'B'])
+        await service_with_mocks._search_devonthink_cached(['A'])
+        await service_with_mocks._search_devonthink_cached(['C'])
+        service_with_mocks._save_state()
+
+        assert list(service_with_mocks._load_state().devonthink_uuids) == ['A', 'C']
+
+    def _symlink(self, key):
+        return ZoteroAttachment(
+            key=key, parent_key='PARENT1', link_mode=2, content_type='application/pdf',
+            path=f'/zotfile/{key}.pdf', storage_hash=None, version=1, filename=f'{key}.pdf',
+        )
+
+    async def test_stale_cached_uuid_is_forgotten_before_linking(
+        self, service_with_mocks, mock_devonthink, sample_zotero_item
+    ):
+        service_with_mocks.state.devonthink_uuids['ATT1'] = 'STALE'
+        mock_devonthink.batch_search_items = AsyncMock(return_value={})
+        mock_devonthink.update_item_metadata = Mock(return_value=False)
+        service_with_mocks.zotero_api.get_item = Mock(return_value=sample_zotero_item)
+        service_with_mocks._create_devonthink_child_link = Mock(return_value=True)
+        service_with_mocks._create_devonthink_child_links = Mock(return_value={})
+
+        results = await service_with_mocks.convert_zotfile_symlinks_async(attachments=[self._symlink('ATT1')])
+
+        mock_devonthink.batch_search_items.assert_not_awaited()
+        service_with_mocks._create_devonthink_child_link.assert_not_called()
+        assert results['error'] == 1
+        assert 'ATT1' not in service_with_mocks.state.devonthink_uuids
+
+    async def test_cached_hit_linked_after_metadata_update(
+        self, service_with_mocks, mock_devonthink, sample_zotero_item
+    ):
+        service_with_mocks.state.devonthink_uuids['ATT1'] = 'UUID-1'
+        calls = []
+        mock_devonthink.batch_search_items = AsyncMock(return_value={'ATT2': 'UUID-2'})
+        mock_devonthink.update_item_metadata = Mock(side_effect=lambda uuid, *a, **k: calls.append(('update', uuid)) or True)
+        service_with_mocks.zotero_api.get_items = Mock(return_value={'PARENT1': sample_zotero_item})
+        service_with_mocks._create_devonthink_child_link = Mock(
+            side_effect=lambda parent_key, uuid, **k: calls.append(('link', uuid)) or True
+        )
+        service_with_mocks._create_devonthink_child_links = Mock(
+            side_effect=lambda links, dry_run=False: {parent_key: True for parent_key, _, _ in links}
+        )
+
+        results = await service_with_mocks.convert_zotfile_symlinks_async(
+            attachments=[self._symlink('ATT1'), self._symlink('ATT2')]
+        )
+
+        assert results['success'] == 2
+        # Only the fresh hit is bulk-linked; the cached one waits for its update
+        bulk = service_with_mocks._create_devonthink_child_links.call_args[0][0]
+        assert [uuid for _, uuid, _ in bulk] == ['UUID-2']
+        assert calls.index(('update', 'UUID-1')) < calls.index(('link', 'UUID-1'))
+
+
+class TestResolveStoragePath:
+    """Test storage path formats resolve against the Zotero storage folder."""
+
+    def _stored(self, path, key='ATT00001'):
+        return ZoteroAttachment(
+            key=key, parent_key='PARENT1', link_mode=0, content_type='application/pdf',
+            path=path, storage_hash=None, version=1,
+        )
+
+    @pytest.fixture
+    def storage(self, tmp_path, monkeypatch):
+        import devonzot_service
+        monkeypatch.setattr(devonzot_service, 'ZOTERO_STORAGE_PATH', str(tmp_path))
+        (tmp_path / 'ABCD1234').mkdir()
+        (tmp_path / 'ABCD1234' / 'paper.pdf').write_bytes(b'%PDF')
+        return tmp_path
+
+    def test_key_formats(self, service_with_mocks, storage):
+        expected = storage / 'ABCD1234' / 'paper.pdf'
+        for path in ('storage:ABCD1234:paper.pdf', 'ABCD1234:paper.pdf', 'ABCD1234/paper.pdf'):
+            assert service_with_mocks._resolve_storage_path(self._stored(path)) == expected
+
+    def test_invalid_keys_rejected(self, service_with_mocks, storage):
+        for key in ('abcd1234', 'ABCD123', 'ABCD1234\n'):
+            assert service_with_mocks._resolve_storage_path(self._stored(f'storage:{key}:paper.pdf')) is None
+
+    def test_legacy_path_scans_storage_once(self, service_with_mocks, storage):
+        (storage / 'WXYZ5678').mkdir()
+        (storage / 'WXYZ5678' / 'notes [draft].pdf').write_bytes(b'%PDF')
+
+        assert service_with_mocks._resolve_storage_path(self._stored('storage:paper.pdf')) == \
+            storage / 'ABCD1234' / 'paper.pdf'
+        with patch('devonzot_service.os.scandir', side_effect=AssertionError('rescanned')):
+            assert service_with_mocks._resolve_storage_path(self._stored('storage:notes [draft].pdf')) == \
+                storage / 'WXYZ5678' / 'notes [draft].pdf'
+            assert service_with_mocks._resolve_storage_path(self._stored('storage:missing.pdf')) is None
+
+
+class TestIsDirEmpty:
+    """Test the scandir-based empty-directory check."""
+
+    def test_empty_and_ignored_entries(self, tmp_path):
+        from devonzot_service import _is_dir_empty
+        assert _is_dir_empty(tmp_path)
+
+        (tmp_path / '.DS_Store').write_bytes(b'')
+        assert not _is_dir_empty(tmp_path)
+        assert _is_dir_empty(tmp_path, ('.DS_Store',))
+
+        (tmp_path / 'paper.pdf').write_bytes(b'%PDF')
+        assert not _is_dir_empty(tmp_path, ('.DS_Store',))
+
+
+class TestPerpetualServiceShutdown:
+    """Test a shutdown signal ends the polling service's wait at once."""
+
+    def test_signal_interrupts_sync_interval_wait(self, service_with_mocks, tmp_path, monkeypatch):
+        import devonzot_service
+        monkeypatch.setattr(devonzot_service, 'PID_FILE', tmp_path / "service.pid")
+        monkeypatch.setattr(devonzot_service, 'SYNC_INTERVAL', 3600)
+        service_with_mocks._save_state = Mock()
+        cycles = []
+
+        def cycle(dry_run=False):
+            cycles.append(dry_run)
+            threading.Timer(0.05, service_with_mocks._signal_handler, args=(15, None)).start()
+            return True
+
+        service_with_mocks.run_service_cycle = cycle
+        started = time.monotonic()
+        service_with_mocks.run_perpetual_service()
+
+        assert cycles == [False]
+        assert time.monotonic() - started < 5
+        assert not (tmp_path / "service.pid").exists()
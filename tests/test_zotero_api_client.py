@@ -4,7 +4,7 @@ Verifies API JSON → dataclass conversion, pagination, filtering, and update lo
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import sys
 from pathlib import Path
 
@@ -309,6 +309,28 @@ class TestPagination:
         assert len(result) == 150
         assert api_client._safe_request.call_count == 2
 
+    def test_iter_items_needing_sync_fetches_pages_lazily(self, api_client):
+        """Streaming variant requests the next page only once the first is consumed."""
+        page1 = Mock()
+        page1.status_code = 200
+        page1.json.return_value = [{'data': {'key': f'K{i}', 'itemType': 'book'}} for i in range(100)]
+        page1.headers = {'Total-Results': '101'}
+
+        page2 = Mock()
+        page2.status_code = 200
+        page2.json.return_value = [{'data': {'key': 'K100', 'itemType': 'note'}}]
+        page2.headers = {'Total-Results': '101'}
+
+        api_client._safe_request = Mock(side_effect=[page1, page2])
+        api_client._api_item_to_zotero_item = Mock(side_effect=lambda item: item['data']['key'])
+
+        items = api_client.iter_items_needing_sync(processed_items=['K1'])
+        assert next(items) == 'K0'
+        assert api_client._safe_request.call_count == 1
+
+        assert len(list(items)) == 98
+        assert api_client._safe_request.call_count == 2
+
 
 # ── Update URL tests ─────────────────────────────────────────────
 
@@ -392,6 +414,24 @@ class TestCaching:
         assert api_client._attachment_cache is None
         assert api_client._collection_name_cache is None
 
+    def test_created_url_attachments_join_cache(self, api_client):
+        """Attachments created this cycle are visible through the cache."""
+        api_client._attachment_cache = []
+        response = Mock(status_code=200)
+        response.json.return_value = {'successful': {'0': {'key': 'NEW1'}}, 'failed': {'1': {}}}
+        api_client._safe_request = Mock(return_value=response)
+
+        api_client.create_url_attachments([
+            {'parent_key': 'P1', 'title': 'a.pdf', 'url': 'x-devonthink-item://U1'},
+            {'parent_key': 'P2', 'title': 'b.pdf', 'url': 'x-devonthink-item://U2'},
+        ])
+
+        [cached] = api_client._get_all_attachments_cached()
+        assert cached['key'] == 'NEW1'
+        assert cached['data']['parentItem'] == 'P1'
+        assert cached['data']['linkMode'] == 'linked_url'
+        assert cached['data']['url'] == 'x-devonthink-item://U1'
+
 
 # ── Imported URL Attachments tests ────────────────────────────────────
 
@@ -944,3 +984,351 @@ class TestGetItemsNeedingSync:
 
         call_args = api_client._get_all_items_paginated.call_args
         assert call_args[0][0]['since'] == 50
+
+
+# ── Async request tests ───────────────────────────────────────────────
+
+class TestAsyncRequests:
+    """Test the async request path waits with asyncio.sleep, not time.sleep."""
+
+    async def test_retry_after_uses_asyncio_sleep(self, api_client):
+        """429 with Retry-After waits via asyncio.sleep and retries."""
+        limited = Mock(status_code=429, headers={'Retry-After': '3'})
+        ok = Mock(status_code=200, headers={})
+        api_client.session.request = Mock(side_effect=[limited, ok])
+
+        with patch('zotero_api_client.asyncio.sleep', new=AsyncMock()) as mock_sleep, \
+                patch('zotero_api_client.time.sleep') as mock_time_sleep:
+            response = await api_client._asafe_request('GET', 'https://example/items')
+
+        assert response is ok
+        mock_sleep.assert_awaited_once()
+        assert mock_sleep.await_args[0][0] == pytest.approx(3.0, abs=0.5)
+        mock_time_sleep.assert_not_called()
+
+    async def test_adelete_attachment_returns_true_on_204(self, api_client):
+        """adelete_attachment sends the version header and reports success."""
+        response = Mock(status_code=204)
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(return_value=response)
+
+        result = await api_client.adelete_attachment('ATT123', version=7)
+
+        assert result is True
+        headers = api_client._asafe_request.call_args[1]['headers']
+        assert headers['If-Unmodified-Since-Version'] == '7'
+
+    async def test_adelete_attachment_retries_at_current_version_on_412(self, api_client):
+        """refresh_on_conflict re-reads the version after a 412 and retries once."""
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(side_effect=[Mock(status_code=412), Mock(status_code=204)])
+        api_client.aget_item_raw = AsyncMock(return_value={'key': 'ATT123', 'version': 9})
+
+        result = await api_client.adelete_attachment('ATT123', version=7, refresh_on_conflict=True)
+
+        assert result is True
+        headers = api_client._asafe_request.call_args[1]['headers']
+        assert headers['If-Unmodified-Since-Version'] == '9'
+
+    async def test_adelete_attachment_412_without_refresh_fails(self, api_client):
+        """Without refresh_on_conflict a 412 is reported as a failure."""
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(return_value=Mock(status_code=412))
+        api_client.aget_item_raw = AsyncMock()
+
+        assert await api_client.adelete_attachment('ATT123', version=7) is False
+        api_client.aget_item_raw.assert_not_called()
+
+    async def test_aget_item_raw_returns_none_on_failure(self, api_client):
+        """aget_item_raw returns None when the request fails."""
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(return_value=None)
+
+        assert await api_client.aget_item_raw('MISSING') is None
+
+    async def test_acreate_url_attachments_maps_keys(self, api_client):
+        """acreate_url_attachments pairs inputs with created keys by index."""
+        response = Mock(status_code=200)
+        response.json.return_value = {'successful': {'1': {'key': 'NEW2'}}}
+        api_client._asafe_request = AsyncMock(return_value=response)
+        attachments = [
+            {'parent_key': 'P1', 'title': 'a.pdf', 'url': 'x-devonthink-item://A'},
+            {'parent_key': 'P2', 'title': 'b.pdf', 'url': 'x-devonthink-item://B'},
+        ]
+
+        results = await api_client.acreate_url_attachments(attachments)
+
+        assert [r['new_key'] for r in results] == [None, 'NEW2']
+        body = api_client._asafe_request.call_args[1]['json']
+        assert body[1]['parentItem'] == 'P2'
+        assert body[1]['linkMode'] == 'linked_url'
+
+    def test_session_pool_sized_for_concurrency(self):
+        """The HTTPS adapter keeps enough pooled connections for async callers."""
+        from zotero_api_client import ZoteroAPIClient
+        client = ZoteroAPIClient(api_key='k', user_id='1', pool_maxsize=32)
+
+        adapter = client.session.get_adapter('https://api.zotero.org')
+        assert adapter._pool_maxsize == 32
+
+    def test_connections_reused_not_overflowed(self):
+        """Requests wait for a pooled connection and concurrency fits the pool."""
+        from zotero_api_client import ZoteroAPIClient
+        client = ZoteroAPIClient(api_key='k', user_id='1', pool_maxsize=8)
+
+        adapter = client.session.get_adapter('https://api.zotero.org')
+        assert adapter._pool_block is True
+        assert client.backpressure.maximum == 8
+
+
+# ── Rate limiter tests ────────────────────────────────────────────────
+
+class TestRateLimiter:
+    """Test header-driven pacing replaces the fixed per-call delay."""
+
+    def test_no_wait_without_pressure(self):
+        """Requests go out immediately when nothing asks for a pause."""
+        from zotero_api_client import RateLimiter
+        limiter = RateLimiter()
+
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == 0.0
+
+    def test_backoff_header_defers_next_request(self):
+        """A Backoff header holds back the next reservation."""
+        from zotero_api_client import RateLimiter
+        limiter = RateLimiter()
+
+        limiter.observe({'Backoff': '5'})
+
+        assert limiter.reserve() == pytest.approx(5.0, abs=0.5)
+
+    def test_full_window_waits_for_oldest_slot(self):
+        """Once the window is full the next request waits for it to slide."""
+        from zotero_api_client import RateLimiter
+        limiter = RateLimiter(max_per_window=2, window=10.0)
+
+        limiter.reserve()
+        limiter.reserve()
+
+        assert limiter.reserve() == pytest.approx(10.0, abs=0.5)
+
+    def test_low_remaining_header_slows_down(self):
+        """A low X-RateLimit-Remaining triggers a wait, then resets."""
+        from zotero_api_client import RateLimiter
+        limiter = RateLimiter(window=10.0)
+        limiter.reserve()
+
+        limiter.observe({'X-RateLimit-Remaining': '1'})
+
+        assert limiter.reserve() > 0
+        assert limiter.remaining is None
+
+    def test_safe_request_records_backoff(self, api_client):
+        """_safe_request hands Backoff to the limiter instead of sleeping inline."""
+        response = Mock(status_code=200, headers={'Backoff': '4'})
+        api_client.session.request = Mock(return_value=response)
+
+        with patch('zotero_api_client.time.sleep') as mock_sleep:
+            assert api_client._safe_request('GET', 'https://example/items') is response
+
+        mock_sleep.assert_not_called()
+        assert api_client.limiter.pending() == pytest.approx(4.0, abs=0.5)
+
+
+# ── Backpressure controller tests ─────────────────────────────────────
+
+class TestBackpressureController:
+    """Test AIMD adjustment of async request concurrency."""
+
+    def test_additive_increase_on_fast_success(self):
+        from zotero_api_client import BackpressureController
+        controller = BackpressureController(initial=2, increase=0.5, latency_target=1.0)
+
+        controller.on_success(0.2)
+
+        assert controller.limit == 2.5
+
+    def test_no_increase_when_latency_over_target(self):
+        from zotero_api_client import BackpressureController
+        controller = BackpressureController(initial=2, latency_target=1.0)
+
+        controller.on_success(3.0)
+
+        assert controller.limit == 2
+
+    def test_multiplicative_decrease_respects_minimum(self):
+        from zotero_api_client import BackpressureController
+        controller = BackpressureController(initial=4, minimum=1, decrease=0.5)
+
+        controller.on_error()
+        assert controller.limit == 2
+        controller.on_error()
+        controller.on_error()
+        assert controller.limit == 1
+
+    def test_increase_capped_at_maximum(self):
+        from zotero_api_client import BackpressureController
+        controller = BackpressureController(initial=16, maximum=16)
+
+        controller.on_success(0.1)
+
+        assert controller.limit == 16
+
+    async def test_slot_caps_concurrency(self):
+        """No more than int(limit) requests hold a slot at once."""
+        import asyncio
+        from zotero_api_client import BackpressureController
+        controller = BackpressureController(initial=2)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with controller.slot():
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        assert controller.in_flight == 0
+
+    async def test_asafe_request_backs_off_on_429(self, api_client):
+        """A 429 inside _asafe_request shrinks the concurrency limit."""
+        limited = Mock(status_code=429, headers={'Retry-After': '0'})
+        ok = Mock(status_code=200, headers={})
+        api_client.session.request = Mock(side_effect=[limited, ok])
+        before = api_client.backpressure.limit
+
+        with patch('zotero_api_client.asyncio.sleep', new=AsyncMock()):
+            await api_client._asafe_request('GET', 'https://example/items')
+
+        assert api_client.backpressure.limit < before
+
+
+# ── Attachment iteration tests ────────────────────────────────────────
+
+class TestIterAttachments:
+    """Test iter_attachments() walks pages lazily."""
+
+    @staticmethod
+    def _page(items, total):
+        response = Mock(status_code=200, headers={'Total-Results': str(total)})
+        response.json.return_value = items
+        return response
+
+    async def test_walks_all_pages(self, api_client):
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(side_effect=[
+            self._page([{'key': 'A'}, {'key': 'B'}], total=3),
+            self._page([{'key': 'C'}], total=3),
+        ])
+
+        keys = [item['key'] async for item in api_client.iter_attachments(page_size=2)]
+
+        assert keys == ['A', 'B', 'C']
+        second_params = api_client._asafe_request.call_args_list[1][1]['params']
+        assert second_params['start'] == 2
+
+    async def test_early_break_skips_later_pages(self, api_client):
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(side_effect=[
+            self._page([{'key': 'A'}, {'key': 'B'}], total=10),
+        ])
+
+        async for item in api_client.iter_attachments(page_size=2):
+            break
+
+        assert api_client._asafe_request.call_count == 1
+
+    async def test_stops_on_failed_page(self, api_client):
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(return_value=None)
+
+        items = [item async for item in api_client.iter_attachments()]
+
+        assert items == []
+
+
+class TestAsyncGetItemsByKeys:
+    """Test aget_items_by_keys() batches keys 50 at a time."""
+
+    async def test_chunks_keys_by_50(self, api_client):
+        page = Mock(status_code=200)
+        page.json.return_value = [{'key': 'K'}]
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(return_value=page)
+        keys = [f'K{i}' for i in range(75)]
+
+        items = await api_client.aget_items_by_keys(keys)
+
+        assert api_client._asafe_request.call_count == 2
+        first_params = api_client._asafe_request.call_args_list[0][1]['params']
+        assert len(first_params['itemKey'].split(',')) == 50
+        assert len(items) == 2
+
+    async def test_empty_keys_makes_no_requests(self, api_client):
+        api_client._asafe_request = AsyncMock()
+
+        assert await api_client.aget_items_by_keys([]) == []
+        api_client._asafe_request.assert_not_called()
+
+
+class TestGetItems:
+    """Test get_items() maps batched results to ZoteroItems by key."""
+
+    def test_dedupes_keys_and_maps_by_key(self, api_client, sample_api_item):
+        api_client.get_items_by_keys = Mock(return_value=[sample_api_item])
+
+        items = api_client.get_items(['ABC12345', None, 'ABC12345'])
+
+        api_client.get_items_by_keys.assert_called_once_with(['ABC12345'])
+        assert list(items) == [sample_api_item['key']]
+        assert items[sample_api_item['key']].title == sample_api_item['data']['title']
+
+    def test_no_keys_makes_no_requests(self, api_client):
+        api_client.get_items_by_keys = Mock()
+
+        assert api_client.get_items([]) == {}
+        api_client.get_items_by_keys.assert_not_called()
+
+
+class TestConditionalAttachmentListing:
+    """Test If-Modified-Since-Version handling for attachment listings."""
+
+    @staticmethod
+    def _response(status, items=None, version=None):
+        headers = {'Total-Results': str(len(items or []))}
+        if version is not None:
+            headers['Last-Modified-Version'] = str(version)
+        response = Mock(status_code=status, headers=headers)
+        response.json.return_value = items or []
+        return response
+
+    async def test_records_version_and_sends_header(self, api_client):
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(side_effect=[
+            self._response(200, [{'key': 'A'}], version=42),
+            self._response(304),
+        ])
+
+        first = [item async for item in api_client.iter_attachments(conditional=True)]
+        second = [item async for item in api_client.iter_attachments(conditional=True)]
+
+        assert first == [{'key': 'A'}]
+        assert second == []
+        assert api_client.attachments_version == 42
+        first_headers = api_client._asafe_request.call_args_list[0][1]['headers']
+        second_headers = api_client._asafe_request.call_args_list[1][1]['headers']
+        assert first_headers == {}
+        assert second_headers == {'If-Modified-Since-Version': '42'}
+
+    async def test_unconditional_never_sends_header(self, api_client):
+        api_client.attachments_version = 42
+        api_client._arate_limit = AsyncMock()
+        api_client._asafe_request = AsyncMock(return_value=self._response(200, [], version=43))
+
+        assert [item async for item in api_client.iter_attachments()] == []
+
+        assert api_client._asafe_request.call_args[1]['headers'] == {}
+        assert api_client.attachments_version == 43